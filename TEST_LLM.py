@@ -1,5 +1,6 @@
 import time
 from src.llm_groq import GroqLLM
+from src.resources import get_health_monitor
 
 BOLD = "\033[1m"
 GREEN = "\033[92m"
@@ -19,12 +20,13 @@ def test_llm():
     print(f"{YELLOW}Initializing GroqLLM...{RESET}")
     t0 = time.time()
     llm = GroqLLM()
+    health = get_health_monitor().check_now("groq")
     t1 = time.time()
 
-    if llm.connection_status:
+    if health["connected"]:
         print(f"{GREEN}🟢 Connected successfully!{RESET}")
         print(f"{CYAN}Model: {llm.model}{RESET}")
-        print(f"⏱ Initialization Time: {round(t1 - t0, 3)} sec")
+        print(f"⏱ Initialization Time: {round(t1 - t0, 3)} sec (probe {health['latency_ms']} ms)")
     else:
         print(f"{RED}🔴 Connection FAILED!{RESET}")
         return
@@ -0,0 +1,164 @@
+"""
+Quantization benchmark: recall and latency of scalar/binary quantization
+against the current float32 setup, on a copy of the stored chunks.
+
+Copies up to --points vectors from the live collection into temporary
+collections (one per mode), runs the same queries against each with
+several oversampling/rescore settings, and compares the hits with exact
+float32 search. The temporary collections are deleted afterwards.
+
+Usage:
+    python benchmark_quantization.py --points 5000 --queries 100 --top-k 5
+"""
+import argparse
+import time
+
+import numpy as np
+from qdrant_client.models import Distance, PointStruct, SearchParams, VectorParams
+
+from src.config import Config
+from src.qdrant_quantization import originals_on_disk, quantization_config, search_params
+from src.resources import get_embedding_model, get_qdrant_client
+
+VECTOR_SIZE = 384
+
+
+def load_points(client, limit):
+    """Up to `limit` stored points (with vectors) from the live collection"""
+    points, offset = [], None
+    while len(points) < limit:
+        batch, offset = client.scroll(
+            collection_name=Config.COLLECTION_NAME,
+            limit=min(256, limit - len(points)),
+            offset=offset,
+            with_payload=True,
+            with_vectors=True
+        )
+        points.extend(batch)
+        if offset is None:
+            break
+    return points
+
+
+def make_queries(points, n_queries, seed=0):
+    """Question-like queries: the opening words of random stored chunks"""
+    rng = np.random.default_rng(seed)
+    picks = rng.choice(len(points), size=min(n_queries, len(points)), replace=False)
+    texts = [" ".join(points[i].payload.get("text", "").split()[:12]) for i in picks]
+    return get_embedding_model().encode(texts, convert_to_numpy=True, show_progress_bar=False)
+
+
+def build_copy(client, name, points, mode):
+    """Temporary collection holding the points with the given quantization"""
+    if any(c.name == name for c in client.get_collections().collections):
+        client.delete_collection(name)
+    client.create_collection(
+        collection_name=name,
+        vectors_config=VectorParams(
+            size=VECTOR_SIZE,
+            distance=Distance.COSINE,
+            on_disk=originals_on_disk(mode)
+        ),
+        quantization_config=quantization_config(mode)
+    )
+    for i in range(0, len(points), 256):
+        client.upsert(
+            collection_name=name,
+            points=[PointStruct(id=p.id, vector=p.vector, payload={}) for p in points[i:i + 256]],
+            wait=True
+        )
+    # Let the optimizer build HNSW and quantized vectors before timing
+    for _ in range(120):
+        if client.get_collection(name).status.value == "green":
+            break
+        time.sleep(1)
+
+
+def run_queries(client, name, queries, top_k, params):
+    """Ids per query and per-query latencies (ms)"""
+    ids, latencies = [], []
+    for vector in queries:
+        start = time.perf_counter()
+        hits = client.search(
+            collection_name=name,
+            query_vector=vector.tolist(),
+            limit=top_k,
+            search_params=params,
+            with_payload=False
+        )
+        latencies.append((time.perf_counter() - start) * 1000)
+        ids.append([hit.id for hit in hits])
+    return ids, latencies
+
+
+def recall(truth, found):
+    scores = [len(set(t) & set(f)) / len(t) for t, f in zip(truth, found) if t]
+    return float(np.mean(scores)) if scores else 0.0
+
+
+def vector_memory_mb(n_points, mode):
+    """
+    Approximate resident vector RAM for a mode
+
+    Quantized copies are built like the app's collections, with the float32
+    originals on disk, so only the quantized vectors stay in RAM; rescoring
+    reads the originals of the oversampled candidates from disk.
+    """
+    bytes_per_vector = {"none": VECTOR_SIZE * 4, "scalar": VECTOR_SIZE, "binary": VECTOR_SIZE / 8}[mode]
+    return n_points * bytes_per_vector / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Qdrant quantization modes")
+    parser.add_argument("--points", type=int, default=5000, help="Vectors copied per mode")
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--top-k", type=int, default=Config.TOP_K_RESULTS)
+    parser.add_argument("--oversampling", type=float, nargs="+", default=[1.0, 2.0, 4.0])
+    parser.add_argument("--keep", action="store_true", help="Keep the temporary collections")
+    args = parser.parse_args()
+
+    client = get_qdrant_client()
+    print(f"Loading up to {args.points} points from '{Config.COLLECTION_NAME}'...")
+    points = load_points(client, args.points)
+    if not points:
+        print("❌ No stored vectors to benchmark")
+        return
+    queries = make_queries(points, args.queries)
+    print(f"✓ {len(points)} points, {len(queries)} queries, top_k={args.top_k}\n")
+
+    rows = []
+    created = []
+    try:
+        for mode in ("none", "scalar", "binary"):
+            name = f"{Config.COLLECTION_NAME}_bench_{mode}"
+            build_copy(client, name, points, mode)
+            created.append(name)
+            if mode == "none":
+                truth, _ = run_queries(client, name, queries, args.top_k, SearchParams(exact=True))
+                found, latencies = run_queries(client, name, queries, args.top_k, None)
+                rows.append((mode, "-", "-", recall(truth, found), latencies, vector_memory_mb(len(points), mode)))
+                continue
+            for oversampling in args.oversampling:
+                for rescore in (True, False):
+                    params = search_params(oversampling, rescore, mode=mode)
+                    found, latencies = run_queries(client, name, queries, args.top_k, params)
+                    rows.append((
+                        mode, f"{oversampling:g}", "yes" if rescore else "no",
+                        recall(truth, found), latencies, vector_memory_mb(len(points), mode)
+                    ))
+    finally:
+        if not args.keep:
+            for name in created:
+                client.delete_collection(name)
+
+    print(f"{'mode':<8}{'oversample':>11}{'rescore':>9}{'recall@k':>10}{'p50 ms':>9}{'p95 ms':>9}{'vec MB':>9}")
+    print("-" * 65)
+    for mode, oversampling, rescore, rec, latencies, memory in rows:
+        print(
+            f"{mode:<8}{oversampling:>11}{rescore:>9}{rec:>10.3f}"
+            f"{np.percentile(latencies, 50):>9.1f}{np.percentile(latencies, 95):>9.1f}{memory:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
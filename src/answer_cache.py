@@ -0,0 +1,145 @@
+"""
+Semantic Answer Cache
+Serves answers to near-duplicate questions without calling the LLM
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+import numpy as np
+
+
+def filters_key(filters: Optional[Dict]) -> tuple:
+    """Canonical, hashable form of search filters ("All"/empty ignored)"""
+    if not filters:
+        return ()
+    return tuple(sorted(
+        (k, str(v)) for k, v in filters.items() if v and v != "All"
+    ))
+
+
+class SemanticAnswerCache:
+    """
+    Nearest-neighbour cache of previous answers.
+
+    Questions are compared by cosine similarity of their embeddings, only
+    against entries asked under the same subject/year filters. The whole
+    cache is dropped when the vector store's corpus version changes.
+    """
+
+    def __init__(self, threshold: float = 0.92, maxsize: int = 500, ttl: Optional[float] = None):
+        """
+        Args:
+            threshold: Minimum cosine similarity to reuse an answer
+            maxsize: Maximum number of cached answers
+            ttl: Seconds an answer stays valid (None = until invalidated)
+        """
+        self.threshold = threshold
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[int, Dict]" = OrderedDict()
+        self._next_id = 0
+        self._corpus_version = None
+        self._matrix = None
+        self._matrix_ids = []
+        self._matrix_keys = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _normalize(embedding) -> np.ndarray:
+        vec = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm else vec
+
+    def _check_version(self, corpus_version):
+        """Drop everything if documents were added or deleted"""
+        if corpus_version != self._corpus_version:
+            self._entries.clear()
+            self._matrix = None
+            self._corpus_version = corpus_version
+
+    def _rebuild_matrix(self):
+        self._matrix_ids = list(self._entries.keys())
+        if self._matrix_ids:
+            self._matrix = np.stack([self._entries[i]["embedding"] for i in self._matrix_ids])
+            self._matrix_keys = np.array(
+                [hash(self._entries[i]["filters"]) for i in self._matrix_ids]
+            )
+        else:
+            self._matrix = np.empty((0, 0), dtype=np.float32)
+            self._matrix_keys = np.empty(0)
+
+    def lookup(self, query_embedding, filters: Optional[Dict], corpus_version) -> Optional[Dict]:
+        """
+        Return a cached response for a semantically equivalent question.
+
+        Returns:
+            The stored response dict (with 'cache_similarity' added) or None
+        """
+        query_vec = self._normalize(query_embedding)
+        key = hash(filters_key(filters))
+        with self._lock:
+            self._check_version(corpus_version)
+            if not self._entries:
+                self.misses += 1
+                return None
+            if self._matrix is None:
+                self._rebuild_matrix()
+            mask = self._matrix_keys == key
+            if not mask.any():
+                self.misses += 1
+                return None
+            candidates = np.flatnonzero(mask)
+            sims = self._matrix[candidates] @ query_vec
+            best = int(np.argmax(sims))
+            entry_id = self._matrix_ids[candidates[best]]
+            entry = self._entries[entry_id]
+            similarity = float(sims[best])
+            if similarity < self.threshold:
+                self.misses += 1
+                return None
+            if self.ttl and entry["created"] + self.ttl < time.time():
+                del self._entries[entry_id]
+                self._matrix = None
+                self.misses += 1
+                return None
+            self._entries.move_to_end(entry_id)
+            self.hits += 1
+            return {**entry["response"], "cache_similarity": similarity}
+
+    def store(self, query: str, query_embedding, filters: Optional[Dict], corpus_version, response: Dict):
+        """Remember a successful response for later near-duplicate questions"""
+        if response.get("status") != "success":
+            return
+        with self._lock:
+            self._check_version(corpus_version)
+            self._entries[self._next_id] = {
+                "query": query,
+                "embedding": self._normalize(query_embedding),
+                "filters": filters_key(filters),
+                "response": dict(response),
+                "created": time.time()
+            }
+            self._next_id += 1
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+            self._matrix = None
+
+    def invalidate(self):
+        """Drop all cached answers"""
+        with self._lock:
+            self._entries.clear()
+            self._matrix = None
+
+    def stats(self) -> Dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0
+            }
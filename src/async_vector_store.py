@@ -0,0 +1,183 @@
+"""
+Async Vector Store Module
+asyncio front-end to VectorStore for non-Streamlit callers (batch jobs, API
+servers, load tests): Qdrant I/O goes through AsyncQdrantClient and
+embedding runs in worker threads, so many searches overlap on one loop.
+"""
+import asyncio
+from typing import Dict, List, Optional
+
+from qdrant_client import AsyncQdrantClient
+
+from src.config import Config
+from src.resources import get_vector_store
+
+
+class AsyncVectorStore:
+    """Async search over the shared VectorStore's collection and indexes"""
+
+    def __init__(self, vector_store=None):
+        """
+        Create inside the event loop that will use it.
+
+        Args:
+            vector_store: Sync VectorStore to share embeddings, BM25 and
+                payload handling with (default: the shared instance)
+        """
+        self.store = vector_store or get_vector_store()
+        self.client = None
+        # Sharded stores fan out on their own thread pool (see _dense_search)
+        if self.store.backend == "qdrant" and self.store.shards is None:
+            self.client = AsyncQdrantClient(
+                url=Config.QDRANT_URL,
+                api_key=Config.QDRANT_API_KEY,
+                timeout=60,
+                prefer_grpc=False
+            )
+
+    async def close(self):
+        if self.client is not None:
+            await self.client.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    # ----------------------------------------------------------------
+
+    async def embed_query(self, query: str):
+        """Cached query embedding, encoded off the event loop"""
+        return await asyncio.to_thread(self.store.embed_query, query)
+
+    async def search(
+        self,
+        query: str,
+        top_k: int = 5,
+        filters: Optional[Dict] = None,
+        mode: Optional[str] = None,
+        rerank: Optional[bool] = None,
+        diversify: Optional[bool] = None,
+        route: Optional[bool] = None,
+        oversampling: Optional[float] = None,
+        rescore: Optional[bool] = None
+    ) -> List[Dict]:
+        """
+        Same contract and results as VectorStore.search()
+
+        Args:
+            query: Search query text
+            top_k: Number of results to return
+            filters: Dict with 'subject', 'year', 'type' filters
+            mode: "dense" or "hybrid" (defaults to Config.SEARCH_MODE)
+            rerank: Cross-encoder rerank (defaults to Config.ENABLE_RERANK)
+            diversify: MMR de-duplication (defaults to Config.ENABLE_MMR)
+            route: Inferred subject/type filters (defaults to Config.ENABLE_QUERY_ROUTING)
+            oversampling: Quantized-search candidates per result (Config.QDRANT_OVERSAMPLING)
+            rescore: Rescore with float vectors (Config.QDRANT_RESCORE)
+        """
+        try:
+            plan = self.store.search_plan(top_k, mode, rerank, diversify, route, oversampling, rescore)
+            handlers = {
+                "embed": self.embed_query,
+                # Centroid rebuilds run on the router's own thread, so this is cheap
+                "route": self._route_filters,
+                "first_stage": self._first_stage,
+                # CPU-bound (cross-encoder forward pass, MMR matrix): keep it off the loop
+                "second_stage": lambda *args: asyncio.to_thread(self.store._second_stage, *args)
+            }
+            steps = self.store.search_steps(query, filters, plan)
+            try:
+                step, args = next(steps)
+                while True:
+                    step, args = steps.send(await handlers[step](*args))
+            except StopIteration as done:
+                return done.value
+        except Exception as e:
+            print(f"❌ Async search error: {str(e)}")
+            return []
+
+    async def _route_filters(self, query: str, query_embedding, filters: Optional[Dict]) -> Optional[Dict]:
+        return self.store.route_filters(query, query_embedding, filters)
+
+    async def _first_stage(
+        self,
+        query: str,
+        query_embedding,
+        n_results: int,
+        filters: Optional[Dict],
+        mode: str,
+        with_vectors: bool,
+        params=None
+    ) -> List[Dict]:
+        if mode == "hybrid":
+            return await self._hybrid_search(query, query_embedding, n_results, filters, with_vectors, params)
+        return await self._dense_search(query_embedding, n_results, filters, with_vectors=with_vectors, params=params)
+
+    async def _hybrid_search(
+        self,
+        query: str,
+        query_embedding,
+        top_k: int,
+        filters: Optional[Dict],
+        with_vectors: bool = False,
+        params=None
+    ) -> List[Dict]:
+        n_candidates = max(top_k, Config.HYBRID_CANDIDATES)
+        dense, keyword = await asyncio.gather(
+            self._dense_search(query_embedding, n_candidates, filters, with_vectors=with_vectors, params=params),
+            asyncio.to_thread(self.store.bm25.search, query, n_candidates, filters)
+        )
+        if not keyword:
+            return dense[:top_k]
+        fused = self.store._fuse(dense, keyword, top_k)
+        by_id = {doc['id']: doc for doc in dense}
+        missing = [point_id for point_id, _ in fused if point_id not in by_id]
+        if missing:
+            for doc in await self._fetch_by_ids(missing, with_vectors):
+                by_id[doc['id']] = doc
+        return self.store._fused_documents(fused, by_id, keyword)
+
+    async def _dense_search(
+        self,
+        query_embedding,
+        top_k: int,
+        filters: Optional[Dict] = None,
+        score_threshold: float = 0.3,
+        with_vectors: bool = False,
+        params=None
+    ) -> List[Dict]:
+        if self.client is None:
+            # Local backends and shard fan-out are blocking; keep them off the loop
+            return await asyncio.to_thread(
+                self.store._dense_search, query_embedding, top_k, filters, score_threshold, with_vectors, params
+            )
+        results = await self.client.search(
+            collection_name=Config.COLLECTION_NAME,
+            query_vector=query_embedding.tolist(),
+            limit=top_k,
+            score_threshold=score_threshold,
+            query_filter=self.store._qdrant_filter(filters),
+            search_params=params,
+            with_payload=True,
+            with_vectors=with_vectors
+        )
+        return [self.store._payload_to_document(r.payload, r.score, r.id, r.vector) for r in results]
+
+    async def _fetch_by_ids(self, point_ids: List, with_vectors: bool = False) -> List[Dict]:
+        if self.client is None:
+            return await asyncio.to_thread(self.store._fetch_by_ids, point_ids, with_vectors)
+        points = await self.client.retrieve(
+            collection_name=Config.COLLECTION_NAME,
+            ids=point_ids,
+            with_payload=True,
+            with_vectors=with_vectors
+        )
+        return [self.store._payload_to_document(p.payload, None, p.id, p.vector) for p in points]
+
+    # ----------------------------------------------------------------
+
+    async def add_documents(self, chunks: List[Dict], batch_size: int = 100) -> Dict:
+        """Ingestion stays on the sync path (registry, BM25 bookkeeping) in a worker thread"""
+        return await asyncio.to_thread(self.store.add_documents, chunks, batch_size)
@@ -0,0 +1,264 @@
+"""
+BM25 Keyword Index Module
+Incremental inverted index for exact-token retrieval ("3NF", "JDBC", "malloc")
+Postings are compact typed arrays; scoring is vectorized with NumPy.
+"""
+import math
+import os
+import pickle
+import re
+import threading
+from array import array
+from typing import Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:\+\+|#)?")
+
+STOPWORDS = frozenset("""
+a an and are as at be by for from has have how in is it its of on or that the
+this to was what when where which who why will with explain define describe
+""".split())
+
+# Payload fields that can be used as search filters
+FILTER_FIELDS = ("source", "subject", "year", "type")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens, keeping things like 'c++', 'c#', '3nf'"""
+    return [t for t in TOKEN_PATTERN.findall((text or "").lower()) if t not in STOPWORDS]
+
+
+class BM25Index:
+    """Okapi BM25 over chunk text, updated on add and delete"""
+
+    def __init__(self, path: Optional[str] = None, k1: float = 1.5, b: float = 0.75):
+        """
+        Args:
+            path: Pickle file used by save()/load() (None = memory only)
+            k1: Term-frequency saturation
+            b: Length normalization
+        """
+        self.path = path
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.RLock()
+        self._reset()
+        if path and os.path.exists(path):
+            self.load()
+
+    def _reset(self):
+        self._ids: List[Hashable] = []
+        self._slot_of: Dict[Hashable, int] = {}
+        self._lengths = array("I")
+        self._alive = bytearray()
+        self._postings: Dict[str, Tuple[array, array]] = {}
+        self._codes = {field: array("I") for field in FILTER_FIELDS}
+        self._vocab = {field: {} for field in FILTER_FIELDS}
+        self._live_count = 0
+        self._live_length = 0
+        self.dirty = False
+
+    # ----------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return self._live_count
+
+    def _code(self, field: str, value) -> int:
+        vocab = self._vocab[field]
+        value = str(value)
+        if value not in vocab:
+            vocab[value] = len(vocab)
+        return vocab[value]
+
+    def add(self, doc_id: Hashable, text: str, metadata: Optional[Dict] = None):
+        """Index (or re-index) one chunk"""
+        metadata = metadata or {}
+        tokens = tokenize(text)
+        with self._lock:
+            if doc_id in self._slot_of:
+                self.remove(doc_id)
+            slot = len(self._ids)
+            self._ids.append(doc_id)
+            self._slot_of[doc_id] = slot
+            self._lengths.append(len(tokens))
+            self._alive.append(1)
+            for field in FILTER_FIELDS:
+                self._codes[field].append(self._code(field, metadata.get(field, "")))
+            counts: Dict[str, int] = {}
+            for token in tokens:
+                counts[token] = counts.get(token, 0) + 1
+            for token, tf in counts.items():
+                posting = self._postings.get(token)
+                if posting is None:
+                    posting = (array("I"), array("H"))
+                    self._postings[token] = posting
+                posting[0].append(slot)
+                posting[1].append(min(tf, 65535))
+            self._live_count += 1
+            self._live_length += len(tokens)
+            self.dirty = True
+
+    def add_many(self, doc_ids: List[Hashable], texts: List[str], metadatas: List[Dict]):
+        """Index a batch of chunks"""
+        with self._lock:
+            for doc_id, text, metadata in zip(doc_ids, texts, metadatas):
+                self.add(doc_id, text, metadata)
+
+    def remove(self, doc_id: Hashable) -> bool:
+        """Tombstone one chunk; postings are compacted lazily"""
+        with self._lock:
+            slot = self._slot_of.pop(doc_id, None)
+            if slot is None or not self._alive[slot]:
+                return False
+            self._alive[slot] = 0
+            self._live_count -= 1
+            self._live_length -= self._lengths[slot]
+            self.dirty = True
+            self._maybe_compact()
+            return True
+
+    def remove_where(self, filters: Dict) -> int:
+        """Remove every chunk whose metadata matches all filters"""
+        with self._lock:
+            mask = self._filter_mask(filters)
+            if mask is None:
+                return 0
+            mask &= np.frombuffer(self._alive, dtype=np.uint8).astype(bool)
+            # Collect ids first: remove() may compact and renumber slots
+            doc_ids = [self._ids[slot] for slot in np.flatnonzero(mask)]
+            return sum(1 for doc_id in doc_ids if self.remove(doc_id))
+
+    def clear(self):
+        with self._lock:
+            self._reset()
+            self.dirty = True
+
+    def _maybe_compact(self):
+        """Rebuild postings once more than a quarter of slots are dead"""
+        dead = len(self._ids) - self._live_count
+        if dead < 1000 or dead * 4 < len(self._ids):
+            return
+        alive = np.frombuffer(self._alive, dtype=np.uint8).astype(bool)
+        new_slot = np.cumsum(alive) - 1
+        postings = {}
+        for token, (slots, tfs) in self._postings.items():
+            slots_np = np.frombuffer(slots, dtype=np.uint32)
+            keep = alive[slots_np]
+            if not keep.any():
+                continue
+            postings[token] = (
+                array("I", new_slot[slots_np[keep]].astype(np.uint32).tobytes()),
+                array("H", np.frombuffer(tfs, dtype=np.uint16)[keep].tobytes())
+            )
+        keep_slots = np.flatnonzero(alive)
+        self._ids = [self._ids[i] for i in keep_slots]
+        self._slot_of = {doc_id: i for i, doc_id in enumerate(self._ids)}
+        self._lengths = array("I", np.frombuffer(self._lengths, dtype=np.uint32)[keep_slots].tobytes())
+        self._alive = bytearray(b"\x01" * len(self._ids))
+        for field in FILTER_FIELDS:
+            codes = np.frombuffer(self._codes[field], dtype=np.uint32)[keep_slots]
+            self._codes[field] = array("I", codes.tobytes())
+        self._postings = postings
+
+    # ----------------------------------------------------------------
+
+    def _filter_mask(self, filters: Optional[Dict]) -> Optional[np.ndarray]:
+        if not filters:
+            return None
+        mask = np.ones(len(self._ids), dtype=bool)
+        for field, value in filters.items():
+            if value is None or value == "All":
+                continue
+            if field not in self._codes:
+                continue
+            values = value if isinstance(value, (list, tuple, set)) else [value]
+            codes = [self._vocab[field][str(v)] for v in values if str(v) in self._vocab[field]]
+            column = np.frombuffer(self._codes[field], dtype=np.uint32)
+            mask &= np.isin(column, codes)
+        return mask
+
+    def search(self, query: str, top_k: int = 10, filters: Optional[Dict] = None) -> List[Tuple[Hashable, float]]:
+        """
+        Rank chunks by BM25 score
+
+        Returns:
+            List of (doc_id, score), best first
+        """
+        terms = set(tokenize(query))
+        with self._lock:
+            if not terms or not self._live_count:
+                return []
+            n_slots = len(self._ids)
+            alive = np.frombuffer(self._alive, dtype=np.uint8).astype(bool)
+            lengths = np.frombuffer(self._lengths, dtype=np.uint32).astype(np.float32)
+            avgdl = self._live_length / self._live_count or 1.0
+            scores = np.zeros(n_slots, dtype=np.float32)
+            for term in terms:
+                posting = self._postings.get(term)
+                if posting is None:
+                    continue
+                slots = np.frombuffer(posting[0], dtype=np.uint32)
+                tfs = np.frombuffer(posting[1], dtype=np.uint16).astype(np.float32)
+                df = int(alive[slots].sum())
+                if not df:
+                    continue
+                idf = math.log(1 + (self._live_count - df + 0.5) / (df + 0.5))
+                norm = self.k1 * (1 - self.b + self.b * lengths[slots] / avgdl)
+                scores[slots] += idf * tfs * (self.k1 + 1) / (tfs + norm)
+            scores[~alive] = 0
+            mask = self._filter_mask(filters)
+            if mask is not None:
+                scores[~mask] = 0
+            hits = np.flatnonzero(scores > 0)
+            if not len(hits):
+                return []
+            if len(hits) > top_k:
+                hits = hits[np.argpartition(-scores[hits], top_k - 1)[:top_k]]
+            hits = hits[np.argsort(-scores[hits])]
+            return [(self._ids[i], float(scores[i])) for i in hits]
+
+    # ----------------------------------------------------------------
+
+    def save(self):
+        """Persist the index to self.path"""
+        if not self.path:
+            return
+        with self._lock:
+            state = {
+                "ids": self._ids,
+                "lengths": self._lengths,
+                "alive": self._alive,
+                "postings": self._postings,
+                "codes": self._codes,
+                "vocab": self._vocab,
+                "live_count": self._live_count,
+                "live_length": self._live_length
+            }
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.path)
+            self.dirty = False
+
+    def load(self):
+        """Load the index from self.path"""
+        with self._lock:
+            try:
+                with open(self.path, "rb") as f:
+                    state = pickle.load(f)
+                self._ids = state["ids"]
+                self._slot_of = {
+                    doc_id: i for i, doc_id in enumerate(self._ids) if state["alive"][i]
+                }
+                self._lengths = state["lengths"]
+                self._alive = state["alive"]
+                self._postings = state["postings"]
+                self._codes = state["codes"]
+                self._vocab = state["vocab"]
+                self._live_count = state["live_count"]
+                self._live_length = state["live_length"]
+                self.dirty = False
+            except Exception as e:
+                print(f"⚠️ Could not load BM25 index, starting empty: {e}")
+                self._reset()
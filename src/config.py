@@ -24,17 +24,38 @@ class Config:
     QDRANT_URL = os.getenv("QDRANT_URL", "")
     QDRANT_API_KEY = os.getenv("QDRANT_API_KEY", "")
     COLLECTION_NAME = os.getenv("COLLECTION_NAME", "mca_documents")
+    # Vector quantization: "none", "scalar" (int8) or "binary". The quantized
+    # copy (1/4 resp. 1/32 of float32) is searched from RAM and the originals
+    # move to disk for rescoring, so vector RAM shrinks by about that factor.
+    # Applied on create and migrated onto existing collections
+    QDRANT_QUANTIZATION = os.getenv("QDRANT_QUANTIZATION", "none").lower()
+    QDRANT_QUANTIZATION_ALWAYS_RAM = os.getenv("QDRANT_QUANTIZATION_ALWAYS_RAM", "True").lower() == "true"
+    # Search over quantized vectors: fetch limit * oversampling candidates,
+    # then rescore them with the original float vectors
+    QDRANT_OVERSAMPLING = float(os.getenv("QDRANT_OVERSAMPLING", "2.0"))
+    QDRANT_RESCORE = os.getenv("QDRANT_RESCORE", "True").lower() == "true"
 
     # ----------------------------
     # ChromaDB (fallback)
     # ----------------------------
     CHROMA_PERSIST_DIR = os.getenv("CHROMA_PERSIST_DIR", "./chroma_data")
 
+    # ----------------------------
+    # Vector backend selection: qdrant | chroma | numpy
+    # ----------------------------
+    VECTOR_BACKEND = os.getenv("VECTOR_BACKEND", "qdrant" if USE_QDRANT else "chroma").lower()
+    FLAT_INDEX_DIR = os.getenv("FLAT_INDEX_DIR", "./flat_index")
+
     # ----------------------------
     # Document Processing
     # ----------------------------
     CHUNK_SIZE = int(os.getenv("CHUNK_SIZE", "500"))
     CHUNK_OVERLAP = int(os.getenv("CHUNK_OVERLAP", "100"))
+    # Process-pool PDF extraction (1 = serial)
+    PDF_WORKERS = int(os.getenv("PDF_WORKERS", str(os.cpu_count() or 1)))
+    PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "32"))
+    # Streaming ingestion: items buffered between pipeline stages
+    INGEST_QUEUE_DEPTH = int(os.getenv("INGEST_QUEUE_DEPTH", "4"))
 
     # ----------------------------
     # LLM Settings (Groq)
@@ -45,22 +66,102 @@ class Config:
     # Default model — MUST be the working one
     LLM_MODEL = os.getenv("LLM_MODEL", VALID_MODEL)
 
+    # Gemini failover model (used by the LLM router when GOOGLE_API_KEY is set)
+    GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.0-flash")
+
+    # Optional self-hosted Ollama (used by the LLM router when set)
+    OLLAMA_URL = os.getenv("OLLAMA_URL", "")
+    OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "mistral")
+    # Keep weights resident between questions: a duration ("30m") or seconds
+    # ("-1" = never unload; unitless values are sent to Ollama as numbers)
+    OLLAMA_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+    OLLAMA_POOL_SIZE = int(os.getenv("OLLAMA_POOL_SIZE", "10"))
+    # Per-session /api/generate context reused for follow-ups (skips prompt prefill)
+    OLLAMA_CONTEXT_SESSIONS = int(os.getenv("OLLAMA_CONTEXT_SESSIONS", "300"))
+    OLLAMA_CONTEXT_TTL = int(os.getenv("OLLAMA_CONTEXT_TTL", "1800"))
+    OLLAMA_CONTEXT_MAX_TOKENS = int(os.getenv("OLLAMA_CONTEXT_MAX_TOKENS", "4096"))
+    # Order the LLM router tries providers in before it has latency data
+    LLM_PROVIDERS = [p.strip() for p in os.getenv("LLM_PROVIDERS", "groq,ollama,gemini").split(",") if p.strip()]
+
+    # Background provider health checks (seconds between probes)
+    LLM_HEALTH_TTL = int(os.getenv("LLM_HEALTH_TTL", "60"))
+
     # Embeddings
     EMBEDDING_MODEL = os.getenv(
         "EMBEDDING_MODEL",
         "sentence-transformers/all-MiniLM-L6-v2"
     )
+    # Texts per forward pass when embedding chunks at ingestion
+    EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "64"))
 
     # ----------------------------
     # Search Settings
     # ----------------------------
     TOP_K_RESULTS = int(os.getenv("TOP_K_RESULTS", "5"))
+    # "dense" (embeddings only, cosine scores) or "hybrid" (BM25 + dense,
+    # reciprocal-rank fusion; scores are RRF values, not cosine)
+    SEARCH_MODE = os.getenv("SEARCH_MODE", "dense").lower()
+    HYBRID_CANDIDATES = int(os.getenv("HYBRID_CANDIDATES", "20"))
+    # Optional cross-encoder rerank of over-fetched candidates (sharper top hits,
+    # so fewer chunks need to reach the LLM)
+    ENABLE_RERANK = os.getenv("ENABLE_RERANK", "False").lower() == "true"
+    RERANK_MODEL = os.getenv("RERANK_MODEL", "cross-encoder/ms-marco-MiniLM-L-6-v2")
+    RERANK_CANDIDATES = int(os.getenv("RERANK_CANDIDATES", "20"))
+    RERANK_TOP_K = int(os.getenv("RERANK_TOP_K", "3"))
+    RERANK_CACHE_SIZE = int(os.getenv("RERANK_CACHE_SIZE", "20000"))
+    RERANK_CACHE_TTL = int(os.getenv("RERANK_CACHE_TTL", "3600"))
+    # Maximal-marginal-relevance selection: drop near-duplicate chunks
+    # (overlapping chunks, the same notes uploaded under several types)
+    ENABLE_MMR = os.getenv("ENABLE_MMR", "False").lower() == "true"
+    MMR_LAMBDA = float(os.getenv("MMR_LAMBDA", "0.5"))
+    MMR_CANDIDATES = int(os.getenv("MMR_CANDIDATES", "20"))
+    # Query router: infer subject (centroid match) / document type (keywords)
+    # when the chat filters are left at "All"
+    ENABLE_QUERY_ROUTING = os.getenv("ENABLE_QUERY_ROUTING", "False").lower() == "true"
+    ROUTER_MIN_SIMILARITY = float(os.getenv("ROUTER_MIN_SIMILARITY", "0.45"))
+    ROUTER_MIN_MARGIN = float(os.getenv("ROUTER_MIN_MARGIN", "0.08"))
+    ROUTER_SAMPLES_PER_SUBJECT = int(os.getenv("ROUTER_SAMPLES_PER_SUBJECT", "200"))
+    # Minimum gap between background centroid rebuilds after uploads
+    ROUTER_REFRESH_SECONDS = float(os.getenv("ROUTER_REFRESH_SECONDS", "30"))
+    # Optional Qdrant sharding: one collection per "subject" or "year" ("" = single
+    # collection); searches fan out over the matching shards on a thread pool.
+    # Existing data: VectorStore().shards.import_from(COLLECTION_NAME)
+    SHARD_BY = os.getenv("SHARD_BY", "").lower()
+    SHARD_WORKERS = int(os.getenv("SHARD_WORKERS", "8"))
+    # Prompt context: token budget filled best-score-first, cut at sentence ends
+    CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", "600"))
+    CONTEXT_MIN_TOKENS = int(os.getenv("CONTEXT_MIN_TOKENS", "40"))
+    BM25_INDEX_DIR = os.getenv("BM25_INDEX_DIR", "./bm25_index")
+    # Per-document registry (local backends; Qdrant uses a side collection)
+    REGISTRY_DIR = os.getenv("REGISTRY_DIR", "./document_registry")
+    # Query-embedding cache shared by all sessions
+    QUERY_CACHE_SIZE = int(os.getenv("QUERY_CACHE_SIZE", "2048"))
+    QUERY_CACHE_TTL = int(os.getenv("QUERY_CACHE_TTL", "3600"))
+    # Semantic answer cache in front of the LLM
+    ENABLE_ANSWER_CACHE = os.getenv("ENABLE_ANSWER_CACHE", "True").lower() == "true"
+    ANSWER_CACHE_THRESHOLD = float(os.getenv("ANSWER_CACHE_THRESHOLD", "0.92"))
+    ANSWER_CACHE_SIZE = int(os.getenv("ANSWER_CACHE_SIZE", "500"))
+    ANSWER_CACHE_TTL = int(os.getenv("ANSWER_CACHE_TTL", "86400"))
+    # Seconds a duplicate in-flight question waits for the first one's answer
+    SINGLE_FLIGHT_TIMEOUT = float(os.getenv("SINGLE_FLIGHT_TIMEOUT", "60"))
+    # Conversation memory: latest answer + rolling extractive summary of older turns
+    HISTORY_RECENT_TOKENS = int(os.getenv("HISTORY_RECENT_TOKENS", "150"))
+    HISTORY_SUMMARY_TOKENS = int(os.getenv("HISTORY_SUMMARY_TOKENS", "200"))
+    HISTORY_TURN_TOKENS = int(os.getenv("HISTORY_TURN_TOKENS", "40"))
+    # Local extractive answers (LLM outage fallback and "quick answer" mode)
+    EXTRACTIVE_MAX_SENTENCES = int(os.getenv("EXTRACTIVE_MAX_SENTENCES", "4"))
+    EXTRACTIVE_MIN_SCORE = float(os.getenv("EXTRACTIVE_MIN_SCORE", "0.3"))
 
     # ----------------------------
     # Rate Limiting
     # ----------------------------
     ENABLE_RATE_LIMITING = os.getenv("ENABLE_RATE_LIMITING", "True").lower() == "true"
     RATE_LIMIT_DELAY = int(os.getenv("RATE_LIMIT_DELAY", "1"))
+    # Groq quota shared by every session (one API key)
+    GROQ_RPM = int(os.getenv("GROQ_RPM", "30"))
+    GROQ_TPM = int(os.getenv("GROQ_TPM", "6000"))
+    # Longest a request waits in the Groq queue before failing over
+    GROQ_MAX_QUEUE_WAIT = float(os.getenv("GROQ_MAX_QUEUE_WAIT", "20"))
 
     # -----------------
     # Document categories
@@ -0,0 +1,119 @@
+"""
+Context Packer Module
+Fills a token budget with retrieved chunks, best score first, trimming the
+last chunk at a sentence boundary instead of a fixed character cut.
+"""
+import re
+from typing import Dict, List, Optional, Tuple
+
+from src.config import Config
+
+SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+|\n{2,}")
+
+
+class PackedContext(list):
+    """Documents already fitted to the budget; pack_context() passes them through"""
+
+
+def _tokenizer():
+    """Embedding model's tokenizer (loaded anyway for search), or None"""
+    try:
+        from src.resources import get_embedding_model
+        return getattr(get_embedding_model(), "tokenizer", None)
+    except Exception:
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """Token count with the local tokenizer; ~4 chars per token without one"""
+    if not text:
+        return 0
+    tokenizer = _tokenizer()
+    if tokenizer is None:
+        return max(1, len(text) // 4)
+    return len(tokenizer(text, add_special_tokens=False)["input_ids"])
+
+
+def count_tokens_many(texts: List[str]) -> List[int]:
+    """Batch version of count_tokens() (one tokenizer call)"""
+    if not texts:
+        return []
+    tokenizer = _tokenizer()
+    if tokenizer is None:
+        return [max(1, len(t) // 4) if t else 0 for t in texts]
+    return [len(ids) for ids in tokenizer(list(texts), add_special_tokens=False)["input_ids"]]
+
+
+def _trim_to_budget(text: str, budget: int) -> Tuple[str, int]:
+    """Longest prefix of whole sentences that fits in the budget"""
+    sentences = [s for s in SENTENCE_SPLIT.split(text) if s.strip()]
+    counts = count_tokens_many(sentences)
+    kept, used = [], 0
+    for sentence, tokens in zip(sentences, counts):
+        if used + tokens > budget:
+            break
+        kept.append(sentence.strip())
+        used += tokens
+    return " ".join(kept), used
+
+
+def context_sources(documents: Optional[List[Dict]]) -> List[Dict]:
+    """Source entries (document, subject, page) for the documents placed in a prompt"""
+    sources = []
+    for doc in pack_context(documents):
+        meta = doc.get("metadata", {})
+        sources.append({
+            "document": meta.get("source", "Unknown"),
+            "subject": meta.get("subject", "General"),
+            "page": meta.get("page", "N/A")
+        })
+    return sources
+
+
+def pack_context(
+    documents: Optional[List[Dict]],
+    budget: Optional[int] = None,
+    min_tokens: Optional[int] = None
+) -> List[Dict]:
+    """
+    Select and trim retrieved documents to fit a token budget
+
+    Args:
+        documents: Search results ('text', 'metadata', 'score')
+        budget: Token budget for all context (default Config.CONTEXT_TOKEN_BUDGET)
+        min_tokens: Smallest useful trimmed excerpt (default Config.CONTEXT_MIN_TOKENS)
+
+    Returns:
+        PackedContext of copies of the chosen documents, best score first,
+        with 'text' trimmed where needed and 'token_count' set. Packing is
+        done once per turn: an already packed list is returned as is.
+    """
+    if isinstance(documents, PackedContext) and budget is None and min_tokens is None:
+        return documents
+    if not documents:
+        return PackedContext()
+    budget = Config.CONTEXT_TOKEN_BUDGET if budget is None else budget
+    min_tokens = Config.CONTEXT_MIN_TOKENS if min_tokens is None else min_tokens
+
+    docs = [d for d in documents if isinstance(d, dict) and d.get("text")]
+    docs.sort(key=lambda d: d.get("score") or 0.0, reverse=True)
+
+    # Token counts cached in the payload at ingestion; count the rest in one call
+    counts = [d.get("metadata", {}).get("token_count") for d in docs]
+    missing = [i for i, c in enumerate(counts) if not isinstance(c, int)]
+    for i, count in zip(missing, count_tokens_many([docs[i]["text"] for i in missing])):
+        counts[i] = count
+
+    packed, remaining = [], budget
+    for doc, tokens in zip(docs, counts):
+        if remaining < min_tokens:
+            break
+        if tokens <= remaining:
+            packed.append({**doc, "token_count": tokens})
+            remaining -= tokens
+            continue
+        excerpt, excerpt_tokens = _trim_to_budget(doc["text"], remaining)
+        if excerpt and excerpt_tokens >= min_tokens:
+            packed.append({**doc, "text": excerpt, "token_count": excerpt_tokens})
+            remaining -= excerpt_tokens
+    return PackedContext(packed)
@@ -3,11 +3,16 @@ Document Processor Module
 Handles PDF loading, text extraction, chunking, and math-aware splitting.
 """
 
-from typing import List, Dict
+from typing import List, Dict, Iterator, Optional
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+import multiprocessing
 import PyPDF2
 import pdfplumber
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from src.config import Config
+from src.pdf_worker import extract_page_range
 import os
 import re
 
@@ -18,6 +23,7 @@ class DocumentProcessor:
     def __init__(self):
         self.chunk_size = Config.CHUNK_SIZE
         self.chunk_overlap = Config.CHUNK_OVERLAP
+        self.pdf_workers = max(1, Config.PDF_WORKERS)
 
         # Regular text splitter
         self.text_splitter = RecursiveCharacterTextSplitter(
@@ -103,53 +109,142 @@ class DocumentProcessor:
     def extract_text_with_layout(self, file_path: str) -> List[Dict]:
         """
         Extract text while preserving page number and layout.
-        Uses pdfplumber (best for clean extraction).
+        Uses pdfplumber (best for clean extraction), split across a process
+        pool for large files (Config.PDF_WORKERS).
         Falls back to PyPDF2 if pdfplumber fails.
         """
-        pages_content = []
+        return list(self.iter_pages(file_path))
+
+    def iter_pages(self, file_path: str, page_count: Optional[int] = None) -> Iterator[Dict]:
+        """
+        Yield extracted pages in page order as soon as they are available.
+        Same extraction/fallback rules as extract_text_with_layout().
+        """
+        yielded = set()
 
         # Try pdfplumber first
         try:
-            with pdfplumber.open(file_path) as pdf:
-                for page_num, page in enumerate(pdf.pages, start=1):
-                    text = page.extract_text()
-                    if text and text.strip():
-                        pages_content.append({
-                            "page_number": page_num,
-                            "text": text.strip(),
-                            "has_math": self.detect_math_content(text)
-                        })
+            if page_count is None:
+                page_count = self.count_pages(file_path)
+            if self.pdf_workers > 1 and page_count >= Config.PDF_PARALLEL_MIN_PAGES:
+                pages = self._iter_pages_parallel(file_path, page_count)
+            else:
+                pages = self._iter_pages_serial(file_path)
+            for page_data in pages:
+                yielded.add(page_data["page_number"])
+                yield page_data
                         
-            if pages_content:
-                print(f"✓ pdfplumber extracted {len(pages_content)} pages")
-                return pages_content
+            if yielded:
+                print(f"✓ pdfplumber extracted {len(yielded)} pages")
+                return
                 
         except Exception as e:
             print(f"⚠️ pdfplumber failed: {e}")
 
-        # Fallback to PyPDF2
+        # Fallback to PyPDF2 (pages not already produced by pdfplumber)
+        count = 0
         try:
             with open(file_path, 'rb') as file:
                 reader = PyPDF2.PdfReader(file)
                 for page_num, page in enumerate(reader.pages, start=1):
+                    if page_num in yielded:
+                        continue
                     try:
                         text = page.extract_text()
                         if text and text.strip():
-                            pages_content.append({
-                                "page_number": page_num,
-                                "text": text.strip(),
-                                "has_math": self.detect_math_content(text)
-                            })
+                            count += 1
+                            yield self._page_record(page_num, text)
                     except Exception as e:
                         print(f"⚠️ Error on page {page_num}: {e}")
                         continue
                         
-            print(f"✓ PyPDF2 extracted {len(pages_content)} pages")
+            print(f"✓ PyPDF2 extracted {count} pages")
             
         except Exception as e:
             print(f"❌ PyPDF2 also failed: {e}")
 
-        return pages_content
+    # ----------------------------------------------------------------
+
+    def _page_record(self, page_num: int, text: str) -> Dict:
+        return {
+            "page_number": page_num,
+            "text": text.strip(),
+            "has_math": self.detect_math_content(text)
+        }
+
+    def count_pages(self, file_path: str) -> int:
+        """Cheap page count (0 if the file cannot be read)"""
+        try:
+            with open(file_path, 'rb') as file:
+                return len(PyPDF2.PdfReader(file).pages)
+        except Exception:
+            return 0
+
+    def _iter_pages_serial(self, file_path: str) -> Iterator[Dict]:
+        with pdfplumber.open(file_path) as pdf:
+            for page_num, page in enumerate(pdf.pages, start=1):
+                text = page.extract_text()
+                if text and text.strip():
+                    yield self._page_record(page_num, text)
+
+    def _iter_pages_parallel(self, file_path: str, page_count: int) -> Iterator[Dict]:
+        """
+        Extract page ranges in worker processes, yielding them in page order.
+        At most two ranges per worker are in flight, so memory stays bounded.
+        Pages pdfplumber fails on are retried one by one with PyPDF2.
+        """
+        # Several ranges per worker so slow (image-heavy) ranges balance out
+        n_ranges = min(page_count, self.pdf_workers * 4)
+        step = -(-page_count // n_ranges)
+        ranges = iter([(start, min(start + step, page_count)) for start in range(0, page_count, step)])
+
+        # Spawned workers: forking a process that already runs torch and
+        # pipeline threads can deadlock on locks held by those threads
+        with ProcessPoolExecutor(
+            max_workers=self.pdf_workers,
+            mp_context=multiprocessing.get_context("spawn")
+        ) as pool:
+            pending = deque(
+                (page_range, pool.submit(extract_page_range, file_path, *page_range))
+                for page_range in islice(ranges, self.pdf_workers * 2)
+            )
+            while pending:
+                (start, end), future = pending.popleft()
+                next_range = next(ranges, None)
+                if next_range:
+                    pending.append((next_range, pool.submit(extract_page_range, file_path, *next_range)))
+                try:
+                    extracted = future.result()
+                except Exception as e:
+                    print(f"⚠️ Worker failed on pages {start + 1}-{end}: {e}")
+                    extracted = [(index + 1, None) for index in range(start, end)]
+
+                failed = [page_num for page_num, text in extracted if text is None]
+                if failed:
+                    recovered = self._extract_pages_pypdf2(file_path, failed)
+                    extracted = [
+                        (page_num, recovered.get(page_num) if text is None else text)
+                        for page_num, text in extracted
+                    ]
+                for page_num, text in extracted:
+                    if text and text.strip():
+                        yield self._page_record(page_num, text)
+        print(f"✓ Parallel extraction: {page_count} pages on {self.pdf_workers} workers")
+
+    def _extract_pages_pypdf2(self, file_path: str, page_numbers: List[int]) -> Dict[int, str]:
+        """Per-page PyPDF2 fallback for specific (1-based) pages"""
+        recovered = {}
+        try:
+            with open(file_path, 'rb') as file:
+                reader = PyPDF2.PdfReader(file)
+                for page_num in page_numbers:
+                    try:
+                        recovered[page_num] = reader.pages[page_num - 1].extract_text()
+                    except Exception as e:
+                        print(f"⚠️ Error on page {page_num}: {e}")
+        except Exception as e:
+            print(f"❌ PyPDF2 fallback failed: {e}")
+        return recovered
 
     # ----------------------------------------------------------------
 
@@ -158,34 +253,40 @@ class DocumentProcessor:
         Split PDF into text chunks while keeping formulas together.
         """
         all_chunks = []
-
         for page_data in pages_content:
-            page_num = page_data["page_number"]
-            text = page_data["text"]
-            has_math = page_data["has_math"]
+            all_chunks.extend(self.chunk_page(page_data, metadata))
+        return all_chunks
 
-            # Use math-aware chunking if needed
-            if has_math:
-                chunks = self.chunk_with_math_preservation(text, self.chunk_size)
-            else:
-                chunks = self.text_splitter.split_text(text)
-
-            # Attach metadata to each chunk
-            for i, chunk in enumerate(chunks):
-                if chunk.strip():  # Only add non-empty chunks
-                    chunk_doc = {
-                        "content": chunk.strip(),  # Changed from "text" to "content" for vector store compatibility
-                        "metadata": {
-                            **metadata,
-                            "page": page_num,
-                            "chunk_id": i,
-                            "total_chunks": len(chunks),
-                            "has_math": has_math
-                        }
+    def chunk_page(self, page_data: Dict, metadata: Dict) -> List[Dict]:
+        """
+        Split a single extracted page into chunks (streaming ingestion).
+        """
+        page_num = page_data["page_number"]
+        text = page_data["text"]
+        has_math = page_data["has_math"]
+
+        # Use math-aware chunking if needed
+        if has_math:
+            chunks = self.chunk_with_math_preservation(text, self.chunk_size)
+        else:
+            chunks = self.text_splitter.split_text(text)
+
+        # Attach metadata to each chunk
+        page_chunks = []
+        for i, chunk in enumerate(chunks):
+            if chunk.strip():  # Only add non-empty chunks
+                chunk_doc = {
+                    "content": chunk.strip(),  # Changed from "text" to "content" for vector store compatibility
+                    "metadata": {
+                        **metadata,
+                        "page": page_num,
+                        "chunk_id": i,
+                        "total_chunks": len(chunks),
+                        "has_math": has_math
                     }
-                    all_chunks.append(chunk_doc)
-
-        return all_chunks
+                }
+                page_chunks.append(chunk_doc)
+        return page_chunks
 
     # ----------------------------------------------------------------
 
@@ -0,0 +1,199 @@
+"""
+Document Registry Module
+One record per uploaded file (chunk/page counts, type, subject, year, upload
+time) so listing and per-type statistics never have to scan chunk payloads.
+"""
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from qdrant_client.models import Distance, PointStruct, VectorParams
+
+KEY_FIELDS = ("source", "subject", "year", "type")
+
+
+def document_key(source, subject, year, doc_type) -> Tuple[str, str, str, str]:
+    """Identity of an uploaded document"""
+    return (str(source), str(subject), str(year), str(doc_type))
+
+
+class FileRegistryStore:
+    """Registry persistence as a local JSON file (ChromaDB / flat index)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    def load_all(self) -> List[Dict]:
+        if not os.path.exists(self.path):
+            return []
+        with open(self.path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def save_all(self, records: List[Dict]):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(records, f)
+        os.replace(tmp_path, self.path)
+
+    def put(self, record: Dict, records: List[Dict]):
+        self.save_all(records)
+
+    def delete(self, key: Tuple, records: List[Dict]):
+        self.save_all(records)
+
+    def clear(self):
+        self.save_all([])
+
+
+class QdrantRegistryStore:
+    """Registry persistence as a small side collection next to the chunks"""
+
+    def __init__(self, client, collection_name: str):
+        self.client = client
+        self.collection_name = collection_name
+        existing = {c.name for c in client.get_collections().collections}
+        if collection_name not in existing:
+            self._create()
+
+    def _create(self):
+        # Qdrant needs a vector per point; records only use the payload
+        self.client.create_collection(
+            collection_name=self.collection_name,
+            vectors_config=VectorParams(size=1, distance=Distance.DOT)
+        )
+
+    @staticmethod
+    def _point_id(key: Tuple) -> int:
+        return int(hashlib.md5("|".join(key).encode()).hexdigest()[:16], 16) % (2**63 - 1)
+
+    def load_all(self) -> List[Dict]:
+        records = []
+        offset = None
+        while True:
+            points, offset = self.client.scroll(
+                collection_name=self.collection_name,
+                limit=256,
+                offset=offset,
+                with_payload=True,
+                with_vectors=False
+            )
+            records.extend(point.payload for point in points)
+            if offset is None:
+                return records
+
+    def put(self, record: Dict, records: List[Dict]):
+        key = document_key(*(record[f] for f in KEY_FIELDS))
+        self.client.upsert(
+            collection_name=self.collection_name,
+            points=[PointStruct(id=self._point_id(key), vector=[1.0], payload=record)],
+            wait=True
+        )
+
+    def delete(self, key: Tuple, records: List[Dict]):
+        self.client.delete(
+            collection_name=self.collection_name,
+            points_selector=[self._point_id(key)],
+            wait=True
+        )
+
+    def clear(self):
+        self.client.delete_collection(self.collection_name)
+        self._create()
+
+
+class DocumentRegistry:
+    """In-memory document table with write-through persistence"""
+
+    def __init__(self, store):
+        self.store = store
+        self._lock = threading.Lock()
+        self._records: Dict[Tuple, Dict] = {}
+        try:
+            for record in store.load_all():
+                self._records[document_key(*(record[f] for f in KEY_FIELDS))] = record
+        except Exception as e:
+            print(f"⚠️ Could not load document registry: {e}")
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    @staticmethod
+    def summarize_chunks(chunks: Iterable[Dict]) -> Dict[Tuple, Dict]:
+        """Group chunk metadata into per-document counts"""
+        summary: Dict[Tuple, Dict] = {}
+        for chunk in chunks:
+            meta = chunk.get("metadata", chunk)
+            key = document_key(
+                meta.get("source", "Unknown"),
+                meta.get("subject", "General"),
+                meta.get("year", "N/A"),
+                meta.get("type", "general")
+            )
+            entry = summary.setdefault(key, {"chunk_count": 0, "pages": set(), "total_pages": 0})
+            entry["chunk_count"] += 1
+            entry["pages"].add(meta.get("page"))
+            total_pages = meta.get("total_pages")
+            if isinstance(total_pages, int):
+                entry["total_pages"] = max(entry["total_pages"], total_pages)
+        return summary
+
+    def register(self, summary: Dict[Tuple, Dict], replace: bool = True):
+        """
+        Record documents written to the vector store
+
+        Args:
+            summary: Output of summarize_chunks() for the chunks actually stored
+            replace: Overwrite counts (re-upload) instead of adding to them
+        """
+        now = datetime.now().isoformat(timespec="seconds")
+        with self._lock:
+            for key, entry in summary.items():
+                page_count = max(entry["total_pages"], len(entry["pages"]))
+                previous = self._records.get(key)
+                chunk_count = entry["chunk_count"]
+                if previous and not replace:
+                    chunk_count += previous.get("chunk_count", 0)
+                    page_count = max(page_count, previous.get("page_count", 0))
+                record = {
+                    **dict(zip(KEY_FIELDS, key)),
+                    "chunk_count": chunk_count,
+                    "page_count": page_count,
+                    "uploaded_at": now
+                }
+                self._records[key] = record
+                try:
+                    self.store.put(record, list(self._records.values()))
+                except Exception as e:
+                    print(f"⚠️ Registry write failed for '{key[0]}': {e}")
+
+    def remove(self, source, subject, year, doc_type) -> bool:
+        key = document_key(source, subject, year, doc_type)
+        with self._lock:
+            if self._records.pop(key, None) is None:
+                return False
+            self.store.delete(key, list(self._records.values()))
+            return True
+
+    def clear(self):
+        with self._lock:
+            self._records.clear()
+            self.store.clear()
+
+    def list(self) -> List[Dict]:
+        """All documents sorted by subject, year, type, source"""
+        records = list(self._records.values())
+        return sorted(records, key=lambda r: (r["subject"], r["year"], r["type"], r["source"]))
+
+    def count_by_type(self, doc_types: Optional[List[str]] = None) -> Dict[str, int]:
+        """Number of distinct sources per document type"""
+        sources: Dict[str, set] = {t: set() for t in (doc_types or [])}
+        for record in self._records.values():
+            sources.setdefault(record["type"], set()).add(record["source"])
+        return {doc_type: len(names) for doc_type, names in sources.items()}
+
+    def total_chunks(self) -> int:
+        return sum(r.get("chunk_count", 0) for r in self._records.values())
@@ -0,0 +1,132 @@
+"""
+Extractive Answerer Module
+Builds a short, cited answer from retrieved chunks without an LLM: every
+candidate sentence is embedded in one MiniLM batch and ranked by cosine
+similarity to the query. Used when LLM providers are down or rate limited,
+and for the chat page's "quick answer" mode.
+"""
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from src.config import Config
+from src.context_packer import SENTENCE_SPLIT
+
+MIN_SENTENCE_CHARS = 25
+MAX_SENTENCE_CHARS = 500
+
+
+class ExtractiveAnswerer:
+    """Query-focused sentence extraction over search results"""
+
+    def __init__(
+        self,
+        model=None,
+        max_sentences: Optional[int] = None,
+        min_score: Optional[float] = None,
+        max_candidates: int = 200
+    ):
+        """
+        Args:
+            model: SentenceTransformer (default: the shared embedding model)
+            max_sentences: Sentences in an answer (default Config.EXTRACTIVE_MAX_SENTENCES)
+            min_score: Minimum cosine similarity for a sentence (default Config.EXTRACTIVE_MIN_SCORE)
+            max_candidates: Cap on sentences embedded per question
+        """
+        if model is None:
+            from src.resources import get_embedding_model
+            model = get_embedding_model()
+        self.model = model
+        self.max_sentences = max_sentences or Config.EXTRACTIVE_MAX_SENTENCES
+        self.min_score = Config.EXTRACTIVE_MIN_SCORE if min_score is None else min_score
+        self.max_candidates = max_candidates
+
+    @staticmethod
+    def _candidates(documents: List[Dict], limit: int) -> List[Dict]:
+        """Sentences of each document, best-ranked documents first"""
+        candidates = []
+        for rank, doc in enumerate(documents):
+            for position, sentence in enumerate(SENTENCE_SPLIT.split(doc.get("text", ""))):
+                sentence = " ".join(sentence.split())
+                if MIN_SENTENCE_CHARS <= len(sentence) <= MAX_SENTENCE_CHARS:
+                    candidates.append({"text": sentence, "doc": rank, "position": position})
+                    if len(candidates) >= limit:
+                        return candidates
+        return candidates
+
+    def _select(self, scores: np.ndarray, vectors: np.ndarray) -> List[int]:
+        """Top-scoring sentences, skipping near-duplicates of ones already chosen"""
+        chosen: List[int] = []
+        for i in np.argsort(-scores):
+            if scores[i] < self.min_score or len(chosen) >= self.max_sentences:
+                break
+            if chosen and float(np.max(vectors[chosen] @ vectors[i])) > 0.9:
+                continue
+            chosen.append(int(i))
+        return chosen
+
+    def answer(self, query: str, documents: Optional[List[Dict]], query_embedding=None) -> Dict:
+        """
+        Stitch the most relevant sentences into a cited answer
+
+        Args:
+            query: User question
+            documents: Search results ('text', 'metadata', 'score')
+            query_embedding: Cached query vector, if the caller has one
+
+        Returns:
+            Dict with answer, sources, model and status ("success", or
+            "no_answer" when nothing in the documents is close enough)
+        """
+        documents = [d for d in (documents or []) if isinstance(d, dict) and d.get("text")]
+        candidates = self._candidates(documents, self.max_candidates)
+        if not candidates:
+            return self._no_answer()
+
+        texts = [c["text"] for c in candidates]
+        if query_embedding is None:
+            vectors = self.model.encode([query] + texts, convert_to_numpy=True)
+            query_vector, vectors = vectors[0], vectors[1:]
+        else:
+            query_vector = np.asarray(query_embedding, dtype=np.float32)
+            vectors = self.model.encode(texts, convert_to_numpy=True)
+        vectors = vectors / (np.linalg.norm(vectors, axis=1, keepdims=True) + 1e-12)
+        query_vector = query_vector / (np.linalg.norm(query_vector) + 1e-12)
+        scores = vectors @ query_vector
+
+        chosen = self._select(scores, vectors)
+        if not chosen:
+            return self._no_answer()
+
+        # Keep the documents' own reading order inside the answer
+        chosen.sort(key=lambda i: (candidates[i]["doc"], candidates[i]["position"]))
+        citation: Dict[int, int] = {}
+        sources, lines = [], []
+        for i in chosen:
+            rank = candidates[i]["doc"]
+            if rank not in citation:
+                citation[rank] = len(citation) + 1
+                meta = documents[rank].get("metadata", {})
+                sources.append({
+                    "document": meta.get("source", "Unknown"),
+                    "subject": meta.get("subject", "General"),
+                    "type": meta.get("type", "General"),
+                    "page": meta.get("page", "N/A")
+                })
+            lines.append(f"- {candidates[i]['text']} [{citation[rank]}]")
+
+        return {
+            "answer": "📚 **From your notes:**\n\n" + "\n".join(lines),
+            "sources": sources,
+            "model": "Extractive",
+            "status": "success"
+        }
+
+    @staticmethod
+    def _no_answer() -> Dict:
+        return {
+            "answer": "🔍 I couldn't find a direct answer in your materials.",
+            "sources": [],
+            "model": "Extractive",
+            "status": "no_answer"
+        }
@@ -0,0 +1,286 @@
+"""
+Flat Vector Index Module
+Embedded exact-search backend: a contiguous float32 matrix in an append-only
+raw file opened as a memory map, with an append-only JSONL payload log.
+Upserts and deletes only append (new rows plus tombstones for the rows they
+replace or remove); the files are compacted once most rows are dead.
+"""
+import json
+import os
+import threading
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+# Rewrite the files once dead rows outnumber live ones (amortized O(1) per row)
+COMPACT_MIN_ROWS = 1024
+
+
+class FlatIndex:
+    """Exact cosine search over an in-process float32 matrix"""
+
+    # Payload fields kept as columns for vectorized metadata filtering
+    FILTER_FIELDS = ("source", "type", "subject", "year")
+
+    def __init__(self, directory: str, dim: int = 384):
+        """
+        Args:
+            directory: Folder holding vectors.f32, payloads.jsonl and deleted.jsonl
+            dim: Embedding dimension
+        """
+        self.directory = directory
+        self.dim = dim
+        self.vectors_path = os.path.join(directory, "vectors.f32")
+        self.payloads_path = os.path.join(directory, "payloads.jsonl")
+        self.deleted_path = os.path.join(directory, "deleted.jsonl")
+        self._write_lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._load()
+
+    # ----------------------------------------------------------------
+
+    @staticmethod
+    def _read_jsonl(path: str) -> List[Dict]:
+        """Complete lines of a JSONL log (a torn last line is dropped)"""
+        if not os.path.exists(path):
+            return []
+        records = []
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.endswith("\n"):
+                    break
+                records.append(json.loads(line))
+        return records
+
+    def _open_vectors(self, rows: int) -> np.ndarray:
+        """Read-only memory map over the first `rows` rows of the vector file"""
+        if rows == 0:
+            return np.empty((0, self.dim), dtype=np.float32)
+        return np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(rows, self.dim))
+
+    def _load(self):
+        """Replay the payload and tombstone logs over the memory-mapped matrix"""
+        records = self._read_jsonl(self.payloads_path)
+        stored_rows = os.path.getsize(self.vectors_path) // (4 * self.dim) if os.path.exists(self.vectors_path) else 0
+        # A crash between the two appends leaves extra rows in one file; ignore them
+        rows = min(len(records), stored_rows)
+        records = records[:rows]
+        live = np.ones(rows, dtype=bool)
+        for record in self._read_jsonl(self.deleted_path):
+            dead = [r for r in record["rows"] if r < rows]
+            live[dead] = False
+        self._set_state(
+            self._open_vectors(rows),
+            [r["id"] for r in records],
+            [r["payload"] for r in records],
+            live
+        )
+
+    def _columns(self, payloads: List[Dict]) -> Dict[str, np.ndarray]:
+        return {
+            field: np.array([str(p.get(field, "")) for p in payloads], dtype=str)
+            for field in self.FILTER_FIELDS
+        }
+
+    def _set_state(
+        self,
+        vectors: np.ndarray,
+        ids: List[str],
+        payloads: List[Dict],
+        live: np.ndarray,
+        columns: Optional[Dict[str, np.ndarray]] = None
+    ):
+        """Swap in a new snapshot; readers holding the old one are unaffected"""
+        if columns is None:
+            columns = self._columns(payloads)
+        positions = {ids[i]: int(i) for i in np.flatnonzero(live)}
+        self._state = (vectors, ids, payloads, columns, positions, live)
+
+    @staticmethod
+    def _append_lines(path: str, records: Iterable[Dict]):
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("".join(json.dumps(r) + "\n" for r in records))
+
+    def _rewrite(self, vectors: np.ndarray, ids: List[str], payloads: List[Dict]):
+        """Atomically replace all files with just the given live rows"""
+        tmp_vectors = self.vectors_path + ".tmp"
+        tmp_payloads = self.payloads_path + ".tmp"
+        np.ascontiguousarray(vectors, dtype=np.float32).tofile(tmp_vectors)
+        with open(tmp_payloads, "w", encoding="utf-8") as f:
+            f.write("".join(json.dumps({"id": i, "payload": p}) + "\n" for i, p in zip(ids, payloads)))
+        os.replace(tmp_vectors, self.vectors_path)
+        os.replace(tmp_payloads, self.payloads_path)
+        if os.path.exists(self.deleted_path):
+            os.remove(self.deleted_path)
+
+    def _compact_if_needed(self):
+        """Drop dead rows from disk once they are the majority"""
+        vectors, ids, payloads, _, _, live = self._state
+        n_live = int(live.sum())
+        if len(ids) < COMPACT_MIN_ROWS or n_live * 2 > len(ids):
+            return
+        keep = np.flatnonzero(live)
+        self._rewrite(vectors[keep], [ids[i] for i in keep], [payloads[i] for i in keep])
+        self._load()
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    def _mask(self, filters: Optional[Dict], state: tuple) -> Optional[np.ndarray]:
+        """Boolean mask of live rows matching all filters (None = every row)"""
+        _, _, payloads, columns, _, live = state
+        mask = None if live.all() else live.copy()
+        for key, value in (filters or {}).items():
+            if value is None or value == "All":
+                continue
+            if mask is None:
+                mask = np.ones(len(payloads), dtype=bool)
+            values = value if isinstance(value, (list, tuple, set)) else [value]
+            values = [str(v) for v in values]
+            if key in columns:
+                column = columns[key]
+                mask &= np.isin(column, values)
+            else:
+                mask &= np.array([str(p.get(key)) in values for p in payloads], dtype=bool)
+        return mask
+
+    # ----------------------------------------------------------------
+
+    def add(self, ids: List[str], vectors, payloads: List[Dict]) -> int:
+        """Upsert vectors by id (existing ids are replaced)"""
+        if not ids:
+            return 0
+        new_vectors = self._normalize(vectors).reshape(len(ids), self.dim)
+        with self._write_lock:
+            _, old_ids, old_payloads, old_columns, positions, old_live = self._state
+            replaced = [positions[pid] for pid in ids if pid in positions]
+            start = len(old_ids)
+            with open(self.vectors_path, "ab") as f:
+                # Drop rows left behind by an append whose payloads never made it
+                f.truncate(start * self.dim * 4)
+                f.write(new_vectors.tobytes())
+            self._append_lines(self.payloads_path, ({"id": i, "payload": p} for i, p in zip(ids, payloads)))
+            if replaced:
+                self._append_lines(self.deleted_path, [{"rows": replaced}])
+            live = np.concatenate([old_live, np.ones(len(ids), dtype=bool)])
+            live[replaced] = False
+            # An id repeated within this batch: only its last row stays live
+            last = {pid: start + i for i, pid in enumerate(ids)}
+            if len(last) < len(ids):
+                dupes = [start + i for i, pid in enumerate(ids) if last[pid] != start + i]
+                self._append_lines(self.deleted_path, [{"rows": dupes}])
+                live[dupes] = False
+            added = self._columns(payloads)
+            self._set_state(
+                self._open_vectors(start + len(ids)),
+                old_ids + list(ids),
+                old_payloads + list(payloads),
+                live,
+                {field: np.concatenate([old_columns[field], added[field]]) for field in self.FILTER_FIELDS}
+            )
+            self._compact_if_needed()
+        return len(ids)
+
+    def search(
+        self,
+        vector,
+        top_k: int = 5,
+        filters: Optional[Dict] = None,
+        score_threshold: Optional[float] = None,
+        with_vectors: bool = False
+    ) -> List[Dict]:
+        """
+        Vectorized exact top-k by cosine similarity
+
+        Returns:
+            List of dicts with 'id', 'score', 'payload' (and 'vector')
+        """
+        state = self._state
+        vectors, ids, payloads, _, _, _ = state
+        if not ids or top_k <= 0:
+            return []
+        query = self._normalize(vector).reshape(-1)
+        scores = vectors @ query
+        mask = self._mask(filters, state)
+        if mask is not None:
+            scores = np.where(mask, scores, -np.inf)
+        k = min(top_k, len(ids))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        results = []
+        for idx in top:
+            score = float(scores[idx])
+            if score == -np.inf or (score_threshold is not None and score < score_threshold):
+                continue
+            hit = {"id": ids[idx], "score": score, "payload": payloads[idx]}
+            if with_vectors:
+                hit["vector"] = np.asarray(vectors[idx])
+            results.append(hit)
+        return results
+
+    def get(self, point_ids: List[str], with_vectors: bool = False) -> List[Dict]:
+        """Fetch stored points by id (missing ids are skipped)"""
+        vectors, _, payloads, _, positions, _ = self._state
+        results = []
+        for pid in point_ids:
+            idx = positions.get(pid)
+            if idx is None:
+                continue
+            hit = {"id": pid, "payload": payloads[idx]}
+            if with_vectors:
+                hit["vector"] = np.asarray(vectors[idx])
+            results.append(hit)
+        return results
+
+    def delete(self, filters: Dict) -> int:
+        """Delete all points matching the filters; returns number removed"""
+        if not any(v is not None and v != "All" for v in (filters or {}).values()):
+            return 0
+        with self._write_lock:
+            state = self._state
+            mask = self._mask(filters, state)
+            if not mask.any():
+                return 0
+            vectors, ids, payloads, _, _, live = state
+            dead = np.flatnonzero(mask)
+            self._append_lines(self.deleted_path, [{"rows": dead.tolist()}])
+            live = live.copy()
+            live[dead] = False
+            self._set_state(vectors, ids, payloads, live, state[3])
+            self._compact_if_needed()
+            return len(dead)
+
+    def payloads(self, filters: Optional[Dict] = None) -> List[Dict]:
+        """All payloads, optionally filtered"""
+        state = self._state
+        payloads = state[2]
+        mask = self._mask(filters, state)
+        if mask is None:
+            return list(payloads)
+        return [payloads[i] for i in np.flatnonzero(mask)]
+
+    def sample_vectors(self, filters: Optional[Dict], limit: int) -> np.ndarray:
+        """First `limit` stored vectors matching the filters"""
+        state = self._state
+        vectors = state[0]
+        mask = self._mask(filters, state)
+        rows = np.arange(len(vectors)) if mask is None else np.flatnonzero(mask)
+        return np.asarray(vectors[rows[:limit]])
+
+    def items(self) -> List[tuple]:
+        """All (id, payload) pairs"""
+        _, ids, payloads, _, _, live = self._state
+        return [(ids[i], payloads[i]) for i in np.flatnonzero(live)]
+
+    def count(self) -> int:
+        return len(self._state[4])
+
+    def clear(self):
+        """Remove every vector and payload"""
+        with self._write_lock:
+            self._rewrite(np.empty((0, self.dim), dtype=np.float32), [], [])
+            self._load()
@@ -0,0 +1,107 @@
+"""
+History Compressor Module
+Rolling, extractive summary of a chat session. The latest exchange is kept
+(trimmed to its key sentences); older exchanges are folded into a capped
+summary, so the history sent to the LLM stays the same size however long
+the session runs.
+"""
+from typing import Dict, List, Optional
+
+from src.bm25_index import tokenize
+from src.config import Config
+from src.context_packer import SENTENCE_SPLIT, count_tokens_many
+
+SUMMARY_LABEL = "Summary of our earlier conversation"
+
+
+def extract_key_sentences(text: str, budget: int, focus: str = "") -> str:
+    """
+    Pick the sentences that best carry a text within a token budget
+
+    Sentences are scored by overlap with the focus text (the question) plus
+    a bonus for appearing early, then kept in their original order.
+    """
+    sentences = [s.strip() for s in SENTENCE_SPLIT.split(text or "") if s.strip()]
+    if not sentences:
+        return ""
+    counts = count_tokens_many(sentences + [" ".join(sentences)])
+    if counts.pop() <= budget:
+        return " ".join(sentences)
+    focus_terms = set(tokenize(focus))
+    scored = []
+    for i, sentence in enumerate(sentences):
+        terms = set(tokenize(sentence))
+        overlap = len(terms & focus_terms) / (len(focus_terms) or 1)
+        scored.append((overlap + 1.0 / (1 + i), i))
+    chosen, used = [], 0
+    for _, i in sorted(scored, reverse=True):
+        if used + counts[i] > budget:
+            continue
+        chosen.append(i)
+        used += counts[i]
+    if not chosen:
+        # Even the best sentence is too long: keep its leading words
+        words = sentences[0].split()
+        return " ".join(words[:max(1, budget * 3 // 4)]) + "…"
+    text = " ".join(sentences[i] for i in sorted(chosen))
+    # Joined text can count a little longer than its sentences did separately
+    while len(chosen) > 1 and count_tokens_many([text])[0] > budget:
+        chosen.pop()
+        text = " ".join(sentences[i] for i in sorted(chosen))
+    return text
+
+
+class RollingSummary:
+    """Per-session conversation memory with a constant prompt footprint"""
+
+    def __init__(
+        self,
+        summary_tokens: Optional[int] = None,
+        recent_tokens: Optional[int] = None,
+        turn_tokens: Optional[int] = None
+    ):
+        """
+        Args:
+            summary_tokens: Cap for the folded summary of older turns
+            recent_tokens: Cap for the latest assistant answer
+            turn_tokens: Size each older turn is compressed to
+        """
+        self.summary_tokens = summary_tokens or Config.HISTORY_SUMMARY_TOKENS
+        self.recent_tokens = recent_tokens or Config.HISTORY_RECENT_TOKENS
+        self.turn_tokens = turn_tokens or Config.HISTORY_TURN_TOKENS
+        self.lines: List[str] = []
+        self.last_turn: Optional[Dict] = None
+        self.turns = 0
+
+    def update(self, user: str, assistant: str):
+        """Record a finished turn; the previous latest turn is folded into the summary"""
+        if self.last_turn is not None:
+            self._fold(self.last_turn)
+        self.last_turn = {
+            "user": user,
+            "assistant": extract_key_sentences(assistant, self.recent_tokens, focus=user)
+        }
+        self.turns += 1
+
+    def _fold(self, turn: Dict):
+        question = extract_key_sentences(turn["user"], max(8, self.turn_tokens // 3))
+        answer = extract_key_sentences(turn["assistant"], self.turn_tokens, focus=turn["user"])
+        line = f"- Q: {question} A: {answer}"
+        self.lines.append(line)
+        # Oldest exchanges fall out first once the summary is over budget
+        while len(self.lines) > 1 and count_tokens_many(["\n".join(self.lines)])[0] > self.summary_tokens:
+            self.lines.pop(0)
+
+    def as_history(self) -> List[Dict]:
+        """History in the providers' [{'user', 'assistant'}] format (at most two entries)"""
+        history = []
+        if self.lines:
+            history.append({"user": SUMMARY_LABEL, "assistant": "\n".join(self.lines)})
+        if self.last_turn is not None:
+            history.append(dict(self.last_turn))
+        return history
+
+    def clear(self):
+        self.lines.clear()
+        self.last_turn = None
+        self.turns = 0
@@ -0,0 +1,240 @@
+"""
+Ingestion Pipeline Module
+Streams a PDF through extract → chunk → embed → upsert stages connected by
+bounded queues, so all stages overlap and memory is bounded by queue depth
+instead of document size.
+"""
+import os
+import queue
+import threading
+from typing import Callable, Dict, Optional
+
+from src.config import Config
+from src.document_registry import DocumentRegistry
+
+_DONE = object()
+
+
+class _Cancelled(Exception):
+    """Raised inside a stage when another stage failed"""
+
+
+def _merge_summary(total: Dict, part: Dict):
+    """Fold one batch's summarize_chunks() output into the running summary"""
+    for key, entry in part.items():
+        merged = total.setdefault(key, {"chunk_count": 0, "pages": set(), "total_pages": 0})
+        merged["chunk_count"] += entry["chunk_count"]
+        merged["pages"] |= entry["pages"]
+        merged["total_pages"] = max(merged["total_pages"], entry["total_pages"])
+
+
+class IngestionPipeline:
+    """Threaded, backpressured PDF ingestion into a VectorStore"""
+
+    def __init__(
+        self,
+        processor,
+        vector_store,
+        batch_size: int = 100,
+        queue_depth: Optional[int] = None
+    ):
+        """
+        Args:
+            processor: DocumentProcessor used for extraction and chunking
+            vector_store: VectorStore receiving the chunks
+            batch_size: Chunks per embed/upsert batch
+            queue_depth: Items buffered between stages (default Config.INGEST_QUEUE_DEPTH)
+        """
+        self.processor = processor
+        self.vector_store = vector_store
+        self.batch_size = batch_size
+        self.queue_depth = max(1, queue_depth or Config.INGEST_QUEUE_DEPTH)
+
+    # ----------------------------------------------------------------
+
+    def _put(self, q: queue.Queue, item, stop: threading.Event):
+        """Blocking put that gives up when the pipeline is stopping"""
+        while True:
+            if stop.is_set():
+                raise _Cancelled()
+            try:
+                q.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def _get(self, q: queue.Queue, stop: threading.Event):
+        """Blocking get that gives up when the pipeline is stopping"""
+        while True:
+            if stop.is_set():
+                raise _Cancelled()
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                continue
+
+    def _run_stage(self, work: Callable, errors: list, stop: threading.Event):
+        try:
+            work()
+        except _Cancelled:
+            pass
+        except Exception as e:
+            errors.append(e)
+            stop.set()
+
+    def _extract(self, file_path: str, page_count: int, out_q, stop):
+        pages = self.processor.iter_pages(file_path, page_count)
+        try:
+            for page_data in pages:
+                self._put(out_q, page_data, stop)
+        finally:
+            pages.close()
+        self._put(out_q, _DONE, stop)
+
+    def _chunk(self, metadata: Dict, in_q, out_q, stop, counters: Dict):
+        batch = []
+        while True:
+            page_data = self._get(in_q, stop)
+            if page_data is _DONE:
+                break
+            counters["pages"] += 1
+            for chunk in self.processor.chunk_page(page_data, metadata):
+                batch.append(chunk)
+                if len(batch) >= self.batch_size:
+                    self._put(out_q, (batch, counters["pages"]), stop)
+                    batch = []
+        if batch:
+            self._put(out_q, (batch, counters["pages"]), stop)
+        self._put(out_q, _DONE, stop)
+
+    def _embed(self, in_q, out_q, stop):
+        while True:
+            item = self._get(in_q, stop)
+            if item is _DONE:
+                break
+            batch, pages_done = item
+            # Length bucketing: similar sizes in one encode call, less padding
+            batch.sort(key=lambda c: len(c["content"]))
+            embeddings = self.vector_store.embed_texts([c["content"] for c in batch])
+            self._put(out_q, (batch, embeddings, pages_done), stop)
+        self._put(out_q, _DONE, stop)
+
+    # ----------------------------------------------------------------
+
+    def run(
+        self,
+        file_path: str,
+        doc_type: str = "notes",
+        subject: str = "General",
+        year: str = "MCA 1st Year",
+        source_name: Optional[str] = None,
+        extra_metadata: Optional[Dict] = None,
+        on_progress: Optional[Callable[[int, int, int], None]] = None
+    ) -> Dict:
+        """
+        Ingest one PDF
+
+        Args:
+            file_path: Path to PDF file
+            doc_type: Document type (notes, assignments, question_papers, textbooks, syllabus)
+            subject: Subject name
+            year: Academic year
+            source_name: Stored 'source' (default: file name)
+            extra_metadata: Additional per-chunk metadata (semester, chapter, ...)
+            on_progress: Called after each upsert with (pages_done, total_pages, chunks_added)
+
+        Returns:
+            Dict with status, documents_added, pages and message
+        """
+        print(f"\n📄 Streaming ingestion: {os.path.basename(file_path)}")
+        if not os.path.exists(file_path):
+            return {"status": "error", "message": f"File not found: {file_path}"}
+
+        total_pages = self.processor.count_pages(file_path)
+        metadata = {
+            "source": source_name or os.path.basename(file_path),
+            "type": doc_type,
+            "subject": subject,
+            "year": year,
+            "file_path": file_path,
+            "total_pages": total_pages,
+            **(extra_metadata or {})
+        }
+
+        stop = threading.Event()
+        errors: list = []
+        counters = {"pages": 0}
+        pages_q = queue.Queue(maxsize=self.queue_depth * 2)
+        batches_q = queue.Queue(maxsize=self.queue_depth)
+        embedded_q = queue.Queue(maxsize=self.queue_depth)
+
+        stages = [
+            threading.Thread(
+                target=self._run_stage,
+                args=(lambda: self._extract(file_path, total_pages, pages_q, stop), errors, stop),
+                name="ingest-extract", daemon=True
+            ),
+            threading.Thread(
+                target=self._run_stage,
+                args=(lambda: self._chunk(metadata, pages_q, batches_q, stop, counters), errors, stop),
+                name="ingest-chunk", daemon=True
+            ),
+            threading.Thread(
+                target=self._run_stage,
+                args=(lambda: self._embed(batches_q, embedded_q, stop), errors, stop),
+                name="ingest-embed", daemon=True
+            ),
+        ]
+        for stage in stages:
+            stage.start()
+
+        total_added = 0
+        summary: Dict = {}
+        batch_num = 0
+        try:
+            # Upsert stage runs on the caller's thread (progress callbacks, UI)
+            while True:
+                item = self._get(embedded_q, stop)
+                if item is _DONE:
+                    break
+                batch, embeddings, pages_done = item
+                total_added += self.vector_store.upsert_embedded(batch, embeddings)
+                _merge_summary(summary, DocumentRegistry.summarize_chunks(batch))
+                batch_num += 1
+                print(f"✓ Stored batch {batch_num}: {len(batch)} chunks (page {pages_done}/{total_pages})")
+                if on_progress:
+                    on_progress(pages_done, total_pages, total_added)
+        except _Cancelled:
+            pass
+        except Exception as e:
+            errors.append(e)
+        finally:
+            stop.set()
+            for stage in stages:
+                stage.join()
+            if summary:
+                self.vector_store.finish_ingest(summary)
+
+        if errors:
+            print(f"❌ Ingestion failed after {total_added} chunks: {errors[0]}")
+            return {
+                "status": "error",
+                "documents_added": total_added,
+                "pages": counters["pages"],
+                "message": f"Failed to ingest {metadata['source']}: {errors[0]}"
+            }
+        if not total_added:
+            print(f"⚠️ No text extracted from {file_path}")
+            return {
+                "status": "error",
+                "documents_added": 0,
+                "pages": counters["pages"],
+                "message": "No content extracted"
+            }
+        return {
+            "status": "success",
+            "documents_added": total_added,
+            "pages": counters["pages"],
+            "message": f"✅ Added {total_added} documents to {Config.COLLECTION_NAME}"
+        }
+
@@ -4,27 +4,35 @@ Supports ONLY the working Groq model:
 ➡ llama-3.1-8b-instant
 """
 
+import asyncio
 import time
+import weakref
 import streamlit as st
-from typing import List, Dict, Optional
-from groq import Groq
+from typing import Iterator, List, Dict, Optional
+from groq import AsyncGroq, Groq
 from src.config import Config
+from src.context_packer import context_sources, count_tokens_many, pack_context
+from src.llm_health import status_label
+from src.llm_router import RateLimitedError
+from src.resources import get_health_monitor, get_rate_limiter
+from src.session import current_session_id
 
 
 class GroqLLM:
     """Production-grade interface for Groq's Llama 3.1 8B Instant model."""
 
     VALID_MODEL = "llama-3.1-8b-instant"   # Only working model confirmed by TEST_LLM.py
+    MAX_TOKENS = 500
 
     def __init__(self, model: str = None):
         """Initialize Groq LLM"""
 
         if not Config.GROQ_API_KEY:
-            self.connection_status = False
             raise RuntimeError("❌ GROQ_API_KEY is missing in .env")
 
         # Create Groq Client
         self.client = Groq(api_key=Config.GROQ_API_KEY)
+        self._async_clients = weakref.WeakKeyDictionary()
 
         # Determine selected model
         ui_model = st.session_state.get("selected_model")
@@ -37,54 +45,50 @@ class GroqLLM:
             print(f"⚠️ Invalid or unsupported model: {self.model}. Using: {self.VALID_MODEL}")
             self.model = self.VALID_MODEL
 
-        # Connection test
-        self.connection_status = self._verify_connection()
+        # Connection state comes from the background health monitor
+        get_health_monitor().register("groq", self._verify_connection)
+        print(f"🟢 Groq client ready (model: {self.model})")
 
-        if self.connection_status:
-            print(f"🟢 Groq connected (model: {self.model})")
-        else:
-            print(f"🔴 Groq connection failed (model: {self.model})")
+    @property
+    def connection_status(self) -> bool:
+        """Cached health (True until a probe has failed)"""
+        return get_health_monitor().is_available("groq")
 
     def _verify_connection(self) -> bool:
-        """Verify connection with a cheap ping test."""
+        """Health probe: model metadata lookup, no completion tokens spent."""
+        self.client.models.retrieve(self.model)
+        return True
+
+    @staticmethod
+    def _retry_after(error: Exception) -> Optional[float]:
+        """Seconds to back off if the error is an HTTP 429, else None."""
+        if getattr(error, "status_code", None) != 429:
+            return None
+        headers = getattr(getattr(error, "response", None), "headers", None) or {}
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[{"role": "user", "content": "ping"}],
-                max_tokens=3,
-            )
-            # Corrected for new Groq API
-            _ = response.choices[0].message.content
-            return True
-
-        except Exception as e:
-            print(f"Groq connection error: {str(e)[:120]}")
-            return False
+            return float(headers.get("retry-after", 5))
+        except (TypeError, ValueError):
+            return 5.0
 
-    def generate_answer(
+    def get_sources(self, documents: Optional[List[Dict]]) -> List[Dict]:
+        """Source entries for the documents placed in the prompt."""
+        return context_sources(documents)
+
+    def _build_messages(
         self,
         query: str,
         documents: Optional[List[Dict]] = None,
         history: Optional[List[Dict]] = None
-    ) -> Dict:
-        """Generate answer from Groq model."""
+    ) -> List[Dict]:
+        """Chat messages: system prompt, retrieved context, history, query."""
 
         # Build context
         context = ""
-        sources = []
-
-        if documents:
-            for i, doc in enumerate(documents[:3], 1):
-                text = doc.get("text", "")[:600]
-                meta = doc.get("metadata", {})
-                context += f"\n[Document {i}]\n{text}\n"
-                sources.append({
-                    "document": meta.get("source", "Unknown"),
-                    "subject": meta.get("subject", "General"),
-                    "page": meta.get("page", "N/A")
-                })
-
-        # Prepare conversation history
+
+        for i, doc in enumerate(pack_context(documents), 1):
+            context += f"\n[Document {i}]\n{doc['text']}\n"
+
+        # Prepare conversation history (summary + latest turn, see RollingSummary)
         chat_history = []
         if history:
             for h in history[-2:]:
@@ -114,19 +118,80 @@ You are an MCA Study Assistant.
 
         messages.extend(chat_history)
         messages.append({"role": "user", "content": query})
+        return messages
+
+    def _reserve(self, messages: List[Dict], session_id: Optional[str] = None) -> Optional[float]:
+        """
+        Wait in the shared Groq queue for RPM/TPM budget.
+        Returns the tokens reserved (0 when limiting is off), or None if
+        the wait would exceed Config.GROQ_MAX_QUEUE_WAIT.
+        """
+        if not Config.ENABLE_RATE_LIMITING:
+            return 0.0
+        tokens = self._reservation(messages)
+        limiter = get_rate_limiter()
+        if not limiter.acquire(session_id or current_session_id(), tokens, timeout=Config.GROQ_MAX_QUEUE_WAIT):
+            return None
+        return tokens
+
+    async def _areserve(self, messages: List[Dict], session_id: str) -> Optional[float]:
+        """_reserve() that waits on the event loop instead of a worker thread"""
+        if not Config.ENABLE_RATE_LIMITING:
+            return 0.0
+        tokens = self._reservation(messages)
+        if not await get_rate_limiter().aacquire(session_id, tokens, timeout=Config.GROQ_MAX_QUEUE_WAIT):
+            return None
+        return tokens
+
+    def _reservation(self, messages: List[Dict]) -> float:
+        """Tokens to reserve: prompt plus the full completion allowance"""
+        return float(sum(count_tokens_many([m["content"] for m in messages])) + self.MAX_TOKENS)
+
+    @staticmethod
+    def _settle(reserved: Optional[float], used: float):
+        """Return unused reservation to the shared bucket (0 used on failure)"""
+        if reserved:
+            get_rate_limiter().settle(reserved, used)
+
+    def _rate_limited(self, retry_after: float) -> Dict:
+        return {
+            "answer": "⏱️ Rate limit reached. Please wait a moment and try again.",
+            "sources": [],
+            "model": self.model,
+            "status": "rate_limited",
+            "retry_after": retry_after,
+        }
+
+    def generate_answer(
+        self,
+        query: str,
+        documents: Optional[List[Dict]] = None,
+        history: Optional[List[Dict]] = None
+    ) -> Dict:
+        """Generate answer from Groq model."""
+
+        documents = pack_context(documents)
+        messages = self._build_messages(query, documents, history)
+        sources = self.get_sources(documents)
 
         # Retry logic
         for attempt in range(2):
+            reserved = self._reserve(messages)
+            if reserved is None:
+                return self._rate_limited(get_rate_limiter().estimate_wait())
+            used = 0.0
             try:
                 response = self.client.chat.completions.create(
                     model=self.model,
                     messages=messages,
-                    max_tokens=500,
+                    max_tokens=self.MAX_TOKENS,
                     temperature=0.3,
                 )
 
                 # FINAL FIX: Correct attribute access for Groq SDK ≥ v0.36.0
                 answer = response.choices[0].message.content
+                usage = getattr(response, "usage", None)
+                used = usage.total_tokens if usage is not None else reserved
 
                 return {
                     "answer": answer,
@@ -136,8 +201,16 @@ You are an MCA Study Assistant.
                 }
 
             except Exception as e:
+                # 429: pause the shared queue and hand back so the router can fail over
+                retry_after = self._retry_after(e)
+                if retry_after is not None:
+                    print(f"⏱️ Groq rate limited (retry after {retry_after:.0f}s)")
+                    get_rate_limiter().penalize(retry_after)
+                    return self._rate_limited(retry_after)
                 print(f"Attempt {attempt+1}: {str(e)}")
                 time.sleep(1)
+            finally:
+                self._settle(reserved, used)
 
         # Final failure
         return {
@@ -147,11 +220,122 @@ You are an MCA Study Assistant.
             "status": "error",
         }
 
+    def _async_client(self) -> AsyncGroq:
+        """AsyncGroq bound to the running event loop (one per loop)."""
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            client = AsyncGroq(api_key=Config.GROQ_API_KEY)
+            self._async_clients[loop] = client
+        return client
+
+    async def agenerate_answer(
+        self,
+        query: str,
+        documents: Optional[List[Dict]] = None,
+        history: Optional[List[Dict]] = None
+    ) -> Dict:
+        """Async generate_answer on AsyncGroq (same prompt, limiter and result dict)."""
+
+        documents = pack_context(documents)
+        messages = self._build_messages(query, documents, history)
+        sources = self.get_sources(documents)
+
+        for attempt in range(2):
+            # Limiter waits block, so queue from a worker thread; fairness per task
+            session_id = f"task-{id(asyncio.current_task())}"
+            reserved = await self._areserve(messages, session_id)
+            if reserved is None:
+                return self._rate_limited(get_rate_limiter().estimate_wait())
+            used = 0.0
+            try:
+                response = await self._async_client().chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    max_tokens=self.MAX_TOKENS,
+                    temperature=0.3,
+                )
+                usage = getattr(response, "usage", None)
+                used = usage.total_tokens if usage is not None else reserved
+                return {
+                    "answer": response.choices[0].message.content,
+                    "sources": sources,
+                    "model": self.model,
+                    "status": "success",
+                }
+            except Exception as e:
+                retry_after = self._retry_after(e)
+                if retry_after is not None:
+                    get_rate_limiter().penalize(retry_after)
+                    return self._rate_limited(retry_after)
+                print(f"Attempt {attempt+1}: {str(e)}")
+                await asyncio.sleep(1)
+            finally:
+                self._settle(reserved, used)
+
+        return {
+            "answer": "⚠️ LLM Error — Try again later.",
+            "sources": [],
+            "model": self.model,
+            "status": "error",
+        }
+
+    def stream_answer(
+        self,
+        query: str,
+        documents: Optional[List[Dict]] = None,
+        history: Optional[List[Dict]] = None
+    ) -> Iterator[str]:
+        """
+        Yield answer text as Groq streams it (same prompt as generate_answer).
+        Errors are raised to the caller; sources come from get_sources().
+        """
+        messages = self._build_messages(query, documents, history)
+        reserved = self._reserve(messages)
+        if reserved is None:
+            raise RateLimitedError("Groq queue is full", get_rate_limiter().estimate_wait())
+        started = False
+        answer = []
+        try:
+            try:
+                stream = self.client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    max_tokens=self.MAX_TOKENS,
+                    temperature=0.3,
+                    stream=True,
+                )
+            except Exception as e:
+                retry_after = self._retry_after(e)
+                if retry_after is not None:
+                    get_rate_limiter().penalize(retry_after)
+                    raise RateLimitedError("Groq rate limit reached", retry_after) from e
+                raise
+            started = True
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    answer.append(delta)
+                    yield delta
+        finally:
+            # Also runs when the stream fails or the caller stops reading.
+            # Streams carry no usage block we rely on; estimate what was used.
+            used = 0.0
+            if started and reserved:
+                used = reserved - self.MAX_TOKENS + count_tokens_many(["".join(answer)])[0]
+            self._settle(reserved, used)
+
     def get_status(self) -> Dict:
-        """LLM connection status for Settings + Status Page."""
+        """LLM connection status for Settings + Status Page (cached, no network call)."""
+        health = get_health_monitor().status("groq")
         return {
-            "connected": self.connection_status,
+            "connected": health["connected"] is not False,
             "model": self.model,
             "provider": "Groq",
-            "status": "🟢 Connected" if self.connection_status else "🔴 Disconnected",
+            "status": status_label(health),
+            "latency_ms": health["latency_ms"],
+            "checked_at": health["checked_at"],
+            "error": health["error"],
         }
@@ -0,0 +1,127 @@
+"""
+LLM Health Monitor Module
+Background thread that probes LLM providers on a TTL and publishes a cached
+status (connected, last latency, last error). Pages read the cache; nothing
+on the request path talks to a provider just to check it is up.
+"""
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+
+class HealthMonitor:
+    """Periodic, cached provider health checks"""
+
+    def __init__(self, ttl: float = 60.0):
+        """
+        Args:
+            ttl: Seconds a probe result stays fresh before the next probe
+        """
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._probes: Dict[str, Callable[[], bool]] = {}
+        self._status: Dict[str, Dict] = {}
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # ----------------------------------------------------------------
+
+    def register(self, name: str, probe: Callable[[], bool]):
+        """
+        Add (or replace) the probe for a provider and schedule a check
+
+        Args:
+            name: Provider key ("groq", "ollama", "gemini")
+            probe: Cheap call returning True when the provider is usable
+        """
+        with self._lock:
+            self._probes[name] = probe
+            self._status.setdefault(name, {
+                "connected": None,
+                "latency_ms": None,
+                "checked_at": None,
+                "error": None
+            })
+        self._start()
+        self._wake.set()
+
+    def _start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="llm-health", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wake.clear()
+            for name in self._due():
+                self._probe(name)
+            self._wake.wait(timeout=min(self.ttl, 5.0))
+
+    def _due(self):
+        now = time.time()
+        with self._lock:
+            return [
+                name for name, status in self._status.items()
+                if name in self._probes
+                and (status["checked_at"] is None or now - status["checked_at"] >= self.ttl)
+            ]
+
+    def _probe(self, name: str) -> Dict:
+        with self._lock:
+            probe = self._probes.get(name)
+        if probe is None:
+            return self.status(name)
+        start = time.time()
+        error = None
+        try:
+            connected = bool(probe())
+        except Exception as e:
+            connected = False
+            error = str(e)[:200]
+        record = {
+            "connected": connected,
+            "latency_ms": round((time.time() - start) * 1000, 1),
+            "checked_at": time.time(),
+            "error": error
+        }
+        with self._lock:
+            self._status[name] = record
+        if not connected:
+            print(f"🔴 {name} health check failed: {error or 'probe returned False'}")
+        return dict(record)
+
+    # ----------------------------------------------------------------
+
+    def status(self, name: str) -> Dict:
+        """Last published status (connected is None until the first probe finishes)"""
+        with self._lock:
+            record = self._status.get(name)
+            return dict(record) if record else {
+                "connected": None,
+                "latency_ms": None,
+                "checked_at": None,
+                "error": "not monitored"
+            }
+
+    def is_available(self, name: str) -> bool:
+        """False only when the last probe failed"""
+        return self.status(name)["connected"] is not False
+
+    def check_now(self, name: str) -> Dict:
+        """Probe immediately on the caller's thread (status pages, scripts)"""
+        return self._probe(name)
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Status of every registered provider"""
+        with self._lock:
+            return {name: dict(record) for name, record in self._status.items()}
+
+
+def status_label(status: Dict) -> str:
+    """Short UI label for a status record"""
+    if status.get("connected") is None:
+        return "🟡 Checking"
+    if status["connected"]:
+        latency = status.get("latency_ms")
+        return f"🟢 Online ({latency:.0f} ms)" if latency is not None else "🟢 Online"
+    return "🔴 Offline"
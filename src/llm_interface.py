@@ -5,6 +5,9 @@ Handles interaction with Google Gemini API
 
 import google.generativeai as genai
 from src.config import Config
+from src.context_packer import pack_context
+from src.llm_health import status_label
+from src.resources import get_health_monitor
 from typing import List, Dict, Optional
 import time
 import streamlit as st
@@ -20,31 +23,23 @@ class LLMInterface:
                 raise ValueError("GOOGLE_API_KEY not set in .env file")
 
             genai.configure(api_key=Config.GOOGLE_API_KEY)
-            self.model = genai.GenerativeModel(Config.LLM_MODEL)
-            self.connection_status = self._verify_connection()
+            self.model = genai.GenerativeModel(Config.GEMINI_MODEL)
             self.rate_limit_reset_time = 0
-
-            if not self.connection_status:
-                print(f"⚠️ Warning: LLM connection verification failed")
-                # Don't raise error, allow fallback
-                self.connection_status = False
+            get_health_monitor().register("gemini", self._verify_connection)
 
         except Exception as e:
-            self.connection_status = False
             print(f"Error initializing LLM: {str(e)}")
             raise RuntimeError(f"Failed to initialize LLM: {str(e)}")
 
+    @property
+    def connection_status(self) -> bool:
+        """Cached health from the background monitor"""
+        return get_health_monitor().is_available("gemini")
+
     def _verify_connection(self) -> bool:
-        """Verify connection to Gemini API"""
-        try:
-            test_response = self.model.generate_content("Hello")
-            return test_response is not None and test_response.text
-        except Exception as e:
-            if "429" in str(e) or "quota" in str(e).lower():
-                print(f"⚠️ Rate limit hit: {str(e)}")
-                return False
-            print(f"Connection verification failed: {str(e)}")
-            return False
+        """Health probe: model metadata lookup (no generation quota used)"""
+        name = Config.GEMINI_MODEL if Config.GEMINI_MODEL.startswith("models/") else f"models/{Config.GEMINI_MODEL}"
+        return genai.get_model(name) is not None
 
     def _wait_for_rate_limit(self):
         """Wait if rate limited"""
@@ -80,26 +75,22 @@ class LLMInterface:
             context = ""
             sources = []
 
-            if documents:
-                for idx, doc in enumerate(documents[:3]):  # Limit to top 3
-                    if isinstance(doc, dict):
-                        text = doc.get('text', '')[:500]  # Limit text size
-                        metadata = doc.get('metadata', {})
-                        context += f"\n[Document {idx+1}]\n{text}\n"
-                        sources.append({
-                            "document": metadata.get('source', 'Unknown'),
-                            "pages": metadata.get('page', 'N/A'),
-                            "subject": metadata.get('subject', 'General'),
-                            "type": metadata.get('type', 'General')
-                        })
-
-            # Build conversation history (limit to last 2 exchanges)
+            # Token-budgeted context, best-scoring chunks first
+            for idx, doc in enumerate(pack_context(documents)):
+                metadata = doc.get('metadata', {})
+                context += f"\n[Document {idx+1}]\n{doc['text']}\n"
+                sources.append({
+                    "document": metadata.get('source', 'Unknown'),
+                    "pages": metadata.get('page', 'N/A'),
+                    "subject": metadata.get('subject', 'General'),
+                    "type": metadata.get('type', 'General')
+                })
+
+            # Conversation history (already compressed to a bounded size by the caller)
             chat_history = ""
             if history:
                 for h in history[-2:]:
-                    user_q = h.get('user', '')[:200]
-                    asst_a = h.get('assistant', '')[:200]
-                    chat_history += f"\nQ: {user_q}\nA: {asst_a}\n"
+                    chat_history += f"\nQ: {h.get('user', '')}\nA: {h.get('assistant', '')}\n"
 
             # Create optimized prompt
             prompt = f"""Answer this question based on the provided context.
@@ -132,7 +123,7 @@ ANSWER:"""
                 return {
                     "answer": response.text,
                     "sources": sources,
-                    "model": Config.LLM_MODEL,
+                    "model": Config.GEMINI_MODEL,
                     "status": "success"
                 }
 
@@ -145,8 +136,9 @@ ANSWER:"""
                     return {
                         "answer": "⏱️ Rate limit reached. Please wait a moment and try again. You've used the free tier limit for this model.",
                         "sources": [],
-                        "model": Config.LLM_MODEL,
-                        "status": "rate_limited"
+                        "model": Config.GEMINI_MODEL,
+                        "status": "rate_limited",
+                        "retry_after": 30
                     }
 
                 raise e
@@ -155,17 +147,19 @@ ANSWER:"""
             return {
                 "answer": f"Error generating answer: {str(e)}",
                 "sources": [],
-                "model": Config.LLM_MODEL,
+                "model": Config.GEMINI_MODEL,
                 "status": "error"
             }
 
     def get_status(self) -> Dict:
-        """Get LLM connection status"""
-        status_text = "🟢 Connected" if self.connection_status else "⚠️ Limited"
+        """Get LLM connection status (cached, no network call)"""
+        health = get_health_monitor().status("gemini")
+        status_text = status_label(health) if health["connected"] is not False else "⚠️ Limited"
 
         return {
-            "connected": self.connection_status,
-            "model": Config.LLM_MODEL,
+            "connected": health["connected"] is not False,
+            "model": Config.GEMINI_MODEL,
             "api_key_set": bool(Config.GOOGLE_API_KEY),
-            "status": status_text
+            "status": status_text,
+            "latency_ms": health["latency_ms"]
         }
@@ -2,85 +2,185 @@
 Ollama LLM Interface - Free unlimited LLM
 For production: https://ollama.ai
 """
+import asyncio
+import threading
+import weakref
+import httpx
 import requests
-from typing import List, Dict, Optional
+from requests.adapters import HTTPAdapter
+from typing import Iterator, List, Dict, Optional, Tuple
+import hashlib
 import json
+from src.config import Config
+from src.context_packer import context_sources, pack_context
+from src.llm_health import status_label
+from src.query_cache import LRUCache
+from src.resources import get_health_monitor
+from src.session import current_session_id
+
+
+def keep_alive_value(value):
+    """
+    keep_alive as Ollama expects it: unitless numbers ("-1", "0", "300") are
+    sent as integer seconds, since Ollama rejects them as duration strings
+    """
+    if isinstance(value, str) and value.strip().lstrip("-").isdigit():
+        return int(value)
+    return value
 
 class OllamaLLM:
     """Interface for Ollama LLM (Self-hosted or Remote)"""
 
-    def __init__(self, base_url: str = "http://localhost:11434", model: str = "mistral"):
+    def __init__(
+        self,
+        base_url: str = "http://localhost:11434",
+        model: str = "mistral",
+        keep_alive: Optional[str] = None
+    ):
         """
         Initialize Ollama LLM
         
         Args:
             base_url: Ollama server URL
             model: Model name (mistral, llama2, neural-chat, etc.)
+            keep_alive: How long Ollama keeps the model loaded after a
+                request ("30m", "-1" = forever; default Config.OLLAMA_KEEP_ALIVE)
         """
         self.base_url = base_url.rstrip('/')
         self.model = model
-        self.connection_status = self._verify_connection()
+        self.keep_alive = keep_alive_value(keep_alive or Config.OLLAMA_KEEP_ALIVE)
+        
+        # Pooled keep-alive connections shared by every call on this instance
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=Config.OLLAMA_POOL_SIZE)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        
+        self._async_clients = weakref.WeakKeyDictionary()
+        # session -> (turns, documents fingerprint, Ollama context tokens)
+        self._contexts = LRUCache(maxsize=Config.OLLAMA_CONTEXT_SESSIONS, ttl=Config.OLLAMA_CONTEXT_TTL)
+        get_health_monitor().register("ollama", self._verify_connection)
+        threading.Thread(target=self.warm_up, name="ollama-warmup", daemon=True).start()
+
+    @property
+    def connection_status(self) -> bool:
+        """Cached health from the background monitor"""
+        return get_health_monitor().is_available("ollama")
 
     def _verify_connection(self) -> bool:
-        """Verify connection to Ollama"""
+        """Health probe: list local models"""
+        response = self.session.get(f"{self.base_url}/api/tags", timeout=5)
+        return response.status_code == 200
+
+    def warm_up(self) -> bool:
+        """Load the model into memory ahead of the first question"""
         try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=5)
+            response = self.session.post(
+                f"{self.base_url}/api/generate",
+                json={"model": self.model, "keep_alive": self.keep_alive},
+                timeout=120
+            )
             return response.status_code == 200
         except Exception as e:
-            print(f"Ollama connection error: {str(e)}")
+            print(f"⚠️ Ollama warm-up failed: {e}")
             return False
 
+    def _payload(self, prompt: str, stream: bool) -> Dict:
+        """/api/generate request body"""
+        return {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": stream,
+            "keep_alive": self.keep_alive,
+            "options": {"temperature": 0.7}
+        }
+
+    def get_sources(self, documents: Optional[List[Dict]]) -> List[Dict]:
+        """Source entries for the documents placed in the prompt"""
+        return context_sources(documents)
+
+    def _build_prompt(self, query: str, documents: Optional[List[Dict]] = None) -> str:
+        """Prompt with retrieved context"""
+        context = ""
+        for idx, doc in enumerate(pack_context(documents)):
+            context += f"\n[Ref {idx+1}] {doc['text']}"
+
+        return f"""Answer the question based on context.
+Keep it under 200 words.
+
+Context:
+{context if context else 'General knowledge'}
+
+Question: {query}
+
+Answer:"""
+
+    @staticmethod
+    def _fingerprint(documents: Optional[List[Dict]]) -> str:
+        """Identity of the context chunks a prompt was built from"""
+        texts = [doc['text'] for doc in pack_context(documents)]
+        return hashlib.md5("\x1f".join(texts).encode()).hexdigest()
+
+    def _turn_request(
+        self,
+        query: str,
+        documents: Optional[List[Dict]],
+        history: Optional[List[Dict]],
+        session_id: str,
+        stream: bool
+    ) -> Tuple[Dict, str]:
+        """
+        Request body for one turn. A follow-up on unchanged documents sends
+        only the new question plus the context tokens Ollama returned last
+        turn, so the server skips re-prefilling the prompt.
+        """
+        fingerprint = self._fingerprint(documents)
+        # Reuse only if the previous turn in history is the one Ollama answered
+        # (history may be compressed, so match the question rather than a count)
+        last_question = history[-1].get("user") if history else None
+        prior = self._contexts.get(session_id) if last_question else None
+        if prior and prior[0] == last_question and prior[1] == fingerprint:
+            payload = self._payload(f"\n\nFollow-up question: {query}\n\nAnswer:", stream)
+            payload["context"] = prior[2]
+        else:
+            payload = self._payload(self._build_prompt(query, documents), stream)
+        return payload, fingerprint
+
+    def _remember(self, session_id: str, query: str, fingerprint: str, context):
+        """Keep the returned context for the next turn (dropped once over the size cap)"""
+        if context and len(context) <= Config.OLLAMA_CONTEXT_MAX_TOKENS:
+            self._contexts.put(session_id, (query, fingerprint, context))
+        else:
+            self._contexts.pop(session_id)
+
     def generate_answer(
         self,
         query: str,
         documents: Optional[List[Dict]] = None,
-        history: Optional[List[Dict]] = None
+        history: Optional[List[Dict]] = None,
+        session_id: Optional[str] = None
     ) -> Dict:
         """Generate answer using Ollama"""
         try:
             if not self.connection_status:
                 return self._fallback_answer(query, documents)
 
-            # Build context
-            context = ""
-            sources = []
-            
-            if documents:
-                for idx, doc in enumerate(documents[:3]):
-                    if isinstance(doc, dict):
-                        text = doc.get('text', '')[:300]
-                        metadata = doc.get('metadata', {})
-                        context += f"\n[Ref {idx+1}] {text}"
-                        sources.append({
-                            "document": metadata.get('source', 'Unknown'),
-                            "subject": metadata.get('subject', 'General')
-                        })
-
-            # Build prompt
-            prompt = f"""Answer the question based on context.
-Keep it under 200 words.
-
-Context:
-{context if context else 'General knowledge'}
-
-Question: {query}
-
-Answer:"""
+            session_id = session_id or current_session_id()
+            documents = pack_context(documents)
+            payload, fingerprint = self._turn_request(query, documents, history, session_id, stream=False)
+            sources = self.get_sources(documents)
 
             # Call Ollama
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/api/generate",
-                json={
-                    "model": self.model,
-                    "prompt": prompt,
-                    "stream": False,
-                    "temperature": 0.7
-                },
+                json=payload,
                 timeout=60
             )
 
             if response.status_code == 200:
-                answer = response.json().get('response', 'No response')
+                data = response.json()
+                self._remember(session_id, query, fingerprint, data.get('context'))
+                answer = data.get('response', 'No response')
                 return {
                     "answer": answer,
                     "sources": sources,
@@ -93,16 +193,93 @@ Answer:"""
         except Exception as e:
             return self._fallback_answer(query, documents)
 
+    def _async_client(self) -> httpx.AsyncClient:
+        """Pooled async HTTP client for the running event loop"""
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=60,
+                limits=httpx.Limits(max_keepalive_connections=Config.OLLAMA_POOL_SIZE)
+            )
+            self._async_clients[loop] = client
+        return client
+
+    async def agenerate_answer(
+        self,
+        query: str,
+        documents: Optional[List[Dict]] = None,
+        history: Optional[List[Dict]] = None,
+        session_id: Optional[str] = None
+    ) -> Dict:
+        """Async generate_answer over httpx (pass session_id to reuse context across turns)"""
+        try:
+            if not self.connection_status:
+                return self._fallback_answer(query, documents)
+
+            session_id = session_id or f"task-{id(asyncio.current_task())}"
+            documents = pack_context(documents)
+            payload, fingerprint = self._turn_request(query, documents, history, session_id, stream=False)
+            response = await self._async_client().post("/api/generate", json=payload)
+            if response.status_code == 200:
+                data = response.json()
+                self._remember(session_id, query, fingerprint, data.get('context'))
+                return {
+                    "answer": data.get('response', 'No response'),
+                    "sources": self.get_sources(documents),
+                    "model": f"Ollama/{self.model}",
+                    "status": "success"
+                }
+            return self._fallback_answer(query, documents)
+
+        except Exception as e:
+            return self._fallback_answer(query, documents)
+
+    def stream_answer(
+        self,
+        query: str,
+        documents: Optional[List[Dict]] = None,
+        history: Optional[List[Dict]] = None,
+        session_id: Optional[str] = None
+    ) -> Iterator[str]:
+        """
+        Yield answer text from Ollama's streaming endpoint (NDJSON lines)
+        Errors are raised to the caller; sources come from get_sources()
+        """
+        if not self.connection_status:
+            raise ConnectionError(f"Ollama not reachable at {self.base_url}")
+
+        session_id = session_id or current_session_id()
+        documents = pack_context(documents)
+        payload, fingerprint = self._turn_request(query, documents, history, session_id, stream=True)
+        with self.session.post(
+            f"{self.base_url}/api/generate",
+            json=payload,
+            stream=True,
+            timeout=60
+        ) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                data = json.loads(line)
+                if data.get('error'):
+                    raise RuntimeError(data['error'])
+                token = data.get('response', '')
+                if token:
+                    yield token
+                if data.get('done'):
+                    # Final chunk carries the conversation context
+                    self._remember(session_id, query, fingerprint, data.get('context'))
+                    break
+
     def _fallback_answer(self, query: str, documents: Optional[List[Dict]]) -> Dict:
-        """Fallback when Ollama is unavailable"""
-        if documents:
-            text = documents[0].get('text', '')[:400]
-            return {
-                "answer": f"📚 From documents:\n\n{text}...",
-                "sources": [{"document": "Uploaded material"}],
-                "model": "Fallback",
-                "status": "offline"
-            }
+        """
+        Result when Ollama is unavailable. No answer is extracted here: the
+        router fails over and, if nothing answers, extracts one from the
+        documents once (LLMRouter.degraded_answer).
+        """
         return {
             "answer": "⚠️ LLM unavailable. Upload materials to search.",
             "sources": [],
@@ -111,9 +288,12 @@ Answer:"""
         }
 
     def get_status(self) -> Dict:
-        """Get Ollama status"""
+        """Get Ollama status (cached, no network call)"""
+        health = get_health_monitor().status("ollama")
         return {
-            "connected": self.connection_status,
+            "connected": health["connected"] is not False,
             "model": self.model,
-            "status": "🟢 Connected" if self.connection_status else "⚠️ Offline"
-        }
\ No newline at end of file
+            "status": status_label(health) if health["connected"] is not False else "⚠️ Offline",
+            "latency_ms": health["latency_ms"],
+            "checked_at": health["checked_at"]
+        }
@@ -0,0 +1,338 @@
+"""
+LLM Router Module
+Routes each request to the healthiest configured provider (Groq, Ollama,
+Gemini) using per-provider EWMA latency, error rate and rate-limit state,
+and fails over transparently when one of them errors or returns 429.
+"""
+import asyncio
+import threading
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from src.context_packer import context_sources, pack_context
+from src.resources import get_extractive_answerer
+
+
+class RateLimitedError(RuntimeError):
+    """Provider refused the request with HTTP 429"""
+
+    def __init__(self, message: str, retry_after: float = 5.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class _ProviderState:
+    """Routing statistics for one provider"""
+
+    def __init__(self, name: str, llm, rank: int):
+        self.name = name
+        self.llm = llm
+        self.rank = rank
+        self.latency: Optional[float] = None
+        self.error_rate = 0.0
+        self.rate_limited_until = 0.0
+        self.calls = 0
+        self.failures = 0
+
+
+class LLMRouter:
+    """Latency-aware failover across LLM providers with a shared contract"""
+
+    def __init__(self, providers: List[Tuple[str, object]], alpha: float = 0.3, health_monitor=None):
+        """
+        Args:
+            providers: (name, llm) pairs in preference order; names match
+                the health monitor keys ("groq", "ollama", "gemini")
+            alpha: EWMA smoothing factor for latency and error rate
+            health_monitor: Optional HealthMonitor consulted before routing
+        """
+        if not providers:
+            raise RuntimeError("❌ No LLM provider configured")
+        self.alpha = alpha
+        self.health_monitor = health_monitor
+        self._lock = threading.Lock()
+        self._providers = [_ProviderState(name, llm, rank) for rank, (name, llm) in enumerate(providers)]
+
+    # ----------------------------------------------------------------
+
+    def _score(self, state: _ProviderState) -> float:
+        """Expected cost of a call; untried providers keep preference order"""
+        latency = state.latency if state.latency is not None else 1.0 + state.rank
+        return latency * (1.0 + 4.0 * state.error_rate)
+
+    def _ranked(self) -> List[_ProviderState]:
+        """Usable providers first (best score), then rate-limited/unhealthy ones"""
+        now = time.time()
+        with self._lock:
+            providers = list(self._providers)
+
+        def available(state):
+            if state.rate_limited_until > now:
+                return False
+            if self.health_monitor is not None:
+                return self.health_monitor.is_available(state.name)
+            return True
+
+        usable = sorted((p for p in providers if available(p)), key=self._score)
+        blocked = sorted(
+            (p for p in providers if not available(p)),
+            key=lambda p: (p.rate_limited_until, self._score(p))
+        )
+        return usable + blocked
+
+    def _record_success(self, state: _ProviderState, elapsed: float):
+        with self._lock:
+            state.calls += 1
+            state.latency = elapsed if state.latency is None else (
+                self.alpha * elapsed + (1 - self.alpha) * state.latency
+            )
+            state.error_rate = (1 - self.alpha) * state.error_rate
+
+    def _record_failure(self, state: _ProviderState, retry_after: Optional[float] = None):
+        with self._lock:
+            state.calls += 1
+            state.failures += 1
+            state.error_rate = self.alpha + (1 - self.alpha) * state.error_rate
+            if retry_after is not None:
+                state.rate_limited_until = time.time() + retry_after
+
+    # ----------------------------------------------------------------
+
+    def generate_answer(
+        self,
+        query: str,
+        documents: Optional[List[Dict]] = None,
+        history: Optional[List[Dict]] = None,
+        query_embedding=None
+    ) -> Dict:
+        """
+        Same contract as the providers; adds 'provider' to the response
+
+        query_embedding: Cached query vector for the extractive fallback
+        """
+        last_response = None
+        # Packed once for every provider tried (the fallback extracts from all documents)
+        context = pack_context(documents)
+        now = time.time()
+        for state in self._ranked():
+            if state.rate_limited_until > now:
+                continue
+            start = time.time()
+            try:
+                response = state.llm.generate_answer(query, context, history)
+            except Exception as e:
+                print(f"⚠️ {state.name} failed: {e}")
+                self._record_failure(state)
+                continue
+            status = response.get("status")
+            if status == "success":
+                self._record_success(state, time.time() - start)
+                response["provider"] = state.name
+                return response
+            if status == "rate_limited":
+                self._record_failure(state, response.get("retry_after", 30))
+            else:
+                self._record_failure(state)
+            print(f"↪️ {state.name} returned '{status}', trying next provider")
+            last_response = {**response, "provider": state.name}
+
+        return (
+            self.degraded_answer(query, documents, query_embedding)
+            or last_response
+            or self._no_provider_response()
+        )
+
+    def degraded_answer(self, query: str, documents: Optional[List[Dict]], query_embedding=None) -> Optional[Dict]:
+        """
+        Extractive answer from the documents when no provider could answer
+
+        Args:
+            query_embedding: Cached query vector (e.g. VectorStore.embed_query),
+                so only the candidate sentences are embedded
+
+        Returns:
+            Response with status "degraded", or None if the documents have
+            nothing close enough to the question
+        """
+        if not documents:
+            return None
+        try:
+            response = get_extractive_answerer().answer(query, documents, query_embedding)
+        except Exception as e:
+            print(f"⚠️ Extractive fallback failed: {e}")
+            return None
+        if response["status"] != "success":
+            return None
+        wait = self.retry_after()
+        notice = (
+            f"⏱️ AI providers are busy (retry in {wait:.0f}s) — here is what your notes say:"
+            if wait else "⚠️ AI providers are unavailable — here is what your notes say:"
+        )
+        return {
+            **response,
+            "answer": f"{notice}\n\n{response['answer']}",
+            "status": "degraded",
+            "retry_after": wait,
+            "provider": None
+        }
+
+    def _no_provider_response(self) -> Dict:
+        """Result when every provider was skipped or failed without answering"""
+        wait = self.retry_after()
+        if wait:
+            return {
+                "answer": f"⏱️ All AI providers are busy. Please try again in {wait:.0f}s.",
+                "sources": [],
+                "model": "none",
+                "status": "rate_limited",
+                "retry_after": wait,
+                "provider": None
+            }
+        return {
+            "answer": "⚠️ LLM Error — Try again later.",
+            "sources": [],
+            "model": "none",
+            "status": "error",
+            "provider": None
+        }
+
+    async def agenerate_answer(
+        self,
+        query: str,
+        documents: Optional[List[Dict]] = None,
+        history: Optional[List[Dict]] = None,
+        query_embedding=None
+    ) -> Dict:
+        """Async generate_answer; providers without an async API run in a thread"""
+        last_response = None
+        context = pack_context(documents)
+        for state in self._ranked():
+            if state.rate_limited_until > time.time():
+                continue
+            start = time.time()
+            try:
+                if hasattr(state.llm, "agenerate_answer"):
+                    response = await state.llm.agenerate_answer(query, context, history)
+                else:
+                    response = await asyncio.to_thread(state.llm.generate_answer, query, context, history)
+            except Exception as e:
+                print(f"⚠️ {state.name} failed: {e}")
+                self._record_failure(state)
+                continue
+            status = response.get("status")
+            if status == "success":
+                self._record_success(state, time.time() - start)
+                response["provider"] = state.name
+                return response
+            self._record_failure(state, response.get("retry_after", 30) if status == "rate_limited" else None)
+            print(f"↪️ {state.name} returned '{status}', trying next provider")
+            last_response = {**response, "provider": state.name}
+        if documents:
+            degraded = await asyncio.to_thread(self.degraded_answer, query, documents, query_embedding)
+            if degraded:
+                return degraded
+        return last_response or self._no_provider_response()
+
+    def stream_answer(
+        self,
+        query: str,
+        documents: Optional[List[Dict]] = None,
+        history: Optional[List[Dict]] = None
+    ) -> Iterator[str]:
+        """
+        Stream from the best provider, failing over until the first token.
+        Once text has been yielded, errors propagate (no mid-answer switch).
+        """
+        last_error: Optional[Exception] = None
+        documents = pack_context(documents)
+        for state in self._ranked():
+            if state.rate_limited_until > time.time():
+                continue
+            start = time.time()
+            if not hasattr(state.llm, "stream_answer"):
+                try:
+                    response = state.llm.generate_answer(query, documents, history)
+                except Exception as e:
+                    response = {"status": "error", "answer": str(e)}
+                if response.get("status") == "success":
+                    self._record_success(state, time.time() - start)
+                    yield response["answer"]
+                    return
+                rate_limited = response.get("status") == "rate_limited"
+                self._record_failure(state, response.get("retry_after", 30) if rate_limited else None)
+                last_error = RuntimeError(response.get("answer", "LLM error"))
+                continue
+
+            tokens = state.llm.stream_answer(query, documents, history)
+            try:
+                first = next(tokens)
+            except StopIteration:
+                self._record_failure(state)
+                last_error = RuntimeError(f"{state.name} returned an empty answer")
+                continue
+            except RateLimitedError as e:
+                print(f"⏱️ {state.name} rate limited, trying next provider")
+                self._record_failure(state, e.retry_after)
+                last_error = e
+                continue
+            except Exception as e:
+                print(f"⚠️ {state.name} stream failed: {e}")
+                self._record_failure(state)
+                last_error = e
+                continue
+
+            yield first
+            try:
+                yield from tokens
+            except Exception:
+                self._record_failure(state)
+                raise
+            self._record_success(state, time.time() - start)
+            return
+
+        if last_error is None and self.retry_after():
+            raise RateLimitedError("All LLM providers are rate limited", self.retry_after())
+        raise last_error or RuntimeError("No LLM provider available")
+
+    def retry_after(self) -> float:
+        """Seconds until the first rate-limited provider frees up (0 if any is free)"""
+        now = time.time()
+        with self._lock:
+            waits = [p.rate_limited_until - now for p in self._providers]
+        return 0.0 if min(waits) <= 0 else min(waits)
+
+    def get_sources(self, documents: Optional[List[Dict]]) -> List[Dict]:
+        """Source entries for the documents placed in the prompt"""
+        return context_sources(documents)
+
+    # ----------------------------------------------------------------
+
+    @property
+    def model(self) -> str:
+        """Model of the provider the next request would go to"""
+        return getattr(self._ranked()[0].llm, "model", "")
+
+    @property
+    def connection_status(self) -> bool:
+        return any(getattr(p.llm, "connection_status", True) for p in self._providers)
+
+    def get_status(self) -> Dict:
+        """Router status plus per-provider routing statistics"""
+        now = time.time()
+        best = self._ranked()[0]
+        status = best.llm.get_status()
+        with self._lock:
+            status["providers"] = {
+                p.name: {
+                    "model": getattr(p.llm, "model", ""),
+                    "latency_ms": round(p.latency * 1000, 1) if p.latency is not None else None,
+                    "error_rate": round(p.error_rate, 3),
+                    "rate_limited_for": max(0.0, round(p.rate_limited_until - now, 1)),
+                    "calls": p.calls,
+                    "failures": p.failures
+                }
+                for p in self._providers
+            }
+        status["provider"] = best.name
+        status["connected"] = self.connection_status
+        return status
@@ -0,0 +1,24 @@
+"""
+PDF Worker Module
+Page extraction run in worker processes. Kept apart from document_processor
+so spawned workers only import pdfplumber, not the chunking stack.
+"""
+from typing import List, Optional, Tuple
+
+import pdfplumber
+
+
+def extract_page_range(file_path: str, start: int, end: int) -> List[Tuple[int, Optional[str]]]:
+    """
+    Worker: extract pages [start, end) with pdfplumber.
+    Each worker opens the file itself; None marks a page that failed.
+    """
+    results = []
+    with pdfplumber.open(file_path) as pdf:
+        for index in range(start, end):
+            try:
+                text = pdf.pages[index].extract_text()
+            except Exception:
+                text = None
+            results.append((index + 1, text))
+    return results
@@ -0,0 +1,126 @@
+"""
+Qdrant Quantization Module
+Builds quantization configs (scalar int8 or binary) for collections and the
+matching search params (oversampling + rescoring), and migrates existing
+collections when the configured mode changes.
+"""
+from typing import Optional
+
+from qdrant_client.models import (
+    BinaryQuantization,
+    BinaryQuantizationConfig,
+    Disabled,
+    QuantizationSearchParams,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    SearchParams,
+    VectorParamsDiff
+)
+
+from src.config import Config
+
+QUANTIZATION_MODES = ("none", "scalar", "binary")
+
+
+def quantization_config(mode: Optional[str] = None, always_ram: Optional[bool] = None):
+    """
+    Collection quantization config for a mode
+
+    Args:
+        mode: "none", "scalar" or "binary" (default Config.QDRANT_QUANTIZATION)
+        always_ram: Keep the quantized vectors in RAM (the originals are only
+            moved to disk by collections created with originals_on_disk())
+
+    Returns:
+        ScalarQuantization / BinaryQuantization, or None for "none"
+    """
+    mode = (mode or Config.QDRANT_QUANTIZATION).lower()
+    always_ram = Config.QDRANT_QUANTIZATION_ALWAYS_RAM if always_ram is None else always_ram
+    if mode not in QUANTIZATION_MODES:
+        raise ValueError(f"Unknown quantization mode: {mode}")
+    if mode == "scalar":
+        return ScalarQuantization(scalar=ScalarQuantizationConfig(
+            type=ScalarType.INT8,
+            quantile=0.99,
+            always_ram=always_ram
+        ))
+    if mode == "binary":
+        return BinaryQuantization(binary=BinaryQuantizationConfig(always_ram=always_ram))
+    return None
+
+
+def originals_on_disk(mode: Optional[str] = None) -> bool:
+    """
+    Whether a collection's original float32 vectors belong on disk
+
+    With quantization on, searches run on the quantized copy in RAM and only
+    rescoring reads the originals, so keeping those in RAM as well would add
+    to memory instead of saving it.
+    """
+    return (mode or Config.QDRANT_QUANTIZATION).lower() != "none"
+
+
+def search_params(
+    oversampling: Optional[float] = None,
+    rescore: Optional[bool] = None,
+    mode: Optional[str] = None
+) -> Optional[SearchParams]:
+    """
+    Search params for a quantized collection (None when quantization is off)
+
+    Args:
+        oversampling: Candidates fetched per requested result (default Config.QDRANT_OVERSAMPLING)
+        rescore: Re-rank candidates with the original vectors (default Config.QDRANT_RESCORE)
+        mode: Quantization mode of the collection (default Config.QDRANT_QUANTIZATION)
+    """
+    mode = (mode or Config.QDRANT_QUANTIZATION).lower()
+    if mode == "none":
+        return None
+    return SearchParams(quantization=QuantizationSearchParams(
+        ignore=False,
+        rescore=Config.QDRANT_RESCORE if rescore is None else rescore,
+        oversampling=Config.QDRANT_OVERSAMPLING if oversampling is None else oversampling
+    ))
+
+
+def current_mode(client, collection_name: str) -> str:
+    """Quantization mode a collection was created or last updated with"""
+    config = client.get_collection(collection_name).config.quantization_config
+    if config is None:
+        return "none"
+    if getattr(config, "scalar", None) is not None:
+        return "scalar"
+    if getattr(config, "binary", None) is not None:
+        return "binary"
+    return "other"
+
+
+def _vectors_on_disk(client, collection_name: str) -> bool:
+    vectors = client.get_collection(collection_name).config.params.vectors
+    return bool(getattr(vectors, "on_disk", False))
+
+
+def apply_quantization(client, collection_name: str, mode: Optional[str] = None) -> bool:
+    """
+    Migrate an existing collection to the configured quantization mode
+
+    Qdrant builds the quantized vectors in the background; searches keep
+    working on the original vectors meanwhile. The originals are moved to
+    disk when quantization is on and back to RAM when it is turned off.
+
+    Returns:
+        True if the collection was updated
+    """
+    mode = (mode or Config.QDRANT_QUANTIZATION).lower()
+    on_disk = originals_on_disk(mode)
+    if current_mode(client, collection_name) == mode and _vectors_on_disk(client, collection_name) == on_disk:
+        return False
+    config = quantization_config(mode)
+    client.update_collection(
+        collection_name=collection_name,
+        vectors_config={"": VectorParamsDiff(on_disk=on_disk)},
+        quantization_config=config if config is not None else Disabled.DISABLED
+    )
+    print(f"🗜️ Quantization for '{collection_name}' set to {mode}")
+    return True
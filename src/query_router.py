@@ -0,0 +1,162 @@
+"""
+Query Router Module
+Narrows a search to one subject and/or document type when the question
+makes it clear: subjects by similarity to per-subject centroid embeddings
+(subject name + a sample of its stored chunks), document types by keyword
+rules. Unclear questions are left unfiltered. Centroids are rebuilt in a
+background thread after the corpus changes (at most once per
+ROUTER_REFRESH_SECONDS); queries keep using the previous ones meanwhile.
+"""
+import re
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.config import Config
+
+# Phrases that name a document type -> stored 'type' values (upload pages use
+# both singular and plural spellings)
+TYPE_RULES: List[Tuple[re.Pattern, List[str]]] = [
+    (re.compile(r"\b(previous|last|past)\s+years?('s)?\s+(question\s+)?papers?\b|\bpyqs?\b|\bquestion\s+papers?\b|\bexam\s+papers?\b"),
+     ["question_paper", "question_papers"]),
+    (re.compile(r"\bquestion\s+banks?\b"), ["question_bank"]),
+    (re.compile(r"\bassignments?\b"), ["assignments"]),
+    (re.compile(r"\bsyllabus\b|\bcurriculum\b|\bcourse\s+outline\b"), ["syllabus"]),
+    (re.compile(r"\btext\s?books?\b"), ["textbook", "textbooks"]),
+]
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    return vectors / (np.linalg.norm(vectors, axis=-1, keepdims=True) + 1e-12)
+
+
+def match_document_type(query: str) -> Optional[List[str]]:
+    """Stored 'type' values the question explicitly asks for, if any"""
+    text = (query or "").lower()
+    for pattern, types in TYPE_RULES:
+        if pattern.search(text):
+            return types
+    return None
+
+
+class QueryRouter:
+    """Automatic subject/type filters for one VectorStore"""
+
+    def __init__(
+        self,
+        vector_store,
+        min_similarity: Optional[float] = None,
+        min_margin: Optional[float] = None,
+        samples_per_subject: Optional[int] = None
+    ):
+        """
+        Args:
+            vector_store: Store whose chunks define the subject centroids
+            min_similarity: Cosine similarity the best subject must reach
+            min_margin: Lead the best subject needs over the runner-up
+            samples_per_subject: Stored chunk vectors averaged per subject
+        """
+        self.store = vector_store
+        self.min_similarity = Config.ROUTER_MIN_SIMILARITY if min_similarity is None else min_similarity
+        self.min_margin = Config.ROUTER_MIN_MARGIN if min_margin is None else min_margin
+        self.samples_per_subject = samples_per_subject or Config.ROUTER_SAMPLES_PER_SUBJECT
+        self.refresh_seconds = Config.ROUTER_REFRESH_SECONDS
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._building = False
+        self._built_at = float("-inf")
+        self._version = None
+        # (subjects, centroids) swapped as one tuple so readers never see a mix
+        self._centroids: Tuple[List[str], Optional[np.ndarray]] = ([], None)
+
+    def _refresh(self):
+        """Start a background rebuild when the corpus changed since the last build"""
+        with self._lock:
+            if self._building or self._version == self.store.corpus_version:
+                return
+            self._building = True
+        threading.Thread(target=self._rebuild, name="query-router", daemon=True).start()
+
+    def _rebuild(self):
+        try:
+            # Debounce: an upload bumps the corpus version once per batch
+            delay = self._built_at + self.refresh_seconds - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            version = self.store.corpus_version
+            self._centroids = self._build()
+            self._version = version
+            self._ready.set()
+            print(f"🧭 Query router ready ({len(self._centroids[0])} subjects)")
+        except Exception as e:
+            print(f"⚠️ Query router rebuild failed: {e}")
+        finally:
+            self._built_at = time.monotonic()
+            with self._lock:
+                self._building = False
+
+    def _build(self) -> Tuple[List[str], Optional[np.ndarray]]:
+        """Subject centroids from the subject names and sampled stored chunks"""
+        subjects, centroids = [], []
+        names = _normalize(np.asarray(
+            self.store.embed_texts(Config.SUBJECTS), dtype=np.float32
+        ))
+        for subject, name_vector in zip(Config.SUBJECTS, names):
+            samples = self.store.sample_vectors({"subject": subject}, self.samples_per_subject)
+            if len(samples) == 0:
+                # Nothing stored for this subject: a filter would only return nothing
+                continue
+            content = _normalize(_normalize(np.asarray(samples, dtype=np.float32)).mean(axis=0))
+            subjects.append(subject)
+            centroids.append(_normalize(0.8 * content + 0.2 * name_vector))
+        return subjects, (np.stack(centroids) if centroids else None)
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """Block until the first centroids are built (warm-up, tests)"""
+        self._refresh()
+        return self._ready.wait(timeout)
+
+    def classify_subject(self, query_embedding) -> Tuple[Optional[str], float]:
+        """
+        Best-matching subject and its similarity
+
+        Returns:
+            (subject, similarity); subject is None unless the match clears
+            both the similarity and the margin thresholds (and while the
+            first centroids are still being built)
+        """
+        self._refresh()
+        subjects, centroids = self._centroids
+        if centroids is None:
+            return None, 0.0
+        query = _normalize(np.asarray(query_embedding, dtype=np.float32).reshape(-1))
+        scores = centroids @ query
+        order = np.argsort(-scores)
+        best = float(scores[order[0]])
+        runner_up = float(scores[order[1]]) if len(order) > 1 else -1.0
+        if best >= self.min_similarity and best - runner_up >= self.min_margin:
+            return subjects[order[0]], best
+        return None, best
+
+    def route(self, query: str, query_embedding, filters: Optional[Dict] = None) -> Optional[Dict]:
+        """
+        Filters with an inferred subject/type added
+
+        Fields the caller already set are never overridden.
+
+        Returns:
+            The extended filters, or None when nothing could be inferred
+        """
+        filters = {k: v for k, v in (filters or {}).items() if v and v != "All"}
+        routed = dict(filters)
+        if "type" not in filters:
+            types = match_document_type(query)
+            if types:
+                routed["type"] = types
+        if "subject" not in filters:
+            subject, _ = self.classify_subject(query_embedding)
+            if subject:
+                routed["subject"] = subject
+        return routed if routed != filters else None
@@ -0,0 +1,72 @@
+"""
+Ranking Utilities
+Result fusion and re-ordering helpers shared by the retrieval modes
+"""
+from typing import Dict, Hashable, List, Optional, Sequence
+
+import numpy as np
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[Hashable]], k: int = 60) -> List[tuple]:
+    """
+    Fuse several ranked id lists with reciprocal-rank fusion
+
+    Args:
+        rankings: Ranked lists of ids, best first
+        k: Damping constant (60 is the usual choice)
+
+    Returns:
+        List of (id, fused_score), best first
+    """
+    scores: Dict[Hashable, float] = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (k + rank + 1)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+
+def mmr_select(
+    query_vector,
+    vectors,
+    k: int,
+    lambda_mult: float = 0.5,
+    relevance: Optional[Sequence[float]] = None
+) -> List[int]:
+    """
+    Maximal marginal relevance: greedily pick results that are relevant to
+    the query but not similar to the ones already picked
+
+    Args:
+        query_vector: Query embedding
+        vectors: Candidate embeddings, shape (n, dim)
+        k: Number of results to select
+        lambda_mult: 1.0 = pure relevance, 0.0 = pure diversity
+        relevance: Precomputed relevance per candidate (e.g. rerank scores,
+            min-max scaled here); cosine to the query when omitted
+
+    Returns:
+        Indices of the selected candidates, in selection order
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    n = len(vectors)
+    if n == 0 or k <= 0:
+        return []
+    vectors = vectors / (np.linalg.norm(vectors, axis=1, keepdims=True) + 1e-12)
+    if relevance is None:
+        query = np.asarray(query_vector, dtype=np.float32).reshape(-1)
+        rel = vectors @ (query / (np.linalg.norm(query) + 1e-12))
+    else:
+        rel = np.asarray(relevance, dtype=np.float32)
+        spread = float(rel.max() - rel.min())
+        rel = (rel - rel.min()) / spread if spread > 0 else np.ones(n, dtype=np.float32)
+
+    similarity = vectors @ vectors.T
+    selected = [int(np.argmax(rel))]
+    max_sim = similarity[selected[0]].copy()
+    while len(selected) < min(k, n):
+        scores = lambda_mult * rel - (1 - lambda_mult) * max_sim
+        scores[selected] = -np.inf
+        best = int(np.argmax(scores))
+        selected.append(best)
+        max_sim = np.maximum(max_sim, similarity[best])
+    return selected
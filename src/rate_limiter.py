@@ -0,0 +1,208 @@
+"""
+Rate Limiter Module
+Process-wide token buckets for a provider's requests-per-minute and
+tokens-per-minute quotas, with a round-robin queue per session so one busy
+session cannot starve the rest. Honors retry-after by pausing all grants.
+"""
+import asyncio
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Dict, Optional, Tuple
+
+# How often async waiters re-check the buckets (they cannot wait on the condition)
+ASYNC_POLL_SECONDS = 0.1
+
+
+class _Ticket:
+    __slots__ = ("session_id", "tokens", "granted")
+
+    def __init__(self, session_id: str, tokens: float):
+        self.session_id = session_id
+        self.tokens = tokens
+        self.granted = False
+
+
+class RateLimiter:
+    """RPM + TPM token buckets with per-session fair queuing"""
+
+    def __init__(self, rpm: int, tpm: int):
+        """
+        Args:
+            rpm: Requests per minute allowed by the provider
+            tpm: Tokens per minute allowed by the provider (prompt + completion)
+        """
+        self.rpm = max(1, rpm)
+        self.tpm = max(1, tpm)
+        self._cond = threading.Condition()
+        self._requests = float(self.rpm)
+        self._tokens = float(self.tpm)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._queues: "OrderedDict[str, deque]" = OrderedDict()
+
+    # ----------------------------------------------------------------
+
+    def _refill(self, now: float):
+        elapsed = now - self._updated
+        self._updated = now
+        self._requests = min(self.rpm, self._requests + elapsed * self.rpm / 60.0)
+        self._tokens = min(self.tpm, self._tokens + elapsed * self.tpm / 60.0)
+
+    def _head(self) -> Optional[_Ticket]:
+        """Next ticket in round-robin order: oldest ticket of the next session"""
+        for queue in self._queues.values():
+            if queue:
+                return queue[0]
+        return None
+
+    def _time_until_ready(self, ticket: _Ticket, now: float) -> float:
+        """Seconds until the buckets can cover a ticket"""
+        need_tokens = min(ticket.tokens, self.tpm)
+        return max(
+            self._blocked_until - now,
+            (1.0 - self._requests) * 60.0 / self.rpm,
+            (need_tokens - self._tokens) * 60.0 / self.tpm,
+            0.0
+        )
+
+    def _grant_ready(self, now: float):
+        self._refill(now)
+        while True:
+            ticket = self._head()
+            if ticket is None or self._time_until_ready(ticket, now) > 0:
+                return
+            self._requests -= 1.0
+            self._tokens -= min(ticket.tokens, self.tpm)
+            ticket.granted = True
+            queue = self._queues.pop(ticket.session_id)
+            queue.popleft()
+            if queue:
+                # Session goes to the back of the rotation
+                self._queues[ticket.session_id] = queue
+            self._cond.notify_all()
+
+    def _remove(self, ticket: _Ticket):
+        queue = self._queues.get(ticket.session_id)
+        if queue is not None:
+            try:
+                queue.remove(ticket)
+            except ValueError:
+                pass
+            if not queue:
+                del self._queues[ticket.session_id]
+
+    def _enqueue(self, session_id: str, tokens: float) -> _Ticket:
+        ticket = _Ticket(session_id, tokens)
+        self._queues.setdefault(session_id, deque()).append(ticket)
+        return ticket
+
+    def _poll(self, ticket: _Ticket, deadline: Optional[float]) -> Tuple[Optional[bool], float]:
+        """
+        One pass of a waiter's loop (lock held)
+
+        Returns:
+            (True if granted / False if timed out / None to keep waiting,
+            seconds to wait before the next pass)
+        """
+        now = time.monotonic()
+        self._grant_ready(now)
+        if ticket.granted:
+            return True, 0.0
+        if deadline is not None and now >= deadline:
+            self._remove(ticket)
+            self._cond.notify_all()
+            return False, 0.0
+        head = self._head()
+        wait = self._time_until_ready(head, now) if head else 0.05
+        if deadline is not None:
+            wait = min(wait, deadline - now)
+        return None, max(0.01, wait)
+
+    # ----------------------------------------------------------------
+
+    def acquire(self, session_id: str, tokens: float, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for quota for one request
+
+        Args:
+            session_id: Caller's session (fairness key)
+            tokens: Estimated prompt + completion tokens
+            timeout: Give up after this many seconds (None = wait forever)
+
+        Returns:
+            True when granted, False on timeout
+        """
+        with self._cond:
+            ticket = self._enqueue(session_id, tokens)
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while True:
+                granted, wait = self._poll(ticket, deadline)
+                if granted is not None:
+                    return granted
+                self._cond.wait(timeout=wait)
+
+    async def aacquire(self, session_id: str, tokens: float, timeout: Optional[float] = None) -> bool:
+        """
+        acquire() for asyncio callers: waits with asyncio.sleep, so queued
+        tasks don't each hold an executor thread
+
+        Returns:
+            True when granted, False on timeout
+        """
+        with self._cond:
+            ticket = self._enqueue(session_id, tokens)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            while True:
+                with self._cond:
+                    granted, wait = self._poll(ticket, deadline)
+                if granted is not None:
+                    return granted
+                await asyncio.sleep(min(wait, ASYNC_POLL_SECONDS))
+        except BaseException:
+            # Cancelled while queued: don't leave a ticket blocking the queue
+            with self._cond:
+                if not ticket.granted:
+                    self._remove(ticket)
+                    self._cond.notify_all()
+            raise
+
+    def settle(self, reserved: float, actual: float):
+        """Correct the token bucket once real usage is known"""
+        with self._cond:
+            self._tokens = min(self.tpm, self._tokens + reserved - actual)
+            self._cond.notify_all()
+
+    def penalize(self, retry_after: float):
+        """Provider answered 429: pause all grants for retry_after seconds"""
+        with self._cond:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+            self._requests = min(self._requests, 0.0)
+
+    def estimate_wait(self, tokens: float = 0.0) -> float:
+        """Rough seconds a new request would wait behind the current queue"""
+        with self._cond:
+            now = time.monotonic()
+            self._refill(now)
+            queued = [t for queue in self._queues.values() for t in queue]
+            need_requests = len(queued) + 1
+            need_tokens = sum(min(t.tokens, self.tpm) for t in queued) + min(tokens, self.tpm)
+            return max(
+                self._blocked_until - now,
+                (need_requests - self._requests) * 60.0 / self.rpm,
+                (need_tokens - self._tokens) * 60.0 / self.tpm,
+                0.0
+            )
+
+    def stats(self) -> Dict:
+        with self._cond:
+            now = time.monotonic()
+            self._refill(now)
+            return {
+                "queued": sum(len(q) for q in self._queues.values()),
+                "sessions_waiting": len(self._queues),
+                "requests_available": round(self._requests, 2),
+                "tokens_available": round(self._tokens),
+                "blocked_for": max(0.0, round(self._blocked_until - now, 1))
+            }
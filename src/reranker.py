@@ -0,0 +1,63 @@
+"""
+Reranker Module
+Cross-encoder second stage for search: the over-fetched candidates are
+rescored against the query in one batched forward pass. Pair scores are
+cached by (query hash, chunk id), so repeated questions skip the model.
+"""
+import hashlib
+from typing import Dict, List
+
+from src.query_cache import LRUCache, normalize_query
+
+
+class CrossEncoderReranker:
+    """Batched cross-encoder rescoring with a shared pair-score cache"""
+
+    def __init__(self, model, cache: LRUCache, batch_size: int = 32):
+        """
+        Args:
+            model: sentence_transformers CrossEncoder
+            cache: LRUCache for (query hash, chunk id) -> score
+            batch_size: Pairs per forward pass
+        """
+        self.model = model
+        self.cache = cache
+        self.batch_size = batch_size
+
+    @staticmethod
+    def query_hash(query: str) -> str:
+        return hashlib.md5(normalize_query(query).encode()).hexdigest()
+
+    def score(self, query: str, documents: List[Dict]) -> List[float]:
+        """Relevance of each document to the query (cached pairs are not re-run)"""
+        qhash = self.query_hash(query)
+        scores = [
+            self.cache.get((qhash, doc.get('id'))) if doc.get('id') is not None else None
+            for doc in documents
+        ]
+        missing = [i for i, s in enumerate(scores) if s is None]
+        if missing:
+            pairs = [(query, documents[i]['text']) for i in missing]
+            predicted = self.model.predict(pairs, batch_size=self.batch_size, show_progress_bar=False)
+            for i, value in zip(missing, predicted):
+                scores[i] = float(value)
+                if documents[i].get('id') is not None:
+                    self.cache.put((qhash, documents[i]['id']), scores[i])
+        return scores
+
+    def rerank(self, query: str, documents: List[Dict], top_k: int) -> List[Dict]:
+        """
+        Reorder candidates by cross-encoder score
+
+        Returns:
+            The best top_k documents; 'score' becomes the rerank score and the
+            first-stage score is kept as 'retrieval_score'
+        """
+        if not documents:
+            return []
+        scores = self.score(query, documents)
+        ranked = sorted(zip(scores, range(len(documents))), key=lambda item: item[0], reverse=True)
+        return [
+            {**documents[i], 'retrieval_score': documents[i].get('score'), 'score': s}
+            for s, i in ranked[:top_k]
+        ]
@@ -0,0 +1,239 @@
+"""
+Shared Resources Module
+Process-wide registry for heavy clients (embedding model, Qdrant, LLM).
+Every Streamlit session and page rerun gets the same instances.
+"""
+import threading
+from typing import Any, Callable, Dict, Optional
+from src.config import Config
+
+_registry_lock = threading.Lock()
+_resource_locks: Dict[str, threading.Lock] = {}
+_resources: Dict[str, Any] = {}
+_factories: Dict[str, Callable[[], Any]] = {}
+
+
+def register_factory(name: str, factory: Callable[[], Any]):
+    """Register (or replace) the factory used to build a named resource"""
+    with _registry_lock:
+        _factories[name] = factory
+        _resource_locks.setdefault(name, threading.Lock())
+
+
+def get_resource(name: str) -> Any:
+    """
+    Return the shared instance for a resource, creating it on first use.
+
+    Creation is guarded by a per-resource lock so concurrent sessions
+    never build the same resource twice, while a slow model load does
+    not block access to other resources.
+    """
+    instance = _resources.get(name)
+    if instance is not None:
+        return instance
+    with _registry_lock:
+        if name not in _factories:
+            raise KeyError(f"Unknown resource: {name}")
+        lock = _resource_locks[name]
+        factory = _factories[name]
+    with lock:
+        instance = _resources.get(name)
+        if instance is None:
+            instance = factory()
+            _resources[name] = instance
+        return instance
+
+
+def reload(name: Optional[str] = None) -> None:
+    """
+    Drop a cached resource (or all of them) so the next access rebuilds it.
+
+    Dependants are not rebuilt automatically: reload "vector_store"
+    together with "embedding_model" or "qdrant_client".
+    """
+    with _registry_lock:
+        names = [name] if name else list(_resources.keys())
+        locks = [(n, _resource_locks.get(n)) for n in names]
+    for resource_name, lock in locks:
+        if lock is None:
+            continue
+        with lock:
+            _resources.pop(resource_name, None)
+        print(f"♻️ Resource '{resource_name}' will be reloaded on next use")
+
+
+# ----------------------------
+# Factories
+# ----------------------------
+def _load_embedding_model():
+    from sentence_transformers import SentenceTransformer
+    print(f"Loading embedding model: {Config.EMBEDDING_MODEL}...")
+    model = SentenceTransformer(Config.EMBEDDING_MODEL)
+    print("✓ Embedding model loaded")
+    return model
+
+
+def _connect_qdrant():
+    from qdrant_client import QdrantClient
+    return QdrantClient(
+        url=Config.QDRANT_URL,
+        api_key=Config.QDRANT_API_KEY,
+        timeout=60,
+        prefer_grpc=False
+    )
+
+
+def _build_query_cache():
+    from src.query_cache import LRUCache
+    return LRUCache(maxsize=Config.QUERY_CACHE_SIZE, ttl=Config.QUERY_CACHE_TTL)
+
+
+def _build_answer_cache():
+    from src.answer_cache import SemanticAnswerCache
+    return SemanticAnswerCache(
+        threshold=Config.ANSWER_CACHE_THRESHOLD,
+        maxsize=Config.ANSWER_CACHE_SIZE,
+        ttl=Config.ANSWER_CACHE_TTL
+    )
+
+
+def _build_vector_store():
+    from src.vector_store import VectorStore
+    return VectorStore(backend=Config.VECTOR_BACKEND)
+
+
+def _build_health_monitor():
+    from src.llm_health import HealthMonitor
+    return HealthMonitor(ttl=Config.LLM_HEALTH_TTL)
+
+
+def _build_rate_limiter():
+    from src.rate_limiter import RateLimiter
+    return RateLimiter(rpm=Config.GROQ_RPM, tpm=Config.GROQ_TPM)
+
+
+def _build_single_flight():
+    from src.single_flight import SingleFlight
+    return SingleFlight()
+
+
+def _load_reranker():
+    from sentence_transformers import CrossEncoder
+    from src.query_cache import LRUCache
+    from src.reranker import CrossEncoderReranker
+    print(f"Loading rerank model: {Config.RERANK_MODEL}...")
+    model = CrossEncoder(Config.RERANK_MODEL, max_length=512, device="cpu")
+    print("✓ Rerank model loaded")
+    return CrossEncoderReranker(
+        model,
+        LRUCache(maxsize=Config.RERANK_CACHE_SIZE, ttl=Config.RERANK_CACHE_TTL)
+    )
+
+
+def _build_extractive_answerer():
+    from src.extractive_answerer import ExtractiveAnswerer
+    return ExtractiveAnswerer(get_embedding_model())
+
+
+def _build_llm():
+    from src.llm_groq import GroqLLM
+    return GroqLLM()
+
+
+def _build_llm_router():
+    from src.llm_router import LLMRouter
+    builders = {"groq": get_llm}
+    if Config.OLLAMA_URL:
+        def _ollama():
+            from src.llm_ollama import OllamaLLM
+            return OllamaLLM(base_url=Config.OLLAMA_URL, model=Config.OLLAMA_MODEL)
+        builders["ollama"] = _ollama
+    if Config.GOOGLE_API_KEY:
+        def _gemini():
+            from src.llm_interface import LLMInterface
+            return LLMInterface()
+        builders["gemini"] = _gemini
+    providers = []
+    for name in Config.LLM_PROVIDERS:
+        if name not in builders:
+            continue
+        try:
+            providers.append((name, builders[name]()))
+        except Exception as e:
+            print(f"⚠️ LLM provider '{name}' unavailable: {e}")
+    print(f"✓ LLM router: {', '.join(name for name, _ in providers) or 'no providers'}")
+    return LLMRouter(providers, health_monitor=get_health_monitor())
+
+
+register_factory("embedding_model", _load_embedding_model)
+register_factory("qdrant_client", _connect_qdrant)
+register_factory("query_cache", _build_query_cache)
+register_factory("answer_cache", _build_answer_cache)
+register_factory("vector_store", _build_vector_store)
+register_factory("health_monitor", _build_health_monitor)
+register_factory("rate_limiter", _build_rate_limiter)
+register_factory("single_flight", _build_single_flight)
+register_factory("reranker", _load_reranker)
+register_factory("extractive_answerer", _build_extractive_answerer)
+register_factory("llm", _build_llm)
+register_factory("llm_router", _build_llm_router)
+
+
+def get_embedding_model():
+    """Shared SentenceTransformer instance"""
+    return get_resource("embedding_model")
+
+
+def get_qdrant_client():
+    """Shared QdrantClient instance"""
+    return get_resource("qdrant_client")
+
+
+def get_query_cache():
+    """Shared LRU cache of query embeddings"""
+    return get_resource("query_cache")
+
+
+def get_answer_cache():
+    """Shared semantic answer cache"""
+    return get_resource("answer_cache")
+
+
+def get_vector_store():
+    """Shared VectorStore instance"""
+    return get_resource("vector_store")
+
+
+def get_llm():
+    """Shared GroqLLM instance"""
+    return get_resource("llm")
+
+
+def get_health_monitor():
+    """Shared background LLM health monitor"""
+    return get_resource("health_monitor")
+
+
+def get_llm_router():
+    """Shared LLMRouter over every configured provider"""
+    return get_resource("llm_router")
+
+
+def get_rate_limiter():
+    """Shared Groq RPM/TPM limiter"""
+    return get_resource("rate_limiter")
+
+
+def get_single_flight():
+    """Shared single-flight table for identical chat turns"""
+    return get_resource("single_flight")
+
+
+def get_extractive_answerer():
+    """Shared no-LLM extractive answerer"""
+    return get_resource("extractive_answerer")
+
+
+def get_reranker():
+    """Shared cross-encoder reranker (loaded on first use)"""
+    return get_resource("reranker")
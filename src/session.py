@@ -0,0 +1,18 @@
+"""
+Session Helpers
+Identify the Streamlit browser session behind the current call, for
+per-session state that lives in process-wide services.
+"""
+import threading
+
+
+def current_session_id() -> str:
+    """Streamlit session id of the running script, or the thread name outside Streamlit"""
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        ctx = get_script_run_ctx()
+        if ctx is not None:
+            return ctx.session_id
+    except Exception:
+        pass
+    return threading.current_thread().name
@@ -0,0 +1,237 @@
+"""
+Sharded Collections Module
+Optional Qdrant layout with one collection per subject (or year). Writes go
+to the chunk's shard, searches fan out over the shards a filter can match
+on a thread pool and merge top-k by score, and a single shard can be
+dropped and re-indexed without touching the others.
+"""
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional
+
+from qdrant_client.models import Distance, Filter, PointStruct, VectorParams
+
+SHARD_FIELDS = ("subject", "year")
+
+
+def shard_suffix(value) -> str:
+    """Collection-name-safe form of a shard key value"""
+    return re.sub(r"[^a-z0-9]+", "_", str(value).lower()).strip("_") or "unknown"
+
+
+class ShardedCollections:
+    """Routes Qdrant operations to per-subject or per-year collections"""
+
+    def __init__(
+        self,
+        client,
+        base_name: str,
+        shard_by: str,
+        vector_size: int = 384,
+        workers: int = 8,
+        on_create: Optional[Callable[[str], None]] = None,
+        quantization=None
+    ):
+        """
+        Args:
+            client: QdrantClient
+            base_name: Collection name prefix (Config.COLLECTION_NAME)
+            shard_by: Payload field that picks the shard ("subject" or "year")
+            vector_size: Embedding dimension for new shards
+            workers: Threads used for fan-out searches
+            on_create: Called with the name of each newly created shard
+                (e.g. to add payload indexes)
+            quantization: Quantization config for new shards
+        """
+        if shard_by not in SHARD_FIELDS:
+            raise ValueError(f"Unknown shard field: {shard_by}")
+        self.client = client
+        self.base_name = base_name
+        self.shard_by = shard_by
+        self.vector_size = vector_size
+        self.on_create = on_create
+        self.quantization = quantization
+        self.prefix = f"{base_name}__{shard_by}__"
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="qdrant-shard")
+        self._known = set(self._list_shards())
+
+    # ----------------------------------------------------------------
+
+    def _list_shards(self) -> List[str]:
+        return sorted(
+            c.name for c in self.client.get_collections().collections
+            if c.name.startswith(self.prefix)
+        )
+
+    def shard_name(self, value) -> str:
+        return self.prefix + shard_suffix(value)
+
+    def shards(self) -> List[str]:
+        """Existing shard collections"""
+        with self._lock:
+            return sorted(self._known)
+
+    def shards_for(self, filters: Optional[Dict]) -> List[str]:
+        """Existing shards a search with these filters can hit"""
+        value = (filters or {}).get(self.shard_by)
+        if not value or value == "All":
+            return self.shards()
+        values = value if isinstance(value, (list, tuple, set)) else [value]
+        wanted = {self.shard_name(v) for v in values}
+        return [name for name in self.shards() if name in wanted]
+
+    def _ensure(self, name: str):
+        with self._lock:
+            if name in self._known:
+                return
+            self.client.create_collection(
+                collection_name=name,
+                vectors_config=VectorParams(
+                    size=self.vector_size,
+                    distance=Distance.COSINE,
+                    # Quantized shards search the RAM copy; originals go to disk
+                    on_disk=self.quantization is not None
+                ),
+                quantization_config=self.quantization
+            )
+            self._known.add(name)
+        print(f"✅ Created shard collection: {name}")
+        if self.on_create:
+            self.on_create(name)
+
+    # ----------------------------------------------------------------
+
+    def upsert(self, points: List) -> int:
+        """Write PointStructs, one upsert per shard touched"""
+        by_shard: Dict[str, List] = {}
+        for point in points:
+            name = self.shard_name(point.payload.get(self.shard_by, "unknown"))
+            by_shard.setdefault(name, []).append(point)
+        for name, shard_points in by_shard.items():
+            self._ensure(name)
+            self.client.upsert(collection_name=name, points=shard_points)
+        return len(points)
+
+    def _fan_out(self, names: List[str], call: Callable[[str], List]) -> List:
+        """Run call(shard) concurrently and concatenate the results"""
+        if len(names) == 1:
+            return list(call(names[0]))
+        results = []
+        for shard_results in self._pool.map(call, names):
+            results.extend(shard_results)
+        return results
+
+    def search(
+        self,
+        query_vector: List[float],
+        limit: int,
+        filters: Optional[Dict] = None,
+        query_filter: Optional[Filter] = None,
+        score_threshold: Optional[float] = None,
+        with_vectors: bool = False,
+        search_params=None
+    ) -> List:
+        """Top `limit` ScoredPoints over every shard the filters allow"""
+        def search_shard(name):
+            return self.client.search(
+                collection_name=name,
+                query_vector=query_vector,
+                limit=limit,
+                score_threshold=score_threshold,
+                query_filter=query_filter,
+                search_params=search_params,
+                with_payload=True,
+                with_vectors=with_vectors
+            )
+        hits = self._fan_out(self.shards_for(filters), search_shard)
+        hits.sort(key=lambda hit: hit.score, reverse=True)
+        return hits[:limit]
+
+    def retrieve(self, point_ids: List, with_vectors: bool = False) -> List:
+        """Points by id from whichever shards hold them"""
+        def retrieve_shard(name):
+            return self.client.retrieve(
+                collection_name=name,
+                ids=point_ids,
+                with_payload=True,
+                with_vectors=with_vectors
+            )
+        return self._fan_out(self.shards(), retrieve_shard)
+
+    def sample(self, filters: Optional[Dict], query_filter: Optional[Filter], limit: int) -> List:
+        """Up to `limit` points (with vectors) matching the filters"""
+        points = []
+        for name in self.shards_for(filters):
+            batch, _ = self.client.scroll(
+                collection_name=name,
+                scroll_filter=query_filter,
+                limit=limit - len(points),
+                with_payload=False,
+                with_vectors=True
+            )
+            points.extend(batch)
+            if len(points) >= limit:
+                break
+        return points
+
+    def iter_points(self, page_size: int = 256, with_vectors: bool = False) -> Iterator:
+        """Every stored point, shard by shard"""
+        for name in self.shards():
+            offset = None
+            while True:
+                points, offset = self.client.scroll(
+                    collection_name=name,
+                    limit=page_size,
+                    offset=offset,
+                    with_payload=True,
+                    with_vectors=with_vectors
+                )
+                yield from points
+                if offset is None:
+                    break
+
+    def count(self) -> int:
+        return sum(self.client.get_collection(name).points_count or 0 for name in self.shards())
+
+    def delete(self, filters: Dict, query_filter: Filter):
+        """Delete matching points in the shards the filters can hit"""
+        for name in self.shards_for(filters):
+            self.client.delete(collection_name=name, points_selector=query_filter, wait=True)
+
+    def drop(self, value) -> bool:
+        """Remove one shard (e.g. before re-indexing a subject)"""
+        name = self.shard_name(value)
+        with self._lock:
+            if name not in self._known:
+                return False
+            self._known.discard(name)
+        self.client.delete_collection(name)
+        print(f"🗑️ Dropped shard collection: {name}")
+        return True
+
+    def drop_all(self):
+        for name in self.shards():
+            self.client.delete_collection(name)
+        with self._lock:
+            self._known.clear()
+
+    def import_from(self, collection_name: str, page_size: int = 256) -> int:
+        """Copy an unsharded collection into shards (one-off migration)"""
+        copied, offset = 0, None
+        while True:
+            points, offset = self.client.scroll(
+                collection_name=collection_name,
+                limit=page_size,
+                offset=offset,
+                with_payload=True,
+                with_vectors=True
+            )
+            copied += self.upsert([
+                PointStruct(id=p.id, vector=p.vector, payload=p.payload) for p in points
+            ])
+            if offset is None:
+                break
+        print(f"✓ Copied {copied} points from '{collection_name}' into {len(self.shards())} shards")
+        return copied
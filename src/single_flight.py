@@ -0,0 +1,62 @@
+"""
+Single-Flight Module
+Coalesces identical concurrent work: the first caller for a key runs it,
+later callers with the same key wait for and share that result.
+"""
+import threading
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class _Call:
+    """One in-flight unit of work"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+    def wait(self, timeout: Optional[float] = None) -> Any:
+        """Result of the leader's call, or None on timeout/failure"""
+        if not self.done.wait(timeout):
+            return None
+        return None if self.error is not None else self.result
+
+
+class SingleFlight:
+    """Per-key in-flight call table"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.coalesced = 0
+
+    def begin(self, key: Hashable) -> Tuple[bool, _Call]:
+        """
+        Join or start the call for a key
+
+        Returns:
+            (is_leader, call); the leader must call finish() exactly once
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.coalesced += 1
+                return False, call
+            call = _Call()
+            self._calls[key] = call
+            return True, call
+
+    def finish(self, key: Hashable, call: _Call, result: Any = None, error: Optional[BaseException] = None):
+        """Publish the leader's result (or error) and release the key"""
+        with self._lock:
+            if self._calls.get(key) is call:
+                del self._calls[key]
+        call.result = result
+        call.error = error
+        call.done.set()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {"in_flight": len(self._calls), "coalesced": self.coalesced}
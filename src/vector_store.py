@@ -1,8 +1,8 @@
 """
 Vector Store Module - Qdrant Cloud Edition
 Supports 300+ concurrent students with proper document tracking
+Backends: Qdrant Cloud, ChromaDB (fallback) or an embedded NumPy flat index
 """
-from qdrant_client import QdrantClient
 from qdrant_client.models import (
     Distance,
     VectorParams, 
@@ -10,32 +10,74 @@ from qdrant_client.models import (
     Filter, 
     FieldCondition,
     MatchValue,
+    MatchAny,
     PayloadSchemaType
 )
-from sentence_transformers import SentenceTransformer
 from src.config import Config
+from src.resources import get_embedding_model, get_qdrant_client, get_query_cache, get_reranker
+from src.query_cache import normalize_query
+from src.flat_index import FlatIndex
+from src.bm25_index import BM25Index
+from src.document_registry import DocumentRegistry, FileRegistryStore, QdrantRegistryStore
+from src.ranking import mmr_select, reciprocal_rank_fusion
+from src.query_router import QueryRouter
+from src.sharded_collections import ShardedCollections
+from src.qdrant_quantization import apply_quantization, originals_on_disk, quantization_config, search_params
+from src.context_packer import count_tokens_many
 from typing import List, Dict, Optional
 from qdrant_client.http.models import Filter, FieldCondition, MatchValue
 import hashlib
+import os
+
+import numpy as np
+
+try:
+    import chromadb
+except ImportError:  # optional fallback backend
+    chromadb = None
+
+BACKENDS = ("qdrant", "chroma", "numpy")
+
 
 class VectorStore:
     """Vector store with Qdrant Cloud support"""
 
-    def __init__(self, use_qdrant: bool = True):
-        """Initialize vector store"""
-        self.use_qdrant = use_qdrant or Config.USE_QDRANT
+    def __init__(self, use_qdrant: bool = True, backend: Optional[str] = None):
+        """
+        Initialize vector store
         
-        print(f"Loading embedding model: {Config.EMBEDDING_MODEL}...")
-        self.embedding_model = SentenceTransformer(Config.EMBEDDING_MODEL)
-        print("✓ Embedding model loaded")
+        Args:
+            use_qdrant: Use Qdrant Cloud (False falls back to ChromaDB)
+            backend: Explicit backend ("qdrant", "chroma" or "numpy");
+                overrides use_qdrant when given
+        """
+        if backend is None:
+            backend = "qdrant" if (use_qdrant or Config.USE_QDRANT) else "chroma"
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown vector backend: {backend}")
+        self.backend = backend
+        self.use_qdrant = backend == "qdrant"
+        
+        # Shared per process, see src/resources.py
+        self.embedding_model = get_embedding_model()
+        self.query_cache = get_query_cache()
+        # Bumped on every write so answer caches can detect stale entries
+        self.corpus_version = 0
+        # Per-subject/year collections (Qdrant only, Config.SHARD_BY)
+        self.shards: Optional[ShardedCollections] = None
         
-        if self.use_qdrant:
+        if self.backend == "qdrant":
             self._init_qdrant()
+        elif self.backend == "numpy":
+            self._init_flat_index()
         else:
             self._init_chromadb()
+        self._init_indexes()
+        self.router = QueryRouter(self)
 
-    def _create_payload_indexes(self):
+    def _create_payload_indexes(self, collection_name: Optional[str] = None):
         """Create payload indexes for efficient filtering"""
+        collection_name = collection_name or Config.COLLECTION_NAME
         try:
             if self.use_qdrant:
                 indexes_to_create = [
@@ -47,7 +89,7 @@ class VectorStore:
                 for field_name, schema_type in indexes_to_create:
                     try:
                         self.client.create_payload_index(
-                            collection_name=Config.COLLECTION_NAME,
+                            collection_name=collection_name,
                             field_name=field_name,
                             field_schema=schema_type
                         )
@@ -62,12 +104,7 @@ class VectorStore:
     def _init_qdrant(self):
         """Initialize Qdrant Cloud client with payload indexes"""
         try:
-            self.client = QdrantClient(
-                url=Config.QDRANT_URL,
-                api_key=Config.QDRANT_API_KEY,
-                timeout=60,
-                prefer_grpc=False
-            )
+            self.client = get_qdrant_client()
             
             collections = self.client.get_collections()
             collection_exists = any(
@@ -79,21 +116,45 @@ class VectorStore:
                     collection_name=Config.COLLECTION_NAME,
                     vectors_config=VectorParams(
                         size=384,  # MiniLM-L6-v2 embedding size
-                        distance=Distance.COSINE
-                    )
+                        distance=Distance.COSINE,
+                        on_disk=originals_on_disk()
+                    ),
+                    quantization_config=quantization_config()
                 )
                 print(f"✅ Created Qdrant collection: {Config.COLLECTION_NAME}")
             else:
                 print(f"✅ Qdrant collection '{Config.COLLECTION_NAME}' exists")
             
             self._create_payload_indexes()
+            if Config.SHARD_BY:
+                self.shards = ShardedCollections(
+                    self.client,
+                    Config.COLLECTION_NAME,
+                    Config.SHARD_BY,
+                    workers=Config.SHARD_WORKERS,
+                    on_create=self._create_payload_indexes,
+                    quantization=quantization_config()
+                )
+                print(f"✅ Sharded by {Config.SHARD_BY}: {len(self.shards.shards())} shard collections")
+            self._migrate_quantization()
             print("✅ Qdrant Cloud connected successfully")
         except Exception as e:
             print(f"❌ Qdrant connection error: {str(e)}")
             raise RuntimeError(f"Qdrant connection failed: {str(e)}")
 
+    def _migrate_quantization(self):
+        """Bring existing collections in line with Config.QDRANT_QUANTIZATION"""
+        names = self.shards.shards() if self.shards is not None else [Config.COLLECTION_NAME]
+        for name in names:
+            try:
+                apply_quantization(self.client, name)
+            except Exception as e:
+                print(f"⚠️ Quantization update failed for '{name}': {e}")
+
     def _init_chromadb(self):
         """Initialize ChromaDB (fallback)"""
+        if chromadb is None:
+            raise RuntimeError("ChromaDB init failed: chromadb is not installed")
         try:
             self.client = chromadb.PersistentClient(
                 path=Config.CHROMA_PERSIST_DIR
@@ -106,59 +167,114 @@ class VectorStore:
         except Exception as e:
             raise RuntimeError(f"ChromaDB init failed: {str(e)}")
 
-    def get_uploaded_documents(self, limit=1000):
-        """Return a list of all uploaded documents (distinct by source/subject/year/type)."""
-        docs = []
+    def _init_flat_index(self):
+        """Initialize the embedded NumPy flat index"""
         try:
-            if self.use_qdrant:
-                scroll_result = self.client.scroll(
+            self.index = FlatIndex(
+                directory=Config.FLAT_INDEX_DIR,
+                dim=self.embedding_model.get_sentence_embedding_dimension()
+            )
+            print(f"✅ Flat index loaded ({self.index.count()} vectors)")
+        except Exception as e:
+            raise RuntimeError(f"Flat index init failed: {str(e)}")
+
+    def _init_indexes(self):
+        """
+        Load the keyword index and document registry.
+
+        Either one is rebuilt from a single paged scan of the stored chunks
+        when it is missing or out of sync with the vectors.
+        """
+        os.makedirs(Config.BM25_INDEX_DIR, exist_ok=True)
+        self.bm25 = BM25Index(os.path.join(
+            Config.BM25_INDEX_DIR, f"{self.backend}_{Config.COLLECTION_NAME}.pkl"
+        ))
+        if self.backend == "qdrant":
+            registry_store = QdrantRegistryStore(self.client, f"{Config.COLLECTION_NAME}_registry")
+        else:
+            registry_store = FileRegistryStore(os.path.join(
+                Config.REGISTRY_DIR, f"{self.backend}_{Config.COLLECTION_NAME}.json"
+            ))
+        self.registry = DocumentRegistry(registry_store)
+        try:
+            expected = self._count_chunks()
+            rebuild_bm25 = len(self.bm25) != expected
+            rebuild_registry = self.registry.total_chunks() != expected
+            if not (rebuild_bm25 or rebuild_registry):
+                return
+            print(f"🔄 Rebuilding indexes from {expected} stored chunks...")
+            if rebuild_bm25:
+                self.bm25.clear()
+            payloads = []
+            for point_id, payload in self._iter_points():
+                if rebuild_bm25:
+                    self.bm25.add(point_id, payload.get("text", ""), payload)
+                if rebuild_registry:
+                    payloads.append({key: payload.get(key) for key in (
+                        "source", "subject", "year", "type", "page", "total_pages"
+                    )})
+            if rebuild_bm25:
+                self.bm25.save()
+            if rebuild_registry:
+                self.registry.clear()
+                self.registry.register(DocumentRegistry.summarize_chunks(payloads))
+            print(f"✓ Indexes ready ({len(self.bm25)} chunks, {len(self.registry)} documents)")
+        except Exception as e:
+            print(f"⚠️ Index rebuild failed: {e}")
+
+    def _count_chunks(self) -> int:
+        """Number of stored chunks on the active backend"""
+        if self.shards is not None:
+            return self.shards.count()
+        if self.backend == "qdrant":
+            return self.client.get_collection(Config.COLLECTION_NAME).points_count or 0
+        elif self.backend == "numpy":
+            return self.index.count()
+        return self.collection.count()
+
+    def _iter_points(self, page_size: int = 256):
+        """Yield (point_id, payload) for every stored chunk, page by page"""
+        if self.shards is not None:
+            for point in self.shards.iter_points(page_size):
+                yield point.id, point.payload
+        elif self.backend == "qdrant":
+            offset = None
+            while True:
+                points, offset = self.client.scroll(
                     collection_name=Config.COLLECTION_NAME,
-                    limit=limit,
-                    with_payload=True
+                    limit=page_size,
+                    offset=offset,
+                    with_payload=True,
+                    with_vectors=False
                 )
-                unique_keys = set()
-                for point in scroll_result[0]:
-                    payload = point.payload
-                    key = (
-                        payload.get("source", ""),
-                        payload.get("subject", ""),
-                        payload.get("year", ""),
-                        payload.get("type", "")
-                    )
-                    if key not in unique_keys:
-                        unique_keys.add(key)
-                        docs.append({
-                            "source": payload.get("source", ""),
-                            "subject": payload.get("subject", ""),
-                            "year": payload.get("year", ""),
-                            "type": payload.get("type", ""),
-                            "page": payload.get("page", None),
-                            "uploaded": True
-                        })
-                # Sort by subject then year etc.
-                docs = sorted(docs, key=lambda d: (d["subject"], d["year"], d["type"], d["source"]))
-            else:
-                # Chroma fallback (example, not guaranteed)
-                results = self.collection.get(limit=limit)
-                seen = set()
-                for meta in results["metadatas"]:
-                    key = (
-                        meta.get("source", ""),
-                        meta.get("subject", ""),
-                        meta.get("year", ""),
-                        meta.get("type", "")
-                    )
-                    if key not in seen:
-                        seen.add(key)
-                        docs.append({
-                            "source": meta.get("source", ""),
-                            "subject": meta.get("subject", ""),
-                            "year": meta.get("year", ""),
-                            "type": meta.get("type", ""),
-                            "page": meta.get("page", None),
-                            "uploaded": True
-                        })
-            return docs
+                for point in points:
+                    yield point.id, point.payload
+                if offset is None:
+                    break
+        elif self.backend == "numpy":
+            yield from self.index.items()
+        else:
+            offset = 0
+            while True:
+                results = self.collection.get(
+                    limit=page_size,
+                    offset=offset,
+                    include=["documents", "metadatas"]
+                )
+                if not results["ids"]:
+                    break
+                for point_id, doc, meta in zip(results["ids"], results["documents"], results["metadatas"]):
+                    yield point_id, {**meta, "text": doc}
+                offset += len(results["ids"])
+
+    def get_uploaded_documents(self, limit: Optional[int] = None):
+        """Return a list of all uploaded documents (one entry per source/subject/year/type)."""
+        try:
+            docs = [
+                {**record, "uploaded": True}
+                for record in self.registry.list()
+            ]
+            return docs[:limit] if limit else docs
         except Exception as e:
             print(f"Error loading uploaded docs: {e}")
             return []
@@ -167,6 +283,10 @@ class VectorStore:
         """
         Add documents to vector store in batches
         
+        Chunks are sorted by length before batching so each encode call
+        sees similarly sized inputs (less padding), and every batch is
+        embedded with a single encode call and written with one upsert.
+        
         Args:
             chunks: List of dicts with 'content' and 'metadata' keys
             batch_size: Number of documents to process at once
@@ -177,51 +297,25 @@ class VectorStore:
                     "status": "error",
                     "message": "No chunks provided"
                 }
+            valid_chunks = []
+            for chunk in chunks:
+                if 'content' not in chunk or 'metadata' not in chunk:
+                    print(f"⚠️ Skipping invalid chunk: {chunk}")
+                    continue
+                valid_chunks.append(chunk)
+            # Length bucketing: neighbours in a batch have similar token counts
+            valid_chunks.sort(key=lambda c: len(c['content']))
             total_added = 0
-            for i in range(0, len(chunks), batch_size):
-                batch = chunks[i:i + batch_size]
-                points = []
-                for chunk in batch:
-                    if 'content' not in chunk or 'metadata' not in chunk:
-                        print(f"⚠️ Skipping invalid chunk: {chunk}")
-                        continue
-                    embedding = self.embedding_model.encode(chunk['content'])
-                    content_hash = hashlib.md5(
-                        (chunk['content'] + str(chunk['metadata'])).encode()
-                    ).hexdigest()
-                    if self.use_qdrant:
-                        point_id = int(content_hash[:16], 16) % (2**63 - 1)
-                        points.append(
-                            PointStruct(
-                                id=point_id,
-                                vector=embedding.tolist(),
-                                payload={
-                                    "text": chunk['content'],
-                                    "source": chunk['metadata'].get('source', 'Unknown'),
-                                    "type": chunk['metadata'].get('type', 'general'),
-                                    "subject": chunk['metadata'].get('subject', 'General'),
-                                    "year": chunk['metadata'].get('year', 'N/A'),
-                                    "page": chunk['metadata'].get('page', 'N/A'),
-                                    **chunk['metadata']
-                                }
-                            )
-                        )
-                    else:
-                        self.collection.add(
-                            ids=[content_hash],
-                            embeddings=[embedding.tolist()],
-                            documents=[chunk['content']],
-                            metadatas=[chunk['metadata']]
-                        )
-                if self.use_qdrant and points:
-                    self.client.upsert(
-                        collection_name=Config.COLLECTION_NAME,
-                        points=points
-                    )
-                    total_added += len(points)
-                elif not self.use_qdrant:
-                    total_added += len(batch)
-                print(f"✓ Processed batch {i//batch_size + 1}: {len(points)} documents")
+            stored = []
+            try:
+                for i in range(0, len(valid_chunks), batch_size):
+                    batch = valid_chunks[i:i + batch_size]
+                    embeddings = self.embed_texts([chunk['content'] for chunk in batch])
+                    total_added += self.upsert_embedded(batch, embeddings)
+                    stored.extend(batch)
+                    print(f"✓ Processed batch {i//batch_size + 1}: {len(batch)} documents")
+            finally:
+                self.finish_ingest(DocumentRegistry.summarize_chunks(stored))
             return {
                 "status": "success",
                 "documents_added": total_added,
@@ -234,11 +328,206 @@ class VectorStore:
                 "message": f"Failed to add documents: {str(e)}"
             }
 
+    def embed_texts(self, texts: List[str]):
+        """Encode a list of texts in one call using the configured encode batch size"""
+        return self.embedding_model.encode(
+            texts,
+            batch_size=Config.EMBEDDING_BATCH_SIZE,
+            show_progress_bar=False,
+            convert_to_numpy=True
+        )
+
+    def embed_query(self, query: str):
+        """Embed a search query, reusing cached vectors for repeat questions"""
+        key = (Config.EMBEDDING_MODEL, normalize_query(query))
+        embedding = self.query_cache.get(key)
+        if embedding is None:
+            embedding = self.embedding_model.encode(query)
+            embedding.flags.writeable = False  # shared across sessions
+            self.query_cache.put(key, embedding)
+        return embedding
+
+    @staticmethod
+    def _build_payload(chunk: Dict, token_count: Optional[int] = None) -> Dict:
+        """
+        Stored payload for a chunk (Qdrant and flat index)
+
+        token_count: Cached for prompt packing (see context_packer); added to
+            the payload only, the caller's chunk is left unchanged
+        """
+        payload = {
+            "text": chunk['content'],
+            "source": chunk['metadata'].get('source', 'Unknown'),
+            "type": chunk['metadata'].get('type', 'general'),
+            "subject": chunk['metadata'].get('subject', 'General'),
+            "year": chunk['metadata'].get('year', 'N/A'),
+            "page": chunk['metadata'].get('page', 'N/A'),
+            **chunk['metadata']
+        }
+        if token_count is not None:
+            payload["token_count"] = token_count
+        return payload
+
+    def _save_bm25(self):
+        """Persist the keyword index if it changed"""
+        try:
+            if self.bm25.dirty:
+                self.bm25.save()
+        except Exception as e:
+            print(f"⚠️ Could not save BM25 index: {e}")
+
+    @staticmethod
+    def _payload_to_document(payload: Dict, score: float, point_id=None, vector=None) -> Dict:
+        """Search result dict from a stored payload ('vector' only when one is given)"""
+        document = {
+            'id': point_id,
+            'text': payload.get('text', ''),
+            'metadata': {
+                'source': payload.get('source', 'Unknown'),
+                'type': payload.get('type', 'general'),
+                'subject': payload.get('subject', 'General'),
+                'year': payload.get('year', 'N/A'),
+                'page': payload.get('page', 'N/A'),
+                'token_count': payload.get('token_count')
+            },
+            'score': score
+        }
+        if vector is not None:
+            document['vector'] = vector
+        return document
+
+    @staticmethod
+    def _qdrant_filter(filters: Optional[Dict]) -> Optional[Filter]:
+        """Qdrant Filter from a {field: value} dict ("All"/empty ignored)"""
+        if not filters:
+            return None
+        conditions = []
+        for key, value in filters.items():
+            if not value or value == "All":
+                continue
+            if isinstance(value, (list, tuple, set)):
+                match = MatchAny(any=list(value))
+            else:
+                match = MatchValue(value=value)
+            conditions.append(FieldCondition(key=key, match=match))
+        return Filter(must=conditions) if conditions else None
+
+    @staticmethod
+    def _chroma_where(filters: Optional[Dict]) -> Optional[Dict]:
+        """Chroma where-clause from a {field: value} dict (lists match any value)"""
+        if not filters:
+            return None
+        conditions = []
+        for key, value in filters.items():
+            if not value or value == "All":
+                continue
+            if isinstance(value, (list, tuple, set)):
+                conditions.append({key: {"$in": list(value)}})
+            else:
+                conditions.append({key: value})
+        if not conditions:
+            return None
+        return conditions[0] if len(conditions) == 1 else {"$and": conditions}
+
+    def sample_vectors(self, filters: Optional[Dict], limit: int):
+        """
+        Up to `limit` stored vectors matching the filters (no particular order)
+
+        Returns:
+            float32 array of shape (n, dim)
+        """
+        if self.shards is not None:
+            points = self.shards.sample(filters, self._qdrant_filter(filters), limit)
+            vectors = [p.vector for p in points if p.vector is not None]
+        elif self.backend == "qdrant":
+            points, _ = self.client.scroll(
+                collection_name=Config.COLLECTION_NAME,
+                scroll_filter=self._qdrant_filter(filters),
+                limit=limit,
+                with_payload=False,
+                with_vectors=True
+            )
+            vectors = [p.vector for p in points if p.vector is not None]
+        elif self.backend == "numpy":
+            vectors = self.index.sample_vectors(filters, limit)
+        else:
+            results = self.collection.get(
+                where=self._chroma_where(filters),
+                limit=limit,
+                include=["embeddings"]
+            )
+            vectors = results.get("embeddings")
+            vectors = [] if vectors is None else vectors
+        return np.asarray(vectors, dtype=np.float32)
+
+    def finish_ingest(self, summary: Dict):
+        """
+        Record an ingestion run: registry entries and BM25 snapshot
+
+        Args:
+            summary: DocumentRegistry.summarize_chunks() of the chunks stored
+        """
+        # Registry reflects exactly the chunks that reached the store
+        self.registry.register(summary)
+        self._save_bm25()
+
+    def upsert_embedded(self, batch: List[Dict], embeddings) -> int:
+        """Write one batch of already-embedded chunks with a single bulk call"""
+        if not batch:
+            return 0
+        ids = []
+        for chunk in batch:
+            ids.append(hashlib.md5(
+                (chunk['content'] + str(chunk['metadata'])).encode()
+            ).hexdigest())
+        # Ids hash the caller's metadata, so token counts go on the stored copy only
+        token_counts = count_tokens_many([chunk['content'] for chunk in batch])
+        payloads = [self._build_payload(chunk, tokens) for chunk, tokens in zip(batch, token_counts)]
+        if self.backend == "qdrant":
+            ids = [int(content_hash[:16], 16) % (2**63 - 1) for content_hash in ids]
+            points = []
+            for point_id, payload, embedding in zip(ids, payloads, embeddings):
+                points.append(
+                    PointStruct(
+                        id=point_id,
+                        vector=embedding.tolist(),
+                        payload=payload
+                    )
+                )
+            if self.shards is not None:
+                self.shards.upsert(points)
+            else:
+                self.client.upsert(
+                    collection_name=Config.COLLECTION_NAME,
+                    points=points
+                )
+        elif self.backend == "numpy":
+            self.index.add(ids, embeddings, payloads)
+        else:
+            self.collection.add(
+                ids=ids,
+                embeddings=[embedding.tolist() for embedding in embeddings],
+                documents=[chunk['content'] for chunk in batch],
+                metadatas=[
+                    {**chunk['metadata'], 'token_count': tokens}
+                    for chunk, tokens in zip(batch, token_counts)
+                ]
+            )
+        self.bm25.add_many(ids, [chunk['content'] for chunk in batch], payloads)
+        self.corpus_version += 1
+        return len(batch)
+
     def search(
         self, 
         query: str, 
         top_k: int = 5, 
-        filters: Optional[Dict] = None
+        filters: Optional[Dict] = None,
+        mode: Optional[str] = None,
+        rerank: Optional[bool] = None,
+        diversify: Optional[bool] = None,
+        route: Optional[bool] = None,
+        oversampling: Optional[float] = None,
+        rescore: Optional[bool] = None
     ) -> List[Dict]:
         """
         Search documents with optional filters
@@ -247,100 +536,335 @@ class VectorStore:
             query: Search query text
             top_k: Number of results to return
             filters: Dict with 'subject', 'year', 'type' filters
+            mode: "dense" or "hybrid" (defaults to Config.SEARCH_MODE)
+            rerank: Rescore over-fetched candidates with the cross-encoder
+                (defaults to Config.ENABLE_RERANK)
+            diversify: MMR selection to drop near-duplicate chunks
+                (defaults to Config.ENABLE_MMR)
+            route: Infer subject/type filters the caller left open
+                (defaults to Config.ENABLE_QUERY_ROUTING)
+            oversampling: Quantized-search candidates per result
+                (defaults to Config.QDRANT_OVERSAMPLING)
+            rescore: Rescore quantized candidates with the float vectors
+                (defaults to Config.QDRANT_RESCORE)
         """
         try:
-            query_embedding = self.embedding_model.encode(query)
-            if self.use_qdrant:
-                search_filter = None
-                if filters:
-                    conditions = []
-                    for key, value in filters.items():
-                        if value and value != "All":
-                            conditions.append(
-                                FieldCondition(
-                                    key=key,
-                                    match=MatchValue(value=value)
-                                )
-                            )
-                    if conditions:
-                        search_filter = Filter(must=conditions)
-                results = self.client.search(
-                    collection_name=Config.COLLECTION_NAME,
-                    query_vector=query_embedding.tolist(),
-                    limit=top_k,
-                    score_threshold=0.3,
-                    query_filter=search_filter,
-                    with_payload=True
-                )
-                documents = []
-                for r in results:
-                    documents.append({
-                        'text': r.payload.get('text', ''),
-                        'metadata': {
-                            'source': r.payload.get('source', 'Unknown'),
-                            'type': r.payload.get('type', 'general'),
-                            'subject': r.payload.get('subject', 'General'),
-                            'year': r.payload.get('year', 'N/A'),
-                            'page': r.payload.get('page', 'N/A')
-                        },
-                        'score': r.score
-                    })
-                return documents
-            else:
-                where_filter = None
-                if filters:
-                    where_filter = {
-                        k: v for k, v in filters.items() 
-                        if v and v != "All"
-                    }
-                results = self.collection.query(
-                    query_embeddings=[query_embedding.tolist()],
-                    n_results=top_k,
-                    where=where_filter
-                )
-                documents = []
-                if results['documents']:
-                    for i, doc in enumerate(results['documents'][0]):
-                        documents.append({
-                            'text': doc,
-                            'metadata': results['metadatas'][0][i] if i < len(results['metadatas'][0]) else {},
-                            'distance': results['distances'][0][i] if i < len(results['distances'][0]) else 0
-                        })
-                return documents
+            plan = self.search_plan(top_k, mode, rerank, diversify, route, oversampling, rescore)
+            handlers = {
+                "embed": self.embed_query,
+                "route": self.route_filters,
+                "first_stage": self._first_stage,
+                "second_stage": self._second_stage
+            }
+            steps = self.search_steps(query, filters, plan)
+            try:
+                step, args = next(steps)
+                while True:
+                    step, args = steps.send(handlers[step](*args))
+            except StopIteration as done:
+                return done.value
         except Exception as e:
             print(f"❌ Search error: {str(e)}")
             return []
-        
-    def delete_document_by_metadata(self, source, subject, year, doc_type):
-        """Delete by metadata (Qdrant Cloud, correct API)"""
+
+    def search_plan(
+        self,
+        top_k: int,
+        mode: Optional[str] = None,
+        rerank: Optional[bool] = None,
+        diversify: Optional[bool] = None,
+        route: Optional[bool] = None,
+        oversampling: Optional[float] = None,
+        rescore: Optional[bool] = None
+    ) -> Dict:
+        """search() options with Config defaults filled in"""
+        rerank = Config.ENABLE_RERANK if rerank is None else rerank
+        diversify = Config.ENABLE_MMR if diversify is None else diversify
+        return {
+            'top_k': top_k,
+            'mode': mode or Config.SEARCH_MODE,
+            'rerank': rerank,
+            'diversify': diversify,
+            'route': Config.ENABLE_QUERY_ROUTING if route is None else route,
+            'n_results': self._n_candidates(top_k, rerank, diversify),
+            'params': search_params(oversampling, rescore) if self.backend == "qdrant" else None
+        }
+
+    @staticmethod
+    def search_steps(query: str, filters: Optional[Dict], plan: Dict):
+        """
+        Search orchestration shared by search() and AsyncVectorStore.search()
+
+        A generator yielding (step, args) for "embed", "route", "first_stage"
+        and "second_stage"; the caller runs the step (blocking or awaited),
+        sends its result back, and gets the final results from StopIteration.
+        """
+        top_k, mode, n_results = plan['top_k'], plan['mode'], plan['n_results']
+        rerank, diversify, params = plan['rerank'], plan['diversify'], plan['params']
+        query_embedding = yield "embed", (query,)
+        results = []
+        routed = (yield "route", (query, query_embedding, filters)) if plan['route'] else None
+        if routed:
+            results = yield "first_stage", (query, query_embedding, n_results, routed, mode, diversify, params)
+            if not results:
+                print(f"🧭 Nothing under {routed}, searching without inferred filters")
+        if not results:
+            results = yield "first_stage", (query, query_embedding, n_results, filters, mode, diversify, params)
+        if rerank or diversify:
+            results = yield "second_stage", (query, query_embedding, results, top_k, mode, rerank, diversify)
+        return results[:top_k]
+
+    def route_filters(self, query: str, query_embedding, filters: Optional[Dict]) -> Optional[Dict]:
+        """Filters extended by the query router, or None to search as given"""
         try:
-            if self.use_qdrant:
-                qdrant_filter = Filter(
-                    must=[
-                        FieldCondition(key="source", match=MatchValue(value=source)),
-                        FieldCondition(key="subject", match=MatchValue(value=subject)),
-                        FieldCondition(key="year", match=MatchValue(value=year)),
-                        FieldCondition(key="type", match=MatchValue(value=doc_type)),
-                    ]
-                )
-                resp = self.client.delete(
-                    collection_name=Config.COLLECTION_NAME,
-                    filter=qdrant_filter,
-                    wait=True
-                )
-                return True  # If no exception, it's fine
-            else:
-                return False
+            return self.router.route(query, query_embedding, filters)
         except Exception as e:
-            print(f"Delete error: {e}")
-            return False
+            print(f"⚠️ Query routing skipped: {e}")
+            return None
 
+    def _first_stage(
+        self,
+        query: str,
+        query_embedding,
+        n_results: int,
+        filters: Optional[Dict],
+        mode: str,
+        with_vectors: bool,
+        params=None
+    ) -> List[Dict]:
+        if mode == "hybrid":
+            return self._hybrid_search(
+                query, query_embedding, n_results, filters, with_vectors=with_vectors, params=params
+            )
+        return self._dense_search(query_embedding, n_results, filters, with_vectors=with_vectors, params=params)
 
+    @staticmethod
+    def _n_candidates(top_k: int, rerank: bool, diversify: bool) -> int:
+        """First-stage result count: over-fetch when a second stage will choose"""
+        n_results = top_k
+        if rerank:
+            n_results = max(n_results, Config.RERANK_CANDIDATES)
+        if diversify:
+            n_results = max(n_results, Config.MMR_CANDIDATES)
+        return n_results
 
+    def _second_stage(
+        self,
+        query: str,
+        query_embedding,
+        results: List[Dict],
+        top_k: int,
+        mode: str,
+        rerank: bool,
+        diversify: bool
+    ) -> List[Dict]:
+        """Optional rerank then MMR over the first-stage candidates"""
+        if rerank:
+            # Keep every candidate for MMR; it picks the final top_k
+            results = self.rerank(query, results, len(results) if diversify else top_k)
+        if diversify:
+            # Rerank and RRF scores carry the ranking; don't fall back to plain cosine
+            results = self.diversify(query_embedding, results, top_k, use_scores=rerank or mode == "hybrid")
+        return results[:top_k]
+
+    @staticmethod
+    def diversify(query_embedding, results: List[Dict], top_k: int, use_scores: bool = False) -> List[Dict]:
+        """
+        Maximal-marginal-relevance selection over candidates carrying 'vector'
+
+        Args:
+            use_scores: Take relevance from 'score' (rerank or RRF scores)
+                instead of cosine similarity to the query
+
+        Returns:
+            Up to top_k results in selection order, without the vectors
+        """
+        if results and all(doc.get('vector') is not None for doc in results):
+            relevance = [doc.get('score') or 0.0 for doc in results] if use_scores else None
+            order = mmr_select(
+                query_embedding,
+                [doc['vector'] for doc in results],
+                top_k,
+                lambda_mult=Config.MMR_LAMBDA,
+                relevance=relevance
+            )
+            results = [results[i] for i in order]
+        return [{k: v for k, v in doc.items() if k != 'vector'} for doc in results[:top_k]]
+
+    def rerank(self, query: str, results: List[Dict], top_k: int) -> List[Dict]:
+        """Cross-encoder rerank; first-stage order is kept if the model is unavailable"""
+        try:
+            return get_reranker().rerank(query, results, top_k)
+        except Exception as e:
+            print(f"⚠️ Rerank skipped: {e}")
+            return results[:top_k]
+
+    def _hybrid_search(
+        self,
+        query: str,
+        query_embedding,
+        top_k: int,
+        filters: Optional[Dict] = None,
+        with_vectors: bool = False,
+        params=None
+    ) -> List[Dict]:
+        """Fuse BM25 and dense rankings with reciprocal-rank fusion"""
+        n_candidates = max(top_k, Config.HYBRID_CANDIDATES)
+        dense = self._dense_search(query_embedding, n_candidates, filters, with_vectors=with_vectors, params=params)
+        keyword = self.bm25.search(query, n_candidates, filters)
+        if not keyword:
+            return dense[:top_k]
+        fused = self._fuse(dense, keyword, top_k)
+        by_id = {doc['id']: doc for doc in dense}
+        missing = [point_id for point_id, _ in fused if point_id not in by_id]
+        if missing:
+            for doc in self._fetch_by_ids(missing, with_vectors=with_vectors):
+                by_id[doc['id']] = doc
+        return self._fused_documents(fused, by_id, keyword)
+
+    @staticmethod
+    def _fuse(dense: List[Dict], keyword: List[tuple], top_k: int) -> List[tuple]:
+        """RRF over the dense and BM25 rankings: [(id, fused_score)]"""
+        return reciprocal_rank_fusion([
+            [doc['id'] for doc in dense],
+            [point_id for point_id, _ in keyword]
+        ])[:top_k]
+
+    @staticmethod
+    def _fused_documents(fused: List[tuple], by_id: Dict, keyword: List[tuple]) -> List[Dict]:
+        """Result dicts in fused order, keeping both component scores"""
+        bm25_scores = dict(keyword)
+        documents = []
+        for point_id, fused_score in fused:
+            doc = by_id.get(point_id)
+            if doc is None:
+                continue
+            documents.append({
+                **doc,
+                'dense_score': doc.get('score'),
+                'bm25_score': bm25_scores.get(point_id),
+                'score': fused_score
+            })
+        return documents
+
+    def _fetch_by_ids(self, point_ids: List, with_vectors: bool = False) -> List[Dict]:
+        """Load stored chunks by point id (score left empty)"""
+        if self.shards is not None:
+            points = self.shards.retrieve(point_ids, with_vectors=with_vectors)
+            return [self._payload_to_document(p.payload, None, p.id, p.vector) for p in points]
+        elif self.backend == "qdrant":
+            points = self.client.retrieve(
+                collection_name=Config.COLLECTION_NAME,
+                ids=point_ids,
+                with_payload=True,
+                with_vectors=with_vectors
+            )
+            return [self._payload_to_document(p.payload, None, p.id, p.vector) for p in points]
+        elif self.backend == "numpy":
+            return [
+                self._payload_to_document(p["payload"], None, p["id"], p.get("vector"))
+                for p in self.index.get(point_ids, with_vectors=with_vectors)
+            ]
+        else:
+            include = ["documents", "metadatas"] + (["embeddings"] if with_vectors else [])
+            results = self.collection.get(ids=point_ids, include=include)
+            embeddings = results.get("embeddings") if with_vectors else None
+            documents = []
+            for i, (point_id, doc, meta) in enumerate(zip(results["ids"], results["documents"], results["metadatas"])):
+                document = {'id': point_id, 'text': doc, 'metadata': meta, 'score': None}
+                if embeddings is not None:
+                    document['vector'] = embeddings[i]
+                documents.append(document)
+            return documents
+
+    def _dense_search(
+        self,
+        query_embedding,
+        top_k: int,
+        filters: Optional[Dict] = None,
+        score_threshold: float = 0.3,
+        with_vectors: bool = False,
+        params=None
+    ) -> List[Dict]:
+        """
+        Nearest-neighbour search on the active backend ('vector' added if with_vectors)
+
+        params: Qdrant SearchParams (quantization oversampling/rescore)
+        """
+        if self.shards is not None:
+            results = self.shards.search(
+                query_embedding.tolist(),
+                limit=top_k,
+                filters=filters,
+                query_filter=self._qdrant_filter(filters),
+                score_threshold=score_threshold,
+                with_vectors=with_vectors,
+                search_params=params
+            )
+            return [self._payload_to_document(r.payload, r.score, r.id, r.vector) for r in results]
+        elif self.backend == "qdrant":
+            results = self.client.search(
+                collection_name=Config.COLLECTION_NAME,
+                query_vector=query_embedding.tolist(),
+                limit=top_k,
+                score_threshold=score_threshold,
+                query_filter=self._qdrant_filter(filters),
+                search_params=params,
+                with_payload=True,
+                with_vectors=with_vectors
+            )
+            return [self._payload_to_document(r.payload, r.score, r.id, r.vector) for r in results]
+        elif self.backend == "numpy":
+            results = self.index.search(
+                query_embedding,
+                top_k=top_k,
+                filters=filters,
+                score_threshold=score_threshold,
+                with_vectors=with_vectors
+            )
+            return [
+                self._payload_to_document(r["payload"], r["score"], r["id"], r.get("vector"))
+                for r in results
+            ]
+        else:
+            where_filter = self._chroma_where(filters)
+            include = ["documents", "metadatas", "distances"] + (["embeddings"] if with_vectors else [])
+            results = self.collection.query(
+                query_embeddings=[query_embedding.tolist()],
+                n_results=top_k,
+                where=where_filter,
+                include=include
+            )
+            documents = []
+            if results['documents']:
+                embeddings = results.get('embeddings') if with_vectors else None
+                for i, doc in enumerate(results['documents'][0]):
+                    distance = results['distances'][0][i] if i < len(results['distances'][0]) else 0
+                    document = {
+                        'id': results['ids'][0][i],
+                        'text': doc,
+                        'metadata': results['metadatas'][0][i] if i < len(results['metadatas'][0]) else {},
+                        'distance': distance,
+                        'score': 1 - distance
+                    }
+                    if embeddings is not None:
+                        document['vector'] = embeddings[0][i]
+                    documents.append(document)
+            return documents
+        
     def get_stats(self) -> Dict:
         """Get vector store statistics"""
         try:
-            if self.use_qdrant:
+            if self.shards is not None:
+                count = self.shards.count()
+                return {
+                    "document_count": count,
+                    "chunk_count": count,
+                    "embedding_count": count,
+                    "status": f"✅ Qdrant Cloud ({len(self.shards.shards())} {Config.SHARD_BY} shards)",
+                    "provider": "Qdrant"
+                }
+            elif self.use_qdrant:
                 info = self.client.get_collection(Config.COLLECTION_NAME)
                 return {
                     "document_count": info.points_count,
@@ -349,6 +873,15 @@ class VectorStore:
                     "status": "✅ Qdrant Cloud",
                     "provider": "Qdrant"
                 }
+            elif self.backend == "numpy":
+                count = self.index.count()
+                return {
+                    "document_count": count,
+                    "chunk_count": count,
+                    "embedding_count": count,
+                    "status": "✅ Flat Index",
+                    "provider": "NumPy"
+                }
             else:
                 count = self.collection.count()
                 return {
@@ -370,47 +903,8 @@ class VectorStore:
     def get_document_stats_by_type(self) -> Dict:
         """Get count of documents by type for dashboard"""
         try:
-            if self.use_qdrant:
-                stats = {}
-                doc_types = ["notes", "assignments", "question_papers", "textbooks", "syllabus"]
-                for doc_type in doc_types:
-                    try:
-                        scroll_result = self.client.scroll(
-                            collection_name=Config.COLLECTION_NAME,
-                            scroll_filter=Filter(
-                                must=[FieldCondition(
-                                    key="type",
-                                    match=MatchValue(value=doc_type)
-                                )]
-                            ),
-                            limit=10000,
-                            with_payload=True
-                        )
-                        unique_sources = set()
-                        for point in scroll_result[0]:
-                            source = point.payload.get("source", "")
-                            if source:
-                                unique_sources.add(source)
-                        stats[doc_type] = len(unique_sources)
-                    except Exception as e:
-                        print(f"⚠️ Error getting stats for '{doc_type}': {e}")
-                        stats[doc_type] = 0
-                return stats
-            else:
-                stats = {}
-                doc_types = ["notes", "assignments", "question_papers", "textbooks", "syllabus"]
-                for doc_type in doc_types:
-                    results = self.collection.get(
-                        where={"type": doc_type}
-                    )
-                    unique_sources = set()
-                    if results and 'metadatas' in results:
-                        for metadata in results['metadatas']:
-                            source = metadata.get("source", "")
-                            if source:
-                                unique_sources.add(source)
-                    stats[doc_type] = len(unique_sources)
-                return stats
+            doc_types = ["notes", "assignments", "question_papers", "textbooks", "syllabus"]
+            return self.registry.count_by_type(doc_types)
         except Exception as e:
             print(f"❌ Error getting document stats: {str(e)}")
             return {
@@ -424,19 +918,29 @@ class VectorStore:
     def delete_collection(self) -> Dict:
         """Delete collection (admin only)"""
         try:
-            if self.use_qdrant:
+            if self.shards is not None:
+                self.shards.drop_all()
+            elif self.use_qdrant:
                 self.client.delete_collection(Config.COLLECTION_NAME)
                 self.client.create_collection(
                     collection_name=Config.COLLECTION_NAME,
                     vectors_config=VectorParams(
                         size=384,
-                        distance=Distance.COSINE
-                    )
+                        distance=Distance.COSINE,
+                        on_disk=originals_on_disk()
+                    ),
+                    quantization_config=quantization_config()
                 )
                 self._create_payload_indexes()
+            elif self.backend == "numpy":
+                self.index.clear()
             else:
                 self.client.delete_collection(Config.COLLECTION_NAME)
                 self._init_chromadb()
+            self.bm25.clear()
+            self._save_bm25()
+            self.registry.clear()
+            self.corpus_version += 1
             return {
                 "status": "success",
                 "message": "✅ Collection cleared and recreated"
@@ -449,9 +953,15 @@ class VectorStore:
 
     def delete_document_by_metadata(self, source, subject, year, doc_type):
         """
-        Delete all chunks for a document with matching metadata fields in Qdrant Cloud.
+        Delete all chunks for a document with matching metadata fields.
         Returns True if successful, False otherwise.
         """
+        doc_filter = {
+            "source": source,
+            "subject": subject,
+            "year": year,
+            "type": doc_type
+        }
         try:
             if self.use_qdrant:
                 filt = Filter(
@@ -462,14 +972,46 @@ class VectorStore:
                         FieldCondition(key="type", match=MatchValue(value=doc_type)),
                     ]
                 )
-                resp = self.client.delete(
-                    collection_name=Config.COLLECTION_NAME,
-                    points_selector=filt,
-                    wait=True
-                )
-                return True  # If no exception is thrown, deletion is successful
+                if self.shards is not None:
+                    self.shards.delete(doc_filter, filt)
+                else:
+                    self.client.delete(
+                        collection_name=Config.COLLECTION_NAME,
+                        points_selector=filt,
+                        wait=True
+                    )
+            elif self.backend == "numpy":
+                self.index.delete(doc_filter)
             else:
                 return False
+            # If no exception is thrown, deletion is successful
+            self.bm25.remove_where(doc_filter)
+            self._save_bm25()
+            self.registry.remove(source, subject, year, doc_type)
+            self.corpus_version += 1
+            return True
         except Exception as e:
             print(f"Delete error: {e}")
             return False
+
+    def reindex_shard(self, value) -> Dict:
+        """
+        Drop one subject/year shard so it can be re-uploaded in isolation
+
+        Args:
+            value: Subject (or year) whose shard to clear
+        """
+        if self.shards is None:
+            return {"status": "error", "message": "❌ Sharding is not enabled (Config.SHARD_BY)"}
+        try:
+            self.shards.drop(value)
+            doc_filter = {Config.SHARD_BY: value}
+            self.bm25.remove_where(doc_filter)
+            self._save_bm25()
+            for record in self.registry.list():
+                if record.get(Config.SHARD_BY) == value:
+                    self.registry.remove(record["source"], record["subject"], record["year"], record["type"])
+            self.corpus_version += 1
+            return {"status": "success", "message": f"✅ Cleared shard '{value}', ready to re-upload"}
+        except Exception as e:
+            return {"status": "error", "message": f"❌ Failed to clear shard: {str(e)}"}
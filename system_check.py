@@ -73,7 +73,9 @@ def check_system():
     print("\n🧪 Testing Groq connection with default model...")
     try:
         from src.llm_groq import GroqLLM
+        from src.resources import get_health_monitor
         llm = GroqLLM(model=Config.LLM_MODEL)
+        get_health_monitor().check_now("groq")
         status = llm.get_status()
         
         if status['connected']:
@@ -1,13 +1,11 @@
 """
 Test RAG Integration
 """
-from src.vector_store import VectorStore
-from src.llm_groq import GroqLLM
-from src.config import Config
+from src.resources import get_vector_store, get_llm
 
 # Initialize
-vs = VectorStore(use_qdrant=Config.USE_QDRANT)
-llm = GroqLLM()
+vs = get_vector_store()
+llm = get_llm()
 
 # Test 1: Check if documents are indexed
 print("📊 Checking vector store...")
@@ -0,0 +1,62 @@
+"""Shared pytest setup: import `src` from the repo root without installing it"""
+import hashlib
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import resources  # noqa: E402
+from src.config import Config  # noqa: E402
+
+# Manual end-to-end script (needs a PDF, the embedding model and a vector DB)
+collect_ignore = ["test_rag_pdf.py"]
+
+
+class FakeEmbeddingModel:
+    """Bag-of-words hashing encoder standing in for the sentence transformer"""
+
+    tokenizer = None
+    dim = 64
+
+    def get_sentence_embedding_dimension(self):
+        return self.dim
+
+    def _vector(self, text):
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for word in text.lower().split():
+            vector[int(hashlib.md5(word.encode()).hexdigest(), 16) % self.dim] += 1
+        return vector
+
+    def encode(self, texts, **kwargs):
+        if isinstance(texts, str):
+            return self._vector(texts)
+        return np.stack([self._vector(t) for t in texts]) if texts else np.zeros((0, self.dim), dtype=np.float32)
+
+
+@pytest.fixture
+def numpy_store_factory(tmp_path, monkeypatch):
+    """Build NumPy-backed VectorStores over a temporary directory"""
+    from src.vector_store import VectorStore
+
+    monkeypatch.setitem(resources._resources, "embedding_model", FakeEmbeddingModel())
+    monkeypatch.setattr(Config, "FLAT_INDEX_DIR", str(tmp_path / "flat"))
+    monkeypatch.setattr(Config, "BM25_INDEX_DIR", str(tmp_path / "bm25"))
+    monkeypatch.setattr(Config, "REGISTRY_DIR", str(tmp_path / "registry"))
+    return lambda: VectorStore(backend="numpy")
+
+
+def make_chunks(source, subject, texts, doc_type="notes", year="Year 1"):
+    """One chunk per text, numbered as consecutive pages of `source`"""
+    return [
+        {
+            "content": text,
+            "metadata": {
+                "source": source, "subject": subject, "type": doc_type, "year": year,
+                "page": page, "total_pages": len(texts)
+            }
+        }
+        for page, text in enumerate(texts, start=1)
+    ]
@@ -0,0 +1,56 @@
+import numpy as np
+
+from src.answer_cache import SemanticAnswerCache
+
+ANSWER = {"answer": "3NF removes transitive dependencies", "sources": [], "status": "success"}
+
+
+def unit(*components):
+    vector = np.zeros(4, dtype=np.float32)
+    vector[:len(components)] = components
+    return vector
+
+
+def test_hit_above_threshold_and_miss_below():
+    cache = SemanticAnswerCache(threshold=0.9)
+    cache.store("what is 3nf", unit(1, 0), None, 0, ANSWER)
+    hit = cache.lookup(unit(1, 0.1), None, 0)
+    assert hit["answer"] == ANSWER["answer"]
+    assert hit["cache_similarity"] >= 0.9
+    assert cache.lookup(unit(1, 1), None, 0) is None
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_entries_only_match_the_same_filters():
+    cache = SemanticAnswerCache(threshold=0.9)
+    cache.store("q", unit(1, 0), {"subject": "Core java", "year": "All"}, 0, ANSWER)
+    assert cache.lookup(unit(1, 0), {"subject": "Core java"}, 0) is not None
+    assert cache.lookup(unit(1, 0), {"subject": "Operating Systems"}, 0) is None
+    assert cache.lookup(unit(1, 0), None, 0) is None
+
+
+def test_corpus_version_change_drops_entries():
+    cache = SemanticAnswerCache(threshold=0.9)
+    cache.store("q", unit(1, 0), None, 0, ANSWER)
+    assert cache.lookup(unit(1, 0), None, 1) is None
+    assert cache.stats()["size"] == 0
+    assert cache.lookup(unit(1, 0), None, 0) is None
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = SemanticAnswerCache(threshold=0.99, maxsize=2)
+    cache.store("a", unit(1, 0, 0), None, 0, {**ANSWER, "answer": "a"})
+    cache.store("b", unit(0, 1, 0), None, 0, {**ANSWER, "answer": "b"})
+    # Touch "a" so "b" becomes the oldest
+    assert cache.lookup(unit(1, 0, 0), None, 0)["answer"] == "a"
+    cache.store("c", unit(0, 0, 1), None, 0, {**ANSWER, "answer": "c"})
+    assert cache.stats()["size"] == 2
+    assert cache.lookup(unit(0, 1, 0), None, 0) is None
+    assert cache.lookup(unit(1, 0, 0), None, 0)["answer"] == "a"
+    assert cache.lookup(unit(0, 0, 1), None, 0)["answer"] == "c"
+
+
+def test_failed_responses_are_not_stored():
+    cache = SemanticAnswerCache()
+    cache.store("q", unit(1, 0), None, 0, {**ANSWER, "status": "error"})
+    assert cache.stats()["size"] == 0
@@ -0,0 +1,94 @@
+import pytest
+
+from src.bm25_index import BM25Index, tokenize
+
+
+@pytest.fixture
+def index():
+    idx = BM25Index()
+    idx.add_many(
+        ["os-1", "db-1", "db-2", "java-1"],
+        [
+            "Deadlock needs mutual exclusion, hold and wait, no preemption",
+            "3NF removes transitive dependencies from a relation",
+            "JDBC connects Java programs to a database",
+            "C++ and Java both support polymorphism",
+        ],
+        [
+            {"subject": "OS", "type": "notes"},
+            {"subject": "DBMS", "type": "notes"},
+            {"subject": "DBMS", "type": "question_papers"},
+            {"subject": "Java", "type": "notes"},
+        ],
+    )
+    return idx
+
+
+def test_tokenize_keeps_technical_tokens():
+    assert tokenize("What is 3NF in C++ and C#?") == ["3nf", "c++", "c#"]
+
+
+def test_search_ranks_exact_term_matches(index):
+    assert [doc_id for doc_id, _ in index.search("3NF", 5)] == ["db-1"]
+    hits = [doc_id for doc_id, _ in index.search("java jdbc", 5)]
+    assert hits[0] == "db-2"
+    assert set(hits) == {"db-2", "java-1"}
+
+
+def test_search_applies_filters(index):
+    assert [d for d, _ in index.search("java", 5, {"subject": "Java"})] == ["java-1"]
+    assert [d for d, _ in index.search("java", 5, {"type": ["question_papers"]})] == ["db-2"]
+    assert index.search("java", 5, {"subject": "All"}) != []
+    assert index.search("java", 5, {"subject": "Unknown"}) == []
+
+
+def test_add_replaces_existing_id(index):
+    index.add("db-1", "Normalization and BCNF", {"subject": "DBMS"})
+    assert len(index) == 4
+    assert index.search("3NF", 5) == []
+    assert [d for d, _ in index.search("bcnf", 5)] == ["db-1"]
+
+
+def test_remove_and_remove_where(index):
+    assert index.remove("os-1")
+    assert not index.remove("os-1")
+    assert index.search("deadlock", 5) == []
+    assert index.remove_where({"subject": "DBMS"}) == 2
+    assert len(index) == 1
+    assert [d for d, _ in index.search("java jdbc", 5)] == ["java-1"]
+
+
+def test_compaction_keeps_live_documents():
+    idx = BM25Index()
+    n = 2400
+    idx.add_many(
+        [f"doc-{i}" for i in range(n)],
+        [f"common word{i}" for i in range(n)],
+        [{"subject": "even" if i % 2 == 0 else "odd"} for i in range(n)],
+    )
+    assert idx.remove_where({"subject": "odd"}) == n // 2
+    # Dead slots are dropped once there are 1000+ and they pass a quarter of the index
+    assert len(idx._ids) < n
+    assert len(idx) == n // 2
+    assert idx.search("word3", 5) == []
+    assert [d for d, _ in idx.search("word4", 5)] == ["doc-4"]
+    assert len(idx.search("common", 2000, {"subject": "even"})) == n // 2
+
+
+def test_save_and_load_round_trip(index, tmp_path):
+    index.path = str(tmp_path / "bm25.pkl")
+    index.remove("os-1")
+    index.save()
+    assert not index.dirty
+
+    loaded = BM25Index(index.path)
+    assert len(loaded) == 3
+    assert loaded.search("jdbc", 5) == index.search("jdbc", 5)
+    assert loaded.search("deadlock", 5) == []
+    assert loaded.remove("db-1")
+
+
+def test_load_of_corrupt_file_starts_empty(tmp_path):
+    path = tmp_path / "bm25.pkl"
+    path.write_bytes(b"not a pickle")
+    assert len(BM25Index(str(path))) == 0
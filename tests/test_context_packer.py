@@ -0,0 +1,67 @@
+import pytest
+
+from src import context_packer
+from src.context_packer import PackedContext, context_sources, pack_context
+
+
+@pytest.fixture(autouse=True)
+def char_tokenizer(monkeypatch):
+    """Count ~4 chars per token instead of loading the embedding model"""
+    monkeypatch.setattr(context_packer, "_tokenizer", lambda: None)
+
+
+def doc(text, score, token_count=None):
+    metadata = {"source": f"{score}.pdf"}
+    if token_count is not None:
+        metadata["token_count"] = token_count
+    return {"text": text, "metadata": metadata, "score": score}
+
+
+def test_orders_by_score_within_budget():
+    packed = pack_context([doc("a" * 40, 0.2), doc("b" * 40, 0.9)], budget=100, min_tokens=1)
+    assert [d["score"] for d in packed] == [0.9, 0.2]
+    assert [d["token_count"] for d in packed] == [10, 10]
+
+
+def test_trims_last_document_at_sentence_boundary():
+    long_text = " ".join(f"Sentence {i:02d} is here." for i in range(20))  # 20 chars each
+    packed = pack_context([doc("x" * 40, 0.9), doc(long_text, 0.5)], budget=40, min_tokens=5)
+    assert len(packed) == 2
+    trimmed = packed[1]
+    assert trimmed["text"].startswith("Sentence 00 is here.")
+    assert trimmed["text"].endswith(".")
+    assert trimmed["token_count"] <= 30
+    assert sum(d["token_count"] for d in packed) <= 40
+
+
+def test_drops_documents_that_would_be_too_short():
+    packed = pack_context([doc("x" * 36, 0.9), doc("y" * 400, 0.5)], budget=12, min_tokens=5)
+    assert [d["score"] for d in packed] == [0.9]
+
+
+def test_uses_token_count_from_payload():
+    packed = pack_context([doc("short", 0.9, token_count=50), doc("z" * 8, 0.1)], budget=51, min_tokens=1)
+    assert [d["token_count"] for d in packed] == [50]
+
+
+def test_skips_empty_and_keeps_originals_intact():
+    original = doc("One sentence here. Another sentence follows it.", 0.5)
+    packed = pack_context([{"text": ""}, None, original], budget=6, min_tokens=1)
+    assert [d["text"] for d in packed] == ["One sentence here."]
+    assert original["text"] == "One sentence here. Another sentence follows it."
+    assert "token_count" not in original["metadata"] and "token_count" not in original
+
+
+def test_packed_context_is_passed_through():
+    packed = pack_context([doc("a" * 40, 0.9)])
+    assert isinstance(packed, PackedContext)
+    assert pack_context(packed) is packed
+    assert pack_context(None) == []
+
+
+def test_context_sources_follow_packed_order():
+    docs = [doc("a" * 40, 0.2), {"text": "b" * 40, "metadata": {"source": "b.pdf", "page": 3}, "score": 0.9}]
+    assert context_sources(docs) == [
+        {"document": "b.pdf", "subject": "General", "page": 3},
+        {"document": "0.2.pdf", "subject": "General", "page": "N/A"},
+    ]
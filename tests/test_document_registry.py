@@ -0,0 +1,62 @@
+import os
+
+from conftest import make_chunks
+from src.config import Config
+from src.document_registry import DocumentRegistry, FileRegistryStore, document_key
+
+DBMS = make_chunks("dbms.pdf", "Database Management Systems", [
+    "normalization removes redundancy", "sql joins combine tables", "indexes speed up lookups"
+])
+JAVA = make_chunks("java.pdf", "Core java", ["polymorphism allows overriding"], doc_type="textbooks")
+
+
+def test_register_remove_and_list(tmp_path):
+    path = str(tmp_path / "registry.json")
+    registry = DocumentRegistry(FileRegistryStore(path))
+    registry.register(DocumentRegistry.summarize_chunks(DBMS + JAVA))
+
+    records = registry.list()
+    assert [r["source"] for r in records] == ["java.pdf", "dbms.pdf"]
+    assert records[1]["chunk_count"] == 3 and records[1]["page_count"] == 3
+    assert registry.count_by_type(["notes", "syllabus"]) == {"notes": 1, "syllabus": 0, "textbooks": 1}
+
+    assert registry.remove("java.pdf", "Core java", "Year 1", "textbooks")
+    assert not registry.remove("java.pdf", "Core java", "Year 1", "textbooks")
+    # Write-through: a fresh registry sees the same table
+    reloaded = DocumentRegistry(FileRegistryStore(path))
+    assert [r["source"] for r in reloaded.list()] == ["dbms.pdf"]
+
+
+def test_register_replaces_or_adds_counts(tmp_path):
+    registry = DocumentRegistry(FileRegistryStore(str(tmp_path / "registry.json")))
+    summary = DocumentRegistry.summarize_chunks(DBMS)
+    registry.register(summary)
+    registry.register(summary)
+    assert registry.total_chunks() == 3
+    registry.register(summary, replace=False)
+    assert registry.total_chunks() == 6
+
+
+def test_counts_stay_correct_after_delete(numpy_store_factory):
+    store = numpy_store_factory()
+    store.add_documents(DBMS + JAVA)
+    assert store.registry.total_chunks() == store.index.count() == 4
+
+    assert store.delete_document_by_metadata("dbms.pdf", "Database Management Systems", "Year 1", "notes")
+    assert store.registry.total_chunks() == store.index.count() == 1
+    assert [d["source"] for d in store.get_uploaded_documents()] == ["java.pdf"]
+
+
+def test_store_rebuilds_registry_that_disagrees_with_collection(numpy_store_factory):
+    store = numpy_store_factory()
+    store.add_documents(DBMS + JAVA)
+    # Registry lost one document (e.g. a crash before its write)
+    store.registry.remove("java.pdf", "Core java", "Year 1", "textbooks")
+    os.remove(os.path.join(Config.BM25_INDEX_DIR, f"numpy_{Config.COLLECTION_NAME}.pkl"))
+
+    reopened = numpy_store_factory()
+    assert reopened.registry.total_chunks() == 4
+    assert len(reopened.bm25) == 4
+    key = document_key("dbms.pdf", "Database Management Systems", "Year 1", "notes")
+    records = {document_key(r["source"], r["subject"], r["year"], r["type"]): r for r in reopened.registry.list()}
+    assert records[key]["chunk_count"] == 3 and records[key]["page_count"] == 3
@@ -0,0 +1,106 @@
+import os
+
+import numpy as np
+import pytest
+
+from src import flat_index
+from src.flat_index import FlatIndex
+
+DIM = 8
+
+
+def unit(i):
+    vector = np.zeros(DIM, dtype=np.float32)
+    vector[i % DIM] = 1.0
+    return vector
+
+
+@pytest.fixture
+def index(tmp_path):
+    idx = FlatIndex(str(tmp_path), dim=DIM)
+    idx.add(
+        ["a", "b", "c"],
+        np.stack([unit(0), unit(1), unit(2)]),
+        [
+            {"subject": "OS", "type": "notes", "source": "os.pdf"},
+            {"subject": "DBMS", "type": "notes", "source": "db.pdf"},
+            {"subject": "DBMS", "type": "syllabus", "source": "db.pdf"},
+        ],
+    )
+    return idx
+
+
+def test_search_returns_exact_cosine_top_k(index):
+    hits = index.search(unit(1) * 3 + unit(2), top_k=2)
+    assert [h["id"] for h in hits] == ["b", "c"]
+    assert hits[0]["score"] == pytest.approx(3 / np.sqrt(10), rel=1e-5)
+    assert "vector" not in hits[0]
+    assert index.search(unit(1), top_k=1, with_vectors=True)[0]["vector"].shape == (DIM,)
+
+
+def test_search_filters_and_threshold(index):
+    assert {h["id"] for h in index.search(unit(0), 3, {"subject": "DBMS"})} == {"b", "c"}
+    assert [h["id"] for h in index.search(unit(0), 3, {"type": ["syllabus"]})] == ["c"]
+    assert [h["id"] for h in index.search(unit(0), 3, score_threshold=0.5)] == ["a"]
+
+
+def test_add_upserts_by_id(index):
+    index.add(["a"], unit(5)[None, :], [{"subject": "Java"}])
+    assert index.count() == 3
+    assert index.get(["a"])[0]["payload"] == {"subject": "Java"}
+    assert index.search(unit(5), 1)[0]["id"] == "a"
+    assert index.search(unit(0), 1, score_threshold=0.5) == []
+
+
+def test_delete_by_filter(index):
+    assert index.delete({"source": "db.pdf"}) == 2
+    assert index.delete({"source": "db.pdf"}) == 0
+    assert index.delete({"subject": "All"}) == 0
+    assert [i for i, _ in index.items()] == ["a"]
+    assert index.get(["b", "a"])[0]["id"] == "a"
+    assert index.payloads({"subject": "DBMS"}) == []
+
+
+def test_state_survives_reload(index, tmp_path):
+    index.add(["b"], unit(6)[None, :], [{"subject": "DBMS", "source": "db2.pdf"}])
+    index.delete({"type": "syllabus"})
+    reloaded = FlatIndex(str(tmp_path), dim=DIM)
+    assert sorted(i for i, _ in reloaded.items()) == ["a", "b"]
+    assert reloaded.get(["b"])[0]["payload"]["source"] == "db2.pdf"
+    assert reloaded.search(unit(6), 1)[0]["id"] == "b"
+
+
+def test_writes_only_append(index, tmp_path):
+    vectors_size = os.path.getsize(index.vectors_path)
+    with open(index.payloads_path, encoding="utf-8") as f:
+        first_line = f.readline()
+    index.add(["d"], unit(3)[None, :], [{"subject": "OS"}])
+    assert os.path.getsize(index.vectors_path) == vectors_size + DIM * 4
+    with open(index.payloads_path, encoding="utf-8") as f:
+        assert f.readline() == first_line
+
+
+def test_compaction_drops_dead_rows(tmp_path, monkeypatch):
+    monkeypatch.setattr(flat_index, "COMPACT_MIN_ROWS", 4)
+    idx = FlatIndex(str(tmp_path), dim=DIM)
+    for _ in range(3):
+        idx.add(["x", "y"], np.stack([unit(0), unit(1)]), [{"n": 1}, {"n": 2}])
+    assert idx.count() == 2
+    assert os.path.getsize(idx.vectors_path) // (DIM * 4) < 6
+    assert FlatIndex(str(tmp_path), dim=DIM).count() == 2
+
+
+def test_torn_append_is_ignored(index, tmp_path):
+    with open(index.vectors_path, "ab") as f:
+        f.write(unit(4).tobytes())
+    reloaded = FlatIndex(str(tmp_path), dim=DIM)
+    assert reloaded.count() == 3
+    reloaded.add(["d"], unit(7)[None, :], [{"subject": "OS"}])
+    assert FlatIndex(str(tmp_path), dim=DIM).search(unit(7), 1)[0]["id"] == "d"
+
+
+def test_clear(index, tmp_path):
+    index.clear()
+    assert index.count() == 0
+    assert index.search(unit(0), 3) == []
+    assert FlatIndex(str(tmp_path), dim=DIM).count() == 0
@@ -0,0 +1,53 @@
+from src.context_packer import count_tokens_many
+from src.history_compressor import SUMMARY_LABEL, RollingSummary, extract_key_sentences
+
+ANSWER = (
+    "Normalization organizes tables to reduce redundancy. "
+    "Second normal form removes partial dependencies on a composite key. "
+    "Third normal form removes transitive dependencies between non-key columns. "
+    "BCNF requires every determinant to be a candidate key. "
+    "Denormalization trades redundancy for faster reads in reporting systems. "
+)
+
+
+def history_tokens(history):
+    return sum(count_tokens_many([turn["assistant"]])[0] for turn in history)
+
+
+def test_history_stays_within_budget_as_turns_grow():
+    summary = RollingSummary(summary_tokens=120, recent_tokens=60, turn_tokens=30)
+    sizes = []
+    for turn in range(40):
+        summary.update(f"question {turn} about normal forms?", ANSWER * 3)
+        history = summary.as_history()
+        assert len(history) <= 2
+        sizes.append(history_tokens(history))
+    assert max(sizes) <= 120 + 60
+    # Old turns fall out of the summary instead of growing it
+    assert "question 0 " not in summary.as_history()[0]["assistant"]
+    assert summary.turns == 40
+
+
+def test_latest_turn_is_kept_verbatim():
+    summary = RollingSummary(summary_tokens=120, recent_tokens=60, turn_tokens=30)
+    summary.update("What is 2NF?", ANSWER * 3)
+    summary.update("What is BCNF?", "BCNF requires every determinant to be a candidate key.")
+    older, latest = summary.as_history()
+    assert older["user"] == SUMMARY_LABEL
+    assert "What is 2NF?" in older["assistant"]
+    assert latest == {"user": "What is BCNF?", "assistant": "BCNF requires every determinant to be a candidate key."}
+
+
+def test_key_sentences_follow_the_focus_and_keep_order():
+    text = extract_key_sentences(ANSWER, budget=30, focus="what does BCNF require")
+    assert "BCNF requires every determinant" in text
+    assert count_tokens_many([text])[0] <= 30
+    assert text.index("Normalization") < text.index("BCNF")
+
+
+def test_clear_forgets_everything():
+    summary = RollingSummary()
+    summary.update("q1", "a1")
+    summary.update("q2", "a2")
+    summary.clear()
+    assert summary.as_history() == [] and summary.turns == 0
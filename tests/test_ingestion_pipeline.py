@@ -0,0 +1,112 @@
+import threading
+
+import numpy as np
+import pytest
+
+from src.ingestion_pipeline import IngestionPipeline
+
+
+class FakeProcessor:
+    """Pages of fixed text, `chunks_per_page` chunks each"""
+
+    def __init__(self, pages=5, chunks_per_page=3, fail_on_page=None):
+        self.pages = pages
+        self.chunks_per_page = chunks_per_page
+        self.fail_on_page = fail_on_page
+
+    def count_pages(self, file_path):
+        return self.pages
+
+    def iter_pages(self, file_path, page_count):
+        for page in range(1, page_count + 1):
+            yield {"page": page, "text": f"page {page}"}
+
+    def chunk_page(self, page_data, metadata):
+        if page_data["page"] == self.fail_on_page:
+            raise ValueError(f"bad page {page_data['page']}")
+        return [
+            {"content": f"{page_data['text']} chunk {i}", "metadata": {**metadata, "page": page_data["page"]}}
+            for i in range(self.chunks_per_page)
+        ]
+
+
+class FakeStore:
+    """Records every batch it is asked to embed and store"""
+
+    def __init__(self, fail_on_batch=None):
+        self.fail_on_batch = fail_on_batch
+        self.batches = []
+        self.summary = None
+
+    def embed_texts(self, texts):
+        return np.zeros((len(texts), 4), dtype=np.float32)
+
+    def upsert_embedded(self, batch, embeddings):
+        if len(self.batches) + 1 == self.fail_on_batch:
+            raise RuntimeError("store down")
+        assert len(embeddings) == len(batch)
+        self.batches.append(list(batch))
+        return len(batch)
+
+    def finish_ingest(self, summary):
+        self.summary = summary
+
+
+@pytest.fixture
+def pdf(tmp_path):
+    path = tmp_path / "notes.pdf"
+    path.write_bytes(b"%PDF")
+    return str(path)
+
+
+def run_with_timeout(pipeline, pdf, timeout=10):
+    """Run the pipeline on a helper thread; fail the test if it hangs"""
+    result = {}
+    worker = threading.Thread(target=lambda: result.update(pipeline.run(pdf, subject="Core java")))
+    worker.start()
+    worker.join(timeout)
+    assert not worker.is_alive(), "pipeline hung"
+    return result
+
+
+def test_batches_split_at_batch_size(pdf):
+    store = FakeStore()
+    pipeline = IngestionPipeline(FakeProcessor(pages=5, chunks_per_page=3), store, batch_size=4, queue_depth=1)
+    result = run_with_timeout(pipeline, pdf)
+    assert result["status"] == "success"
+    assert result["pages"] == 5
+    assert [len(batch) for batch in store.batches] == [4, 4, 4, 3]
+
+
+def test_every_chunk_reaches_upsert(pdf):
+    store = FakeStore()
+    pipeline = IngestionPipeline(FakeProcessor(pages=7, chunks_per_page=2), store, batch_size=5)
+    result = run_with_timeout(pipeline, pdf)
+    stored = sorted(chunk["content"] for batch in store.batches for chunk in batch)
+    expected = sorted(f"page {p} chunk {i}" for p in range(1, 8) for i in range(2))
+    assert stored == expected
+    assert result["documents_added"] == 14
+    (entry,) = store.summary.values()
+    assert entry["chunk_count"] == 14 and entry["total_pages"] == 7
+
+
+def test_chunking_error_stops_pipeline(pdf):
+    store = FakeStore()
+    pipeline = IngestionPipeline(FakeProcessor(pages=50, fail_on_page=3), store, batch_size=2, queue_depth=1)
+    result = run_with_timeout(pipeline, pdf)
+    assert result["status"] == "error"
+    assert "bad page 3" in result["message"]
+    assert result["documents_added"] < 150
+
+
+def test_upsert_error_stops_upstream_stages(pdf):
+    store = FakeStore(fail_on_batch=2)
+    pipeline = IngestionPipeline(FakeProcessor(pages=200), store, batch_size=3, queue_depth=1)
+    result = run_with_timeout(pipeline, pdf)
+    assert result["status"] == "error"
+    assert "store down" in result["message"]
+    assert result["documents_added"] == 3
+    # Chunks stored before the failure are still registered
+    (entry,) = store.summary.values()
+    assert entry["chunk_count"] == 3
+    assert not any(t.name.startswith("ingest-") for t in threading.enumerate())
@@ -0,0 +1,39 @@
+import pytest
+
+from src.llm_ollama import OllamaLLM, keep_alive_value
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("-1", -1),
+    ("0", 0),
+    ("300", 300),
+    (" -1 ", -1),
+    ("30m", "30m"),
+    ("-1m", "-1m"),
+    (600, 600),
+])
+def test_keep_alive_value(value, expected):
+    assert keep_alive_value(value) == expected
+
+
+def make_llm(keep_alive):
+    # Skip __init__: it registers a health probe and warms the model up over HTTP
+    llm = OllamaLLM.__new__(OllamaLLM)
+    llm.model = "mistral"
+    llm.keep_alive = keep_alive_value(keep_alive)
+    return llm
+
+
+def test_payload_sends_unitless_keep_alive_as_number():
+    payload = make_llm("-1")._payload("Question: hi", stream=True)
+    assert payload == {
+        "model": "mistral",
+        "prompt": "Question: hi",
+        "stream": True,
+        "keep_alive": -1,
+        "options": {"temperature": 0.7}
+    }
+
+
+def test_payload_keeps_duration_strings():
+    assert make_llm("30m")._payload("p", stream=False)["keep_alive"] == "30m"
@@ -0,0 +1,158 @@
+import sys
+import types
+
+import pytest
+
+from src import resources
+from src.config import Config
+from src.llm_router import LLMRouter, RateLimitedError
+
+
+class FakeProvider:
+    """Provider returning canned statuses and recording its calls"""
+
+    def __init__(self, status="success", answer="ok", retry_after=None):
+        self.status = status
+        self.answer = answer
+        self.retry_after = retry_after
+        self.calls = 0
+
+    def generate_answer(self, query, documents=None, history=None):
+        self.calls += 1
+        if self.status == "raise":
+            raise RuntimeError("down")
+        response = {"answer": self.answer, "sources": [], "status": self.status}
+        if self.retry_after is not None:
+            response["retry_after"] = self.retry_after
+        return response
+
+
+class StreamingProvider(FakeProvider):
+    def __init__(self, tokens=None, error=None):
+        super().__init__()
+        self.tokens = tokens or []
+        self.error = error
+
+    def stream_answer(self, query, documents=None, history=None):
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        yield from self.tokens
+
+
+class Health:
+    def __init__(self, down=()):
+        self.down = set(down)
+
+    def is_available(self, name):
+        return name not in self.down
+
+
+def test_untried_providers_keep_preference_order():
+    first, second = FakeProvider(answer="groq"), FakeProvider(answer="ollama")
+    router = LLMRouter([("groq", first), ("ollama", second)])
+    response = router.generate_answer("q")
+    assert response["provider"] == "groq"
+    assert second.calls == 0
+
+
+def test_fails_over_on_error_and_exception():
+    broken, erroring, healthy = FakeProvider("raise"), FakeProvider("error"), FakeProvider()
+    router = LLMRouter([("groq", broken), ("ollama", erroring), ("gemini", healthy)])
+    assert router.generate_answer("q")["provider"] == "gemini"
+    assert (broken.calls, erroring.calls, healthy.calls) == (1, 1, 1)
+
+
+def test_failed_provider_is_ranked_after_healthy_one():
+    flaky, steady = FakeProvider("raise"), FakeProvider()
+    router = LLMRouter([("groq", flaky), ("ollama", steady)])
+    router.generate_answer("q")
+    router.generate_answer("q")
+    # The error rate pushes groq behind ollama's measured latency
+    assert flaky.calls == 1
+    assert steady.calls == 2
+
+
+def test_rate_limited_provider_is_skipped_until_retry_after():
+    limited, backup = FakeProvider("rate_limited", retry_after=60), FakeProvider()
+    router = LLMRouter([("groq", limited), ("ollama", backup)])
+    assert router.generate_answer("q")["provider"] == "ollama"
+    assert router.generate_answer("q")["provider"] == "ollama"
+    assert limited.calls == 1
+    assert [p.name for p in router._ranked()] == ["ollama", "groq"]
+
+
+def test_unhealthy_providers_go_last():
+    groq, ollama = FakeProvider(), FakeProvider()
+    router = LLMRouter([("groq", groq), ("ollama", ollama)], health_monitor=Health(down={"groq"}))
+    assert router.generate_answer("q")["provider"] == "ollama"
+    assert groq.calls == 0
+
+
+def test_all_rate_limited_reports_retry_after():
+    router = LLMRouter([("groq", FakeProvider("rate_limited", retry_after=30))])
+    router.generate_answer("q")
+    response = router.generate_answer("q")
+    assert response["status"] == "rate_limited"
+    assert 0 < response["retry_after"] <= 30
+
+
+def test_stream_fails_over_before_first_token():
+    limited = StreamingProvider(error=RateLimitedError("429", retry_after=60))
+    empty = StreamingProvider(tokens=[])
+    good = StreamingProvider(tokens=["Hello", " world"])
+    router = LLMRouter([("groq", limited), ("ollama", empty), ("gemini", good)])
+    assert "".join(router.stream_answer("q")) == "Hello world"
+    assert router.retry_after() == 0
+
+
+def test_stream_raises_when_every_provider_fails():
+    router = LLMRouter([("groq", StreamingProvider(error=ConnectionError("down")))])
+    with pytest.raises(ConnectionError):
+        list(router.stream_answer("q"))
+
+
+def test_requires_a_provider():
+    with pytest.raises(RuntimeError):
+        LLMRouter([])
+
+
+def test_gemini_failover_uses_gemini_model(monkeypatch):
+    """The router's Gemini tier is built with GEMINI_MODEL, not the Groq model name"""
+    used = []
+    genai = types.ModuleType("google.generativeai")
+    genai.configure = lambda api_key: None
+    genai.get_model = lambda name: used.append(name) or object()
+    genai.types = types.SimpleNamespace(GenerationConfig=lambda **kwargs: kwargs)
+
+    class GenerativeModel:
+        def __init__(self, name):
+            used.append(name)
+
+        def generate_content(self, prompt, generation_config=None):
+            return types.SimpleNamespace(text="from gemini")
+
+    genai.GenerativeModel = GenerativeModel
+    google = types.ModuleType("google")
+    google.generativeai = genai
+    monkeypatch.setitem(sys.modules, "google", google)
+    monkeypatch.setitem(sys.modules, "google.generativeai", genai)
+    monkeypatch.setitem(sys.modules, "streamlit", types.ModuleType("streamlit"))
+    monkeypatch.delitem(sys.modules, "src.llm_interface", raising=False)
+    monkeypatch.setattr(Config, "GOOGLE_API_KEY", "test-key")
+    monkeypatch.setattr(Config, "OLLAMA_URL", "")
+    monkeypatch.setattr(Config, "LLM_PROVIDERS", ["groq", "gemini"])
+    groq = FakeProvider("error")
+    monkeypatch.setattr(resources, "get_llm", lambda: groq)
+
+    router = resources._build_llm_router()
+    gemini = dict((p.name, p.llm) for p in router._providers)["gemini"]
+    assert gemini._verify_connection()
+    response = router.generate_answer("q")
+
+    assert response["provider"] == "gemini"
+    assert response["answer"] == "from gemini"
+    assert response["model"] == Config.GEMINI_MODEL
+    assert groq.calls == 1
+    assert used[0] == Config.GEMINI_MODEL
+    assert Config.LLM_MODEL not in used and f"models/{Config.LLM_MODEL}" not in used
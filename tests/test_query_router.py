@@ -0,0 +1,84 @@
+import pytest
+
+from conftest import FakeEmbeddingModel
+from src.query_router import QueryRouter, match_document_type
+
+CORPUS = {
+    "Database Management Systems": [
+        "sql normalization tables keys", "sql joins tables rows", "transactions tables locking sql"
+    ],
+    "Core java": [
+        "java classes objects jvm", "java interfaces inheritance jvm", "jvm garbage collection java"
+    ],
+}
+
+
+class FakeStore:
+    """Just the parts of VectorStore the router reads"""
+
+    def __init__(self):
+        self.model = FakeEmbeddingModel()
+        self.corpus_version = 0
+
+    def embed_texts(self, texts):
+        return self.model.encode(texts)
+
+    def sample_vectors(self, filters, limit):
+        return self.model.encode(CORPUS.get(filters["subject"], [])[:limit])
+
+
+def ready_router(**kwargs):
+    store = FakeStore()
+    router = QueryRouter(store, **kwargs)
+    assert router.wait_ready(timeout=5)
+    return router, store
+
+
+@pytest.mark.parametrize("query, types", [
+    ("previous year papers for dbms", ["question_paper", "question_papers"]),
+    ("show me last years question paper", ["question_paper", "question_papers"]),
+    ("any pyqs on java?", ["question_paper", "question_papers"]),
+    ("dbms question bank", ["question_bank"]),
+    ("what is in the syllabus", ["syllabus"]),
+    ("explain sql joins", None),
+])
+def test_keyword_rules(query, types):
+    assert match_document_type(query) == types
+
+
+def test_routes_clear_subject_and_type():
+    router, store = ready_router(min_similarity=0.3, min_margin=0.05)
+    query = "previous year papers on sql tables normalization"
+    routed = router.route(query, store.embed_texts([query])[0])
+    assert routed == {"type": ["question_paper", "question_papers"], "subject": "Database Management Systems"}
+
+
+def test_caller_filters_are_never_overridden():
+    router, store = ready_router(min_similarity=0.3, min_margin=0.05)
+    query = "previous year papers on sql tables normalization"
+    embedding = store.embed_texts([query])[0]
+    filters = {"subject": "Core java", "type": "notes"}
+    assert router.route(query, embedding, filters) is None
+    routed = router.route(query, embedding, {"subject": "Core java", "year": "All"})
+    assert routed == {"subject": "Core java", "type": ["question_paper", "question_papers"]}
+
+
+def test_only_subjects_with_stored_chunks_are_candidates():
+    router, store = ready_router(min_similarity=0.3, min_margin=0.05)
+    subject, score = router.classify_subject(store.embed_texts(["java jvm classes"])[0])
+    assert subject == "Core java" and score >= 0.3
+    assert router._centroids[0] == ["Database Management Systems", "Core java"]
+
+
+def test_classify_subject_below_similarity_threshold():
+    router, store = ready_router(min_similarity=0.99, min_margin=0.0)
+    subject, score = router.classify_subject(store.embed_texts(["sql tables normalization"])[0])
+    assert subject is None
+    assert 0 < score < 0.99
+
+
+def test_classify_subject_below_margin_threshold():
+    router, store = ready_router(min_similarity=0.0, min_margin=1.5)
+    subject, _ = router.classify_subject(store.embed_texts(["sql tables normalization"])[0])
+    assert subject is None
+    assert router.route("explain sql tables", store.embed_texts(["sql tables"])[0]) is None
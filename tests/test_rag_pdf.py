@@ -1,11 +1,10 @@
 from src.document_processor import DocumentProcessor
-from src.vector_store import VectorStore
-from src.config import Config
+from src.resources import get_vector_store
 
 PDF_PATH = "mnt/data/MCA-RAG-Complete-Guide-v2.pdf"
 
 dp = DocumentProcessor()
-vs = VectorStore(use_qdrant=Config.USE_QDRANT)
+vs = get_vector_store()
 
 print("Processing PDF...")
 chunks = dp.process_pdf(
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from src.ranking import mmr_select, reciprocal_rank_fusion
+
+
+def test_rrf_rewards_agreement_between_rankings():
+    fused = reciprocal_rank_fusion([["a", "b", "c"], ["b", "d", "a"]])
+    assert [doc_id for doc_id, _ in fused] == ["b", "a", "d", "c"]
+    assert dict(fused)["b"] == pytest.approx(1 / 61 + 1 / 62)
+
+
+def test_rrf_single_ranking_keeps_order():
+    assert [d for d, _ in reciprocal_rank_fusion([["x", "y", "z"]])] == ["x", "y", "z"]
+    assert reciprocal_rank_fusion([]) == []
+
+
+def test_mmr_skips_near_duplicates():
+    query = np.array([1.0, 0.0, 0.0])
+    vectors = [
+        [1.0, 0.1, 0.0],
+        [1.0, 0.1, 0.0],  # duplicate of the best hit
+        [0.7, 0.0, 0.7],
+    ]
+    assert mmr_select(query, vectors, 2) == [0, 2]
+
+
+def test_mmr_lambda_one_is_pure_relevance():
+    query = np.array([1.0, 0.0])
+    vectors = [[0.6, 0.8], [1.0, 0.0], [1.0, 0.05]]
+    assert mmr_select(query, vectors, 3, lambda_mult=1.0) == [1, 2, 0]
+
+
+def test_mmr_uses_given_relevance():
+    vectors = [[1.0, 0.0], [0.0, 1.0], [0.7, 0.7]]
+    # Relevance overrides cosine to the query (e.g. rerank or RRF scores)
+    assert mmr_select([1.0, 0.0], vectors, 1, relevance=[0.1, 0.9, 0.5]) == [1]
+
+
+def test_mmr_edge_cases():
+    assert mmr_select([1.0, 0.0], [], 3) == []
+    assert mmr_select([1.0, 0.0], [[1.0, 0.0]], 0) == []
+    assert mmr_select([1.0, 0.0], [[1.0, 0.0], [0.0, 1.0]], 5) == [0, 1]
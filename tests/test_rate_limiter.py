@@ -0,0 +1,124 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.rate_limiter import RateLimiter
+
+
+def test_acquire_spends_request_and_token_budget():
+    limiter = RateLimiter(rpm=10, tpm=1000)
+    assert limiter.acquire("s1", 400, timeout=0)
+    stats = limiter.stats()
+    assert stats["requests_available"] == pytest.approx(9, abs=0.01)
+    assert stats["tokens_available"] == pytest.approx(600, abs=1)
+
+
+def test_acquire_times_out_when_tokens_run_out():
+    limiter = RateLimiter(rpm=100, tpm=60)  # refills 1 token/s
+    assert limiter.acquire("s1", 60, timeout=0)
+    start = time.monotonic()
+    assert not limiter.acquire("s1", 30, timeout=0.1)
+    assert time.monotonic() - start < 1
+    assert limiter.stats()["queued"] == 0
+
+
+def test_settle_returns_unused_tokens():
+    limiter = RateLimiter(rpm=100, tpm=1000)
+    limiter.acquire("s1", 800, timeout=0)
+    limiter.settle(800, 300)
+    assert limiter.stats()["tokens_available"] == pytest.approx(700, abs=1)
+    # Failed call: the whole reservation comes back
+    limiter.acquire("s1", 500, timeout=0)
+    limiter.settle(500, 0)
+    assert limiter.stats()["tokens_available"] == pytest.approx(700, abs=1)
+    # ...but never beyond the quota
+    limiter.settle(2000, 0)
+    assert limiter.stats()["tokens_available"] == pytest.approx(1000, abs=1)
+
+
+def test_settle_charges_underestimates():
+    limiter = RateLimiter(rpm=100, tpm=1000)
+    limiter.acquire("s1", 100, timeout=0)
+    limiter.settle(100, 400)
+    assert limiter.stats()["tokens_available"] == pytest.approx(600, abs=1)
+
+
+def test_penalize_blocks_grants_until_retry_after():
+    limiter = RateLimiter(rpm=100, tpm=1000)
+    limiter.penalize(0.3)
+    assert limiter.stats()["blocked_for"] > 0
+    # Also drains the request bucket, so the wait is at least retry_after
+    assert limiter.estimate_wait() >= 0.25
+    assert not limiter.acquire("s1", 10, timeout=0.05)
+    start = time.monotonic()
+    assert limiter.acquire("s1", 10, timeout=2)
+    assert time.monotonic() - start >= 0.15
+
+
+def test_sessions_are_served_round_robin():
+    limiter = RateLimiter(rpm=60, tpm=100000)  # refills 1 request/s
+    limiter._requests = 0.0
+    order = []
+
+    def ask(session, n):
+        assert limiter.acquire(session, 1, timeout=10)
+        order.append((session, n))
+
+    threads = [threading.Thread(target=ask, args=("busy", i)) for i in range(3)]
+    for t in threads:
+        t.start()
+    while limiter.stats()["queued"] < 3:
+        time.sleep(0.01)
+    threads.append(threading.Thread(target=ask, args=("quiet", 0)))
+    threads[-1].start()
+    while limiter.stats()["queued"] < 4:
+        time.sleep(0.01)
+    limiter._requests = 2.0
+    with limiter._cond:
+        limiter._cond.notify_all()
+    while len(order) < 2:
+        time.sleep(0.01)
+    # The quiet session is not stuck behind the busy session's backlog
+    assert ("quiet", 0) in order
+    limiter._requests = 10.0
+    for t in threads:
+        t.join()
+
+
+def test_aacquire_waits_without_threads():
+    limiter = RateLimiter(rpm=600, tpm=100000)  # refills 10 requests/s
+    limiter._requests = 0.0
+
+    async def main():
+        threads = threading.active_count()
+        results = await asyncio.gather(*[limiter.aacquire(f"s{i}", 1, timeout=5) for i in range(3)])
+        return results, threading.active_count() - threads
+
+    results, extra_threads = asyncio.run(main())
+    assert results == [True, True, True]
+    assert extra_threads == 0
+
+
+def test_aacquire_times_out_and_leaves_the_queue():
+    limiter = RateLimiter(rpm=100, tpm=60)
+    assert limiter.acquire("s1", 60, timeout=0)
+    assert not asyncio.run(limiter.aacquire("s2", 30, timeout=0.05))
+    assert limiter.stats()["queued"] == 0
+
+
+def test_cancelled_aacquire_releases_its_ticket():
+    limiter = RateLimiter(rpm=100, tpm=60)
+    assert limiter.acquire("s1", 60, timeout=0)
+
+    async def main():
+        task = asyncio.create_task(limiter.aacquire("s2", 30))
+        await asyncio.sleep(0.05)
+        assert limiter.stats()["queued"] == 1
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(main())
+    assert limiter.stats()["queued"] == 0
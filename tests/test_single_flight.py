@@ -0,0 +1,52 @@
+import threading
+import time
+
+from src.single_flight import SingleFlight
+
+
+def test_concurrent_callers_share_the_leaders_result():
+    flight = SingleFlight()
+    leader, call = flight.begin("q")
+    assert leader
+    results = []
+
+    def follower():
+        is_leader, joined = flight.begin("q")
+        assert not is_leader
+        results.append(joined.wait(timeout=5))
+
+    threads = [threading.Thread(target=follower) for _ in range(3)]
+    for t in threads:
+        t.start()
+    while call.waiters < 3:
+        time.sleep(0.001)
+    flight.finish("q", call, result="answer")
+    for t in threads:
+        t.join()
+    assert results == ["answer"] * 3
+    assert flight.stats() == {"in_flight": 0, "coalesced": 3}
+
+
+def test_key_is_released_after_finish():
+    flight = SingleFlight()
+    _, first = flight.begin("q")
+    flight.finish("q", first, result=1)
+    leader, second = flight.begin("q")
+    assert leader
+    assert second is not first
+
+
+def test_different_keys_do_not_coalesce():
+    flight = SingleFlight()
+    assert flight.begin("a")[0]
+    assert flight.begin("b")[0]
+    assert flight.stats()["in_flight"] == 2
+
+
+def test_waiters_get_none_on_error_or_timeout():
+    flight = SingleFlight()
+    _, call = flight.begin("q")
+    _, joined = flight.begin("q")
+    assert joined.wait(timeout=0.01) is None
+    flight.finish("q", call, error=RuntimeError("boom"))
+    assert joined.wait(timeout=1) is None
@@ -0,0 +1,26 @@
+import copy
+
+from conftest import make_chunks
+
+
+def test_upsert_leaves_caller_metadata_untouched(numpy_store_factory):
+    store = numpy_store_factory()
+    chunks = make_chunks("dbms.pdf", "Database Management Systems", [
+        "normalization removes redundancy", "sql joins combine tables"
+    ])
+    original = copy.deepcopy(chunks)
+    embeddings = store.embed_texts([c["content"] for c in chunks])
+    store.upsert_embedded(chunks, embeddings)
+    assert chunks == original
+    assert all(p.get("token_count") for p in store.index.payloads())
+
+
+def test_re_adding_the_same_chunks_does_not_duplicate(numpy_store_factory):
+    store = numpy_store_factory()
+    chunks = make_chunks("dbms.pdf", "Database Management Systems", [
+        "normalization removes redundancy", "sql joins combine tables"
+    ])
+    assert store.add_documents(chunks)["status"] == "success"
+    assert store.add_documents(chunks)["status"] == "success"
+    assert store.index.count() == 2
+    assert len(store.bm25) == 2
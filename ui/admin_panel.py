@@ -1,7 +1,7 @@
 import streamlit as st
 from src.config import Config
 from src.document_processor import DocumentProcessor
-from src.vector_store import VectorStore
+from src.resources import get_vector_store
 
 def admin_view():
     """Admin panel - requires password authentication"""
@@ -34,7 +34,7 @@ def admin_view():
         st.rerun()
     
     dp = DocumentProcessor()
-    vs = VectorStore(use_qdrant=Config.USE_QDRANT)
+    vs = get_vector_store()
 
     col1, col2 = st.columns(2)
     with col1:
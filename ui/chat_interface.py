@@ -1,5 +1,5 @@
 import streamlit as st
-from src.vector_store import VectorStore
+from src.resources import get_vector_store
 from src.document_processor import DocumentProcessor
 from src.llm_interface import LLMInterface
 from src.config import Config
@@ -9,7 +9,7 @@ import tempfile, os
 
 @st.cache_resource
 def init_system():
-    return DocumentProcessor(), VectorStore(use_qdrant=Config.USE_QDRANT), LLMInterface()
+    return DocumentProcessor(), get_vector_store(), LLMInterface()
 
 
 def chat_view():
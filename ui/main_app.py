@@ -1,7 +1,8 @@
 """
 Main application interface
 """
-from src.llm_groq import GroqLLM
+from src.resources import get_llm, get_health_monitor
+from src.llm_health import status_label
 
 import streamlit as st
 from ui.components.theming import apply_auto_theme, load_css
@@ -124,10 +125,10 @@ def show_main_app():
         <p style='color: #a8acb4; font-size: 12px; margin-left: 16px; margin-bottom: 12px;'>QUICK STATS</p>
         """, unsafe_allow_html=True)
 
-        # Real-time LLM status
+        # LLM status from the background health monitor (no ping per rerun)
         try:
-            llm = GroqLLM()
-            status = "🟢 Online" if llm.connection_status else "🔴 Offline"
+            get_llm()
+            status = status_label(get_health_monitor().status("groq"))
         except:
             status = "🔴 Error"
 
@@ -3,7 +3,8 @@ Admin Panel - Upload and manage documents
 """
 import streamlit as st
 from src.document_processor import DocumentProcessor
-from src.vector_store import VectorStore
+from src.ingestion_pipeline import IngestionPipeline
+from src.resources import get_vector_store
 from src.config import Config
 import os
 from datetime import datetime
@@ -92,7 +93,7 @@ def admin_page():
     st.markdown("<h3 style='color: #ffffff; margin-bottom: 20px;'>📊 Document Statistics</h3>", unsafe_allow_html=True)
     
     try:
-        vector_store = VectorStore(use_qdrant=Config.USE_QDRANT)
+        vector_store = get_vector_store()
         stats = vector_store.get_stats()
         
         col1, col2, col3, col4 = st.columns(4)
@@ -167,8 +168,7 @@ def _upload_section(doc_type: str, section_title: str):
             status_container = st.container()
             
             try:
-                doc_processor = DocumentProcessor()
-                vector_store = VectorStore(use_qdrant=Config.USE_QDRANT)
+                pipeline = IngestionPipeline(DocumentProcessor(), get_vector_store())
                 
                 total_files = len(uploaded_files)
                 total_chunks = 0
@@ -180,33 +180,30 @@ def _upload_section(doc_type: str, section_title: str):
                         f.write(uploaded_file.getbuffer())
                     
                     with status_container.status(f"📄 Processing: {uploaded_file.name}", expanded=True) as status:
-                        st.write(f"⏳ Extracting text...")
+                        st.write(f"⏳ Extracting, chunking and embedding...")
                         
-                        # Process PDF
-                        chunks = doc_processor.process_pdf(temp_path)
-                        
-                        st.write(f"✂️ Created {len(chunks)} chunks")
-                        
-                        # Add metadata
-                        for chunk in chunks:
-                            chunk["metadata"] = {
-                                "source": uploaded_file.name,
-                                "type": doc_type,
-                                "subject": subject,
-                                "year": year,
+                        # Stream PDF → chunks → embeddings → database
+                        result = pipeline.run(
+                            temp_path,
+                            doc_type=doc_type,
+                            subject=subject,
+                            year=year,
+                            source_name=uploaded_file.name,
+                            extra_metadata={
                                 "semester": int(semester),
                                 "chapter": chapter or "General",
                                 "upload_date": datetime.now().isoformat()
                             }
+                        )
+                        chunks_added = result.get("documents_added", 0)
                         
-                        st.write(f"🧠 Generating embeddings...")
-                        
-                        # Add to vector store
-                        vector_store.add_documents(chunks)
+                        st.write(f"✂️ Created {chunks_added} chunks")
+                        if result["status"] != "success":
+                            raise RuntimeError(result["message"])
                         
                         st.write(f"✅ Successfully added to database!")
                         
-                        total_chunks += len(chunks)
+                        total_chunks += chunks_added
                         
                         # Clean up
                         os.remove(temp_path)
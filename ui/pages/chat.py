@@ -3,9 +3,15 @@ Modern Chat Interface with Groq Model
 Clean implementation using Streamlit native components
 """
 import streamlit as st
-from src.vector_store import VectorStore
 from src.document_processor import DocumentProcessor
-from src.llm_groq import GroqLLM
+from src.resources import (
+    get_vector_store, get_llm_router, get_answer_cache, get_rate_limiter, get_single_flight,
+    get_extractive_answerer
+)
+from src.answer_cache import filters_key
+from src.context_packer import pack_context
+from src.query_cache import normalize_query
+from src.history_compressor import RollingSummary
 from src.config import Config
 from src.stats_manager import StatsManager
 from datetime import datetime
@@ -17,8 +23,8 @@ def init_system():
     """Initialize all system components once"""
     try:
         dp = DocumentProcessor()
-        vs = VectorStore(use_qdrant=Config.USE_QDRANT)
-        llm = GroqLLM()
+        vs = get_vector_store()
+        llm = get_llm_router()
         return dp, vs, llm
     except Exception as e:
         st.error(f"❌ System initialization error: {str(e)}")
@@ -69,8 +75,8 @@ def render_message(role, content, sources=None, name=None, timestamp=None):
         seen_sources = set()
         
         for source in sources:
-            if isinstance(source, dict) and source.get('content'):
-                source_name = strip_html_tags(str(source.get('source', 'Document')))
+            if isinstance(source, dict) and (source.get('content') or source.get('document')):
+                source_name = strip_html_tags(str(source.get('source') or source.get('document', 'Document')))
                 if source_name not in seen_sources:
                     seen_sources.add(source_name)
                     valid_sources.append({
@@ -96,6 +102,97 @@ def render_message(role, content, sources=None, name=None, timestamp=None):
                         unsafe_allow_html=False
                     )
 
+def stream_response(llm, query, docs, history):
+    """
+    Render the answer bubble while tokens stream in; sources attach at the end.
+
+    Returns:
+        (answer, sources, completed); answer is None if nothing was generated
+    """
+    placeholder = st.empty()
+    timestamp = datetime.now().strftime("%I:%M %p")
+    answer = ""
+    completed = True
+    last_render = 0.0
+    
+    # Shared Groq quota: tell the student when their question is queued
+    waiting = "✨ Generating answer..."
+    if Config.ENABLE_RATE_LIMITING:
+        wait = get_rate_limiter().estimate_wait()
+        if wait >= 1:
+            waiting = f"⏳ High demand right now: your question is queued (about {wait:.0f}s)..."
+    with placeholder.container():
+        render_message("assistant", waiting, name="MCA Assistant", timestamp=timestamp)
+    
+    try:
+        for token in llm.stream_answer(query, docs, history):
+            answer += token
+            # Throttle redraws; each one re-sends the whole bubble
+            if time.time() - last_render > 0.05:
+                with placeholder.container():
+                    render_message("assistant", answer + "▌", name="MCA Assistant", timestamp=timestamp)
+                last_render = time.time()
+    except Exception as e:
+        print(f"⚠️ Streaming error: {e}")
+        if not answer:
+            placeholder.empty()
+            return None, [], False
+        answer += "\n\n⚠️ Response interrupted."
+        completed = False
+    
+    sources = llm.get_sources(docs)
+    with placeholder.container():
+        render_message("assistant", answer, sources, name="MCA Assistant", timestamp=timestamp)
+    return answer, sources, completed
+
+def run_rag_turn(vs, llm, query, filters, history, quick=False):
+    """
+    Search + answer for one question.
+
+    Args:
+        quick: Answer with extracted sentences from the notes, no LLM call
+
+    Returns:
+        (answer, sources, completed); completed is False on errors
+    """
+    # Search documents
+    with st.spinner("🔍 Searching your materials..."):
+        try:
+            # Reranked hits are precise enough to send fewer chunks to the LLM
+            top_k = Config.RERANK_TOP_K if Config.ENABLE_RERANK else Config.TOP_K_RESULTS
+            docs = vs.search(query, top_k, filters or None)
+        except Exception as e:
+            docs = []
+            st.warning(f"⚠️ Search error: {str(e)}")
+    
+    if quick:
+        # Cached from the search above, so only the sentences get embedded
+        response = get_extractive_answerer().answer(query, docs, vs.embed_query(query))
+        return response["answer"], response["sources"], response["status"] == "success"
+    
+    # Generate answer, rendering tokens as they arrive. The context is packed
+    # once here and shared by the prompt and the source list
+    if hasattr(llm, "stream_answer"):
+        answer, sources, completed = stream_response(llm, query, pack_context(docs), history)
+        if answer is None:
+            # Every provider failed before the first token: fall back to the notes
+            degraded = (
+                llm.degraded_answer(query, docs, vs.embed_query(query))
+                if hasattr(llm, "degraded_answer") else None
+            )
+            if degraded:
+                return degraded["answer"], degraded["sources"], False
+            return "⚠️ LLM Error — Try again later.", [], False
+        return answer, sources, completed
+    
+    with st.spinner("✨ Generating answer..."):
+        try:
+            response = llm.generate_answer(query, docs, history)
+            answer = response.get("answer", "I apologize, but I encountered an error generating the answer.")
+            return answer, response.get("sources", []), response.get("status") == "success"
+        except Exception as e:
+            return f"❌ Error: {str(e)}", [], False
+
 def chat_page():
     """Main chat interface with modern design"""
     
@@ -109,6 +206,10 @@ def chat_page():
     if "history" not in st.session_state:
         st.session_state.history = []
     
+    # Bounded conversation memory sent to the LLM (raw history is kept for the UI)
+    if "memory" not in st.session_state:
+        st.session_state.memory = RollingSummary()
+    
     # ==========================================
     # HEADER SECTION
     # ==========================================
@@ -160,6 +261,10 @@ def chat_page():
                 ["All"] + Config.YEARS,
                 key="year_filter"
             )
+        quick_answer = st.checkbox(
+            "⚡ Quick answer (sentences from your notes, no AI call)",
+            key="quick_answer"
+        )
     
     st.divider()
     
@@ -232,27 +337,54 @@ def chat_page():
         if year_filter != "All":
             filters["year"] = year_filter
         
-        # Search documents
-        with st.spinner("🔍 Searching your materials..."):
+        # Semantic answer cache (standalone LLM questions only; follow-ups depend on history)
+        answer_cache = get_answer_cache()
+        use_cache = Config.ENABLE_ANSWER_CACHE and not st.session_state.history and not quick_answer
+        cached = None
+        query_embedding = None
+        if use_cache:
             try:
-                docs = vs.search(user_text, Config.TOP_K_RESULTS, filters or None)
+                query_embedding = vs.embed_query(user_text)
+                cached = answer_cache.lookup(query_embedding, filters, vs.corpus_version)
             except Exception as e:
-                docs = []
-                st.warning(f"⚠️ Search error: {str(e)}")
+                print(f"⚠️ Answer cache error: {e}")
         
-        # Generate answer
-        with st.spinner("✨ Generating answer..."):
-            try:
-                response = llm.generate_answer(
-                    user_text,
-                    docs,
-                    st.session_state.history
-                )
-                answer = response.get("answer", "I apologize, but I encountered an error generating the answer.")
-                sources = response.get("sources", [])
-            except Exception as e:
-                answer = f"❌ Error: {str(e)}"
-                sources = []
+        if cached:
+            answer = cached.get("answer", "")
+            sources = cached.get("sources", [])
+        else:
+            # Single flight: identical standalone questions in flight share one search + LLM call
+            flights = get_single_flight()
+            flight_key = None
+            is_leader = False
+            shared = None
+            if not st.session_state.history and not quick_answer:
+                flight_key = (normalize_query(user_text), filters_key(filters), vs.corpus_version)
+                is_leader, call = flights.begin(flight_key)
+                if not is_leader:
+                    with st.spinner("⏳ Another student just asked this — sharing their answer..."):
+                        shared = call.wait(timeout=Config.SINGLE_FLIGHT_TIMEOUT)
+            
+            if shared:
+                answer, sources = shared["answer"], shared["sources"]
+            else:
+                completed = False
+                try:
+                    answer, sources, completed = run_rag_turn(
+                        vs, llm, user_text, filters, st.session_state.memory.as_history(),
+                        quick=quick_answer
+                    )
+                finally:
+                    if is_leader:
+                        result = {"answer": answer, "sources": sources} if completed else None
+                        flights.finish(flight_key, call, result)
+                if use_cache and query_embedding is not None and completed:
+                    answer_cache.store(user_text, query_embedding, filters, vs.corpus_version, {
+                        "answer": answer,
+                        "sources": sources,
+                        "model": getattr(llm, "model", ""),
+                        "status": "success"
+                    })
         
         # Add assistant response
         assistant_msg = {
@@ -269,6 +401,7 @@ def chat_page():
             "user": user_text,
             "assistant": answer
         })
+        st.session_state.memory.update(user_text, answer)
         
         # Rerun to display new messages
         st.rerun()
@@ -296,6 +429,7 @@ def chat_page():
             if st.button("🗑️ Clear", use_container_width=True, key="clear_chat"):
                 st.session_state.messages = []
                 st.session_state.history = []
+                st.session_state.memory.clear()
                 st.rerun()
         
         with col2:
@@ -2,8 +2,7 @@
 Enhanced Home/Dashboard page with detailed statistics
 """
 import streamlit as st
-from src.vector_store import VectorStore
-from src.llm_groq import GroqLLM
+from src.resources import get_vector_store
 from src.config import Config
 from src.stats_manager import StatsManager
 from datetime import datetime
@@ -22,7 +21,7 @@ def home_page():
     
     # Get system status
     try:
-        vs = VectorStore(use_qdrant=Config.USE_QDRANT)
+        vs = get_vector_store()
         vs_stats = vs.get_stats()
         
         # Get detailed document statistics by type
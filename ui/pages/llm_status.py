@@ -1,5 +1,6 @@
 import streamlit as st
-from src.llm_groq import GroqLLM
+import time
+from src.resources import get_llm, get_health_monitor
 from src.config import Config
 from qdrant_client import QdrantClient
 
@@ -14,13 +15,17 @@ def llm_status_page():
 
     st.subheader("🔍 Groq LLM Status")
 
-    llm = GroqLLM()
+    llm = get_llm()
+    if st.button("🔄 Re-check now"):
+        get_health_monitor().check_now("groq")
     status = llm.get_status()
 
     if status["connected"]:
-        st.success(f"🟢 Connected to Groq — Model: {status['model']}")
+        st.success(f"{status['status']} — Groq model: {status['model']}")
     else:
-        st.error("🔴 Groq LLM Not Connected")
+        st.error(f"🔴 Groq LLM Not Connected: {status.get('error') or 'health check failed'}")
+    if status.get("checked_at"):
+        st.caption(f"Last checked {int(time.time() - status['checked_at'])}s ago")
 
     st.markdown("### 🔑 API Keys")
     st.code(f"""
@@ -1,5 +1,5 @@
 import streamlit as st
-from src.llm_groq import GroqLLM
+from src.resources import get_llm
 from qdrant_client import QdrantClient
 
 # FIXED — missing import
@@ -36,7 +36,7 @@ def llm_test_page():
     st.info("This page helps you test the LLM independent of chat history or vector DB.")
 
     st.subheader("🔍 Connection Status")
-    llm = GroqLLM()
+    llm = get_llm()
     status = llm.get_status()
 
     if status["connected"]:
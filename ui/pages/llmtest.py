@@ -2,7 +2,7 @@
 LLM Test Page - Test Groq LLM directly (Password Protected)
 """
 import streamlit as st
-from src.llm_groq import GroqLLM
+from src.resources import get_llm
 from src.config import Config
 from ui.components.theming import load_css
 
@@ -78,7 +78,7 @@ def llm_test_page():
 
 
     try:
-        llm = GroqLLM()
+        llm = get_llm()
         status = llm.get_status()
         
         if not status["connected"]:
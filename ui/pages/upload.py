@@ -1,6 +1,7 @@
 import streamlit as st
 from src.document_processor import DocumentProcessor
-from src.vector_store import VectorStore
+from src.ingestion_pipeline import IngestionPipeline
+from src.resources import get_vector_store
 from src.config import Config
 from src.stats_manager import StatsManager
 import os
@@ -70,8 +71,8 @@ def upload_page():
     # --- Uploaded Document Table with Delete ---
         # --- Uploaded Document Table with Delete (pretty table style) ---
     try:
-        vs = VectorStore(use_qdrant=Config.USE_QDRANT)
-        doc_rows = vs.get_uploaded_documents(limit=1000)
+        vs = get_vector_store()
+        doc_rows = vs.get_uploaded_documents()
         st.markdown("## 📚 Uploaded Documents Overview")
         deleted = False
 
@@ -118,7 +119,7 @@ def upload_page():
 
     # === STATS + UPLOAD LOGIC ===
     try:
-        dp = DocumentProcessor()
+        pipeline = IngestionPipeline(DocumentProcessor(), vs)
         current_stats = vs.get_document_stats_by_type()
     except Exception as e:
         st.error(f"❌ System initialization error: {str(e)}")
@@ -186,22 +187,21 @@ def upload_page():
                     file_path = f"temp_{uploaded_file.name}"
                     with open(file_path, "wb") as f:
                         f.write(uploaded_file.getbuffer())
-                    chunks = dp.process_pdf(
+                    result = pipeline.run(
                         file_path,
                         doc_type=doc_type,
                         subject=subject,
                         year=year
                     )
-                    if chunks:
-                        result = vs.add_documents(chunks)
-                        if result['status'] == 'success':
-                            successful_uploads += 1
-                            total_chunks += len(chunks)
-                            st.success(f"✅ {uploaded_file.name}: {len(chunks)} chunks added")
-                        else:
-                            st.error(f"❌ {uploaded_file.name}: {result['message']}")
-                    else:
+                    added = result.get('documents_added', 0)
+                    if result['status'] == 'success':
+                        successful_uploads += 1
+                        total_chunks += added
+                        st.success(f"✅ {uploaded_file.name}: {added} chunks added")
+                    elif result['message'] == "No content extracted":
                         st.warning(f"⚠️ {uploaded_file.name}: No content extracted")
+                    else:
+                        st.error(f"❌ {uploaded_file.name}: {result['message']}")
                     if os.path.exists(file_path):
                         os.remove(file_path)
                 except Exception as e: